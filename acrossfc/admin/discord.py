@@ -4,6 +4,7 @@ import click
 # Local
 from acrossfc.core.config import FC_CONFIG
 from acrossfc.ext import discord_client as DISCORD_API
+from acrossfc.api.fc_roster import sync_discord_members
 
 
 @click.group()
@@ -41,3 +42,11 @@ def register_guild_commands():
             ]
         }
     )
+
+
+@axd.command()
+@click.option('--dry-run', is_flag=True, default=False,
+              help="Match members without writing to DynamoDB")
+def sync_members(dry_run):
+    records = sync_discord_members(dry_run=dry_run)
+    click.echo(f"{len(records)} members matched")
@@ -3,7 +3,9 @@ import logging
 
 # Local
 from acrossfc import ROOT_LOG
-from acrossfc.core.database import ClearDatabase
+from acrossfc.core.config import FC_CONFIG
+from acrossfc.core.database import ClearDatabase, LATEST, S3_URL_PREFIX
+from acrossfc.core.timeline import TimelineDatabase, TIMELINE_OBJECT_KEY
 from acrossfc.core.constants import (
     ACTIVE_TRACKED_ENCOUNTER_NAMES,
     TIER_NAME_TO_ENCOUNTER_NAMES_MAP,
@@ -25,13 +27,25 @@ from .who_cleared_recently import WhoClearedRecently
 LOG = logging.getLogger(__name__)
 
 
+def _timeline_file(cleardb_file: str) -> str:
+    """Local path of the timeline for --as-of. latest means the timeline the ETL keeps in the ClearDB bucket."""
+    if cleardb_file == LATEST:
+        cleardb_file = f"{S3_URL_PREFIX}{FC_CONFIG.s3_cleardb_bucket_name}/{TIMELINE_OBJECT_KEY}"
+    if not cleardb_file.startswith(S3_URL_PREFIX):
+        return cleardb_file
+
+    from acrossfc.ext.cleardb_cache import CLEARDB_CACHE
+    bucket_name, _, key = cleardb_file.removeprefix(S3_URL_PREFIX).partition('/')
+    return CLEARDB_CACHE.fetch_object(bucket_name, key)[0]
+
+
 @click.command()
 # TODO: Change this to use subcommands instead
 @click.argument('report')
 @click.option('-v', '--verbose', is_flag=True, show_default=True, default=False,
               help="Turn on verbose logging")
-@click.option('-f', '--cleardb-file', required=True,
-              help="File to read or write the clear database to")
+@click.option('-f', '--cleardb-file', default=LATEST, show_default=True,
+              help="Clear database to read: a local file, s3://bucket/key, or latest for the latest snapshot")
 @click.option('-e', '--encounter', multiple=True,
               type=click.Choice(ACTIVE_TRACKED_ENCOUNTER_NAMES, case_sensitive=False),
               help="Filter results by encounter")
@@ -46,11 +60,16 @@ LOG = logging.getLogger(__name__)
               help="Filter results by role. Overrides --job")
 @click.option('--include-echo', is_flag=True, show_default=True, default=False,
               help="Include echo clears")
-def axr(report, verbose, cleardb_file, encounter, tier, job, job_role, include_echo):
+@click.option('--as-of', type=click.DateTime(formats=["%Y-%m-%d"]),
+              help="Run the report as of this date (YYYY-MM-DD). --cleardb-file must then be a timeline database")
+def axr(report, verbose, cleardb_file, encounter, tier, job, job_role, include_echo, as_of):
     if verbose:
         ROOT_LOG.setLevel(logging.DEBUG)
 
-    database = ClearDatabase(db_filename=cleardb_file)
+    if as_of is not None:
+        database = TimelineDatabase(_timeline_file(cleardb_file), read_only=True).as_of(as_of.date())
+    else:
+        database = ClearDatabase.open(cleardb_file)
 
     encounter_names = ACTIVE_TRACKED_ENCOUNTER_NAMES
     if tier is not None:
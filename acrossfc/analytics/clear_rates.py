@@ -18,7 +18,9 @@ class ClearRates(Report):
         database: ClearDatabase,
         include_echo: bool = False
     ):
-        clear_rates: Dict[TrackedEncounterName, ClearRate] = database.get_clear_rates(include_echo=include_echo)
+        clear_rates: Dict[TrackedEncounterName, ClearRate] = (
+            database.get_clear_matrix(include_echo=include_echo).clear_rates()
+        )
 
         table = []
         self.data_dict = {}
@@ -16,24 +16,14 @@ class ClearedRoles(Report):
         database: ClearDatabase,
         include_echo: bool = False
     ):
-        cleared_jobs = database.get_cleared_jobs(include_echo=include_echo)
+        matrix = database.get_clear_matrix(include_echo=include_echo)
 
         table = []
         for encounter_name in ACTIVE_TRACKED_ENCOUNTER_NAMES:
-            cleared_members_by_role = {cat.name: set() for cat in JOB_CATEGORIES}
-            for cleared_job in cleared_jobs[encounter_name]:
-                # TODO: Dedupe by person
-                cleared_members_by_role[cleared_job[1].main_category_id].add(
-                    cleared_job[0].fcid
-                )
-                if cleared_job[1].sub_category_id is not None:
-                    cleared_members_by_role[cleared_job[1].sub_category_id].add(
-                        cleared_job[0].fcid
-                    )
-
+            role_counts = matrix.cleared_role_counts(encounter_name, JOB_CATEGORIES)
             table.append(
                 [encounter_name]
-                + [len(cleared_members_by_role[cat.name]) for cat in JOB_CATEGORIES]
+                + [role_counts[cat.name] for cat in JOB_CATEGORIES]
             )
 
         data_str = tabulate(
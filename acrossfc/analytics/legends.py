@@ -1,6 +1,5 @@
 # stdlib
 from io import StringIO
-from collections import defaultdict
 from datetime import date
 
 # 3rd-party
@@ -18,14 +17,14 @@ class Legends(Report):
         database: ClearDatabase,
     ):
         buffer = StringIO()
-        member_to_cleared_ult = defaultdict(list)
+        matrix = database.get_clear_matrix()
 
-        num_members = len(database.get_fc_roster())
+        num_members = len(matrix.members)
 
-        for i, encounter_name in enumerate(ULTIMATE_NAMES):
-            cleared_members = database.get_cleared_members_by_encounter(encounter_name)
-            for member in cleared_members:
-                member_to_cleared_ult[member.name].append(encounter_name)
+        member_to_cleared_ult = {
+            member.name: cleared_ults
+            for member, cleared_ults in matrix.cleared_encounters(ULTIMATE_NAMES).items()
+        }
 
         sorted_names = sorted([f"{member_name}" for member_name in member_to_cleared_ult])
         for i in range(5):
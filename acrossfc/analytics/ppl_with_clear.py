@@ -16,12 +16,13 @@ class PeopleWithClear(Report):
         include_echo: bool = False
     ):
         buffer = StringIO()
+        matrix = database.get_clear_matrix(include_echo=include_echo)
 
         for i, encounter_name in enumerate(encounter_names):
             if i > 0:
                 buffer.write("\n\n")
 
-            cleared_members = database.get_cleared_members_by_encounter(encounter_name, include_echo=include_echo)
+            cleared_members = matrix.cleared_members(encounter_name)
             sorted_names = sorted([f"{member.name}" for member in cleared_members])
 
             buffer.write(f"{encounter_name} ({len(sorted_names)})")
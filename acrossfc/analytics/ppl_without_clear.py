@@ -16,12 +16,13 @@ class PeopleWithoutClear(Report):
         include_echo: bool = False
     ):
         buffer = StringIO()
+        matrix = database.get_clear_matrix(include_echo=include_echo)
 
         for i, encounter_name in enumerate(encounter_names):
             if i > 0:
                 buffer.write("\n\n")
 
-            uncleared_members = database.get_uncleared_members_by_encounter(encounter_name, include_echo=include_echo)
+            uncleared_members = matrix.uncleared_members(encounter_name)
             sorted_names = sorted([f"{member.name}" for member in uncleared_members])
 
             buffer.write(f"{encounter_name} ({len(sorted_names)})")
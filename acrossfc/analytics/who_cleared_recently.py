@@ -15,12 +15,13 @@ class WhoClearedRecently(Report):
         include_echo: bool = False
     ):
         buffer = StringIO()
+        clear_order = database.get_clear_order(include_echo=include_echo)
 
         for i, encounter_name in enumerate(encounter_names):
             if i > 0:
                 buffer.write("\n\n")
 
-            encounter_clear_chart = database.get_clear_order(include_echo=include_echo)[encounter_name]
+            encounter_clear_chart = clear_order[encounter_name]
 
             buffer.write(f"[{encounter_name}]")
             buffer.write("\n\n")
@@ -1,10 +1,12 @@
 # 3rd-party
 import click
 import logging
+from tabulate import tabulate
 
 # Local
 from acrossfc import ROOT_LOG
-from .submissions import submit_fflogs
+from .submissions import submit_fflogs, submit_fflogs_bulk
+from .review_pool import drain_submissions_queue, DEFAULT_NUM_WORKERS, MAX_NUM_WORKERS
 
 
 @click.group()
@@ -26,3 +28,61 @@ axs.command(
     name='submit-fflogs',
     help='Make a submission with FFLogs'
 )(cmd)
+
+
+@axs.command(name='submit-fflogs-bulk', help='Make submissions for every FFLogs URL in a file (one per line)')
+@click.option('-f', '--urls-file', type=click.File('r'), required=True)
+@click.option('-u', '--submitted-by-name', required=True)
+@click.option('-c', '--submission-channel', required=True)
+@click.option('--is-static', is_flag=True, default=False)
+@click.option('--is-fc-pf', is_flag=True, default=False)
+@click.option('-i', '--fc-pf-id')
+@click.option('-n', '--notes')
+@click.option('-w', '--max-workers', default=4, show_default=True)
+@click.option('--eval-mode', is_flag=True, default=False, help="Evaluate without writing submissions")
+def submit_fflogs_bulk_cmd(urls_file, submitted_by_name, submission_channel, is_static, is_fc_pf, fc_pf_id, notes,
+                           max_workers, eval_mode):
+    fflogs_urls = [
+        line.strip() for line in urls_file
+        if line.strip() != '' and not line.strip().startswith('#')
+    ]
+    resp = submit_fflogs_bulk(
+        fflogs_urls,
+        {'name': submitted_by_name},
+        submission_channel,
+        is_static=is_static,
+        is_fc_pf=is_fc_pf,
+        fc_pf_id=fc_pf_id,
+        notes=notes,
+        eval_mode=eval_mode,
+        max_workers=max_workers
+    )
+    click.echo(tabulate(
+        [
+            [r['fflogs_url'], r['status'], r.get('submission_uuid') or r.get('error') or r.get('duplicate_of') or '']
+            for r in resp['results']
+        ],
+        headers=['FFLogs URL', 'Status', 'Submission / Details']
+    ))
+    click.echo(f"\n{resp['submitted']} submissions written")
+
+
+@axs.command(name='drain-queue', help='Commit every queued submission a reviewer has recorded decisions on')
+@click.option('-w', '--num-workers', default=DEFAULT_NUM_WORKERS, show_default=True,
+              type=click.IntRange(1, MAX_NUM_WORKERS))
+def drain_queue_cmd(num_workers):
+    resp = drain_submissions_queue(num_workers=num_workers)
+    click.echo(tabulate(
+        [
+            [w['worker_id'], w['members'], w['points_events'], w['elapsed_s'], w['points_events_per_s'],
+             w['failed_members']]
+            for w in resp['workers']
+        ],
+        headers=['Worker', 'Members', 'Points events', 'Elapsed (s)', 'Events/s', 'Failed members']
+    ))
+    click.echo(
+        f"\n{resp['reviewed']} of {resp['ready']} ready submissions reviewed "
+        f"({resp['queued']} queued) in {resp['elapsed_s']}s"
+    )
+    for submission_uuid in resp['partially_committed']:
+        click.echo(f"Partially committed, left in queue: {submission_uuid}")
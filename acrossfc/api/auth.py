@@ -0,0 +1,136 @@
+# stdlib
+import time
+import hashlib
+import logging
+import threading
+from typing import Optional, Dict, NamedTuple
+
+# 3rd-party
+import requests
+
+# Local
+from acrossfc.core.config import FC_CONFIG
+from acrossfc.ext.ddb_client import DDB_CLIENT
+
+LOG = logging.getLogger(__name__)
+
+DISCORD_USERS_ME_URL = "https://discord.com/api/v10/users/@me"
+
+
+class AuthResult(NamedTuple):
+    status_code: int
+    discord_id: Optional[str] = None
+    discord_name: Optional[str] = None
+
+
+class _AuthCacheEntry(NamedTuple):
+    discord_id: str
+    discord_name: str
+    allowed: bool
+    allow_list_hash: str
+    expires_at: float
+
+
+def _hash(value: str) -> str:
+    return hashlib.sha256(value.encode('utf-8')).hexdigest()
+
+
+def _allow_list_hash() -> str:
+    return _hash(str(FC_CONFIG.allowed_discord_id_list))
+
+
+def _is_allowed(discord_id: str) -> bool:
+    return discord_id in FC_CONFIG.allowed_discord_id_list
+
+
+class DiscordAuthCache:
+    """
+    TTL cache of Discord access token -> (Discord ID, allow decision).
+
+    Tokens are only ever stored as a SHA-256 hash. Entries live in-process, so they survive warm
+    Lambda invocations, and are optionally shared across instances through DynamoDB.
+    The allow decision is recomputed whenever allowed_discord_id_list has changed since it was cached.
+    """
+    def __init__(self, ttl_s: int, use_ddb: bool = False):
+        self.ttl_s = ttl_s
+        self.use_ddb = use_ddb
+        self._entries: Dict[str, _AuthCacheEntry] = {}
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> Optional[_AuthCacheEntry]:
+        token_hash = _hash(token)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(token_hash)
+        if entry is None and self.use_ddb:
+            item = DDB_CLIENT.get_auth_cache_entry(token_hash)
+            if item is not None:
+                entry = _AuthCacheEntry(
+                    discord_id=item['discord_id'],
+                    discord_name=item['discord_name'],
+                    allowed=item['allowed'],
+                    allow_list_hash=item['allow_list_hash'],
+                    expires_at=float(item['expires_at'])
+                )
+        if entry is None or entry.expires_at <= now:
+            return None
+
+        if entry.allow_list_hash != _allow_list_hash():
+            entry = entry._replace(allowed=_is_allowed(entry.discord_id), allow_list_hash=_allow_list_hash())
+
+        with self._lock:
+            self._entries[token_hash] = entry
+        return entry
+
+    def put(self, token: str, discord_id: str, discord_name: str) -> _AuthCacheEntry:
+        token_hash = _hash(token)
+        entry = _AuthCacheEntry(
+            discord_id=discord_id,
+            discord_name=discord_name,
+            allowed=_is_allowed(discord_id),
+            allow_list_hash=_allow_list_hash(),
+            expires_at=time.time() + self.ttl_s
+        )
+        with self._lock:
+            self._entries[token_hash] = entry
+        if self.use_ddb:
+            DDB_CLIENT.put_auth_cache_entry({
+                'token_hash': token_hash,
+                'discord_id': entry.discord_id,
+                'discord_name': entry.discord_name,
+                'allowed': entry.allowed,
+                'allow_list_hash': entry.allow_list_hash,
+                # Also used as the DynamoDB TTL attribute
+                'expires_at': int(entry.expires_at)
+            })
+        return entry
+
+
+AUTH_CACHE = DiscordAuthCache(
+    ttl_s=FC_CONFIG.auth_cache_ttl_s,
+    use_ddb=FC_CONFIG.ddb_auth_cache_table is not None
+)
+
+
+def authorize_discord_access_token(access_token: str) -> AuthResult:
+    """
+    Resolves a Discord OAuth access token to a Discord user and checks it against the allow list.
+    Only calls Discord when the token is not already cached.
+    """
+    entry = AUTH_CACHE.get(access_token)
+    if entry is None:
+        d_resp = requests.get(DISCORD_USERS_ME_URL, headers={
+            'Authorization': f"Bearer {access_token}"
+        })
+        if d_resp.status_code != 200:
+            LOG.error(f"Error while trying to authorize with Discord. {d_resp.text}")
+            return AuthResult(401)
+
+        entry = AUTH_CACHE.put(access_token, d_resp.json()['id'], d_resp.json()['username'])
+
+    if not entry.allowed:
+        LOG.warn(f"Discord user {entry.discord_name} ({entry.discord_id}) tried to access the API.")
+        return AuthResult(403, entry.discord_id, entry.discord_name)
+
+    return AuthResult(200, entry.discord_id, entry.discord_name)
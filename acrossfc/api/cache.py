@@ -0,0 +1,155 @@
+# stdlib
+import copy
+import time
+import inspect
+import logging
+import threading
+import functools
+from typing import Any, Dict, NamedTuple, Tuple
+
+# Local
+from acrossfc.core.config import FC_CONFIG
+from acrossfc.ext.ddb_client import DDB_CLIENT
+
+LOG = logging.getLogger(__name__)
+
+
+class _CacheEntry(NamedTuple):
+    value: Any
+    stored_at: float
+    expires_at: float
+
+
+class CacheStats:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.shared_hits = 0
+        self.invalidations = 0
+        self.total_hit_age_s = 0.0
+        self.max_hit_age_s = 0.0
+
+    def record_hit(self, age_s: float, shared: bool = False):
+        self.hits += 1
+        self.shared_hits += int(shared)
+        self.total_hit_age_s += age_s
+        self.max_hit_age_s = max(self.max_hit_age_s, age_s)
+
+    def to_dict(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'shared_hits': self.shared_hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+            'hit_ratio': self.hits / lookups if lookups > 0 else 0.0,
+            # Age of the cached value at the time it was served, i.e. how stale responses were
+            'avg_hit_age_s': self.total_hit_age_s / self.hits if self.hits > 0 else 0.0,
+            'max_hit_age_s': self.max_hit_age_s,
+        }
+
+
+class ResponseCache:
+    """
+    TTL cache for read-heavy API responses.
+
+    Entries are kept in-process, so they survive warm Lambda invocations. Writers invalidate the exact
+    keys they affect, but only the shared DynamoDB table carries that to other instances, and a read
+    that started before the write can still store the old value after the invalidation. local_ttl_s
+    bounds how long a stale value can be served either way: with the table, the in-process copy is only
+    trusted for local_ttl_s, and keys cached with invalidated_on_write are kept for at most local_ttl_s
+    instead of their full TTL.
+
+    Callers get their own copy of a cached value, so mutating a response never changes the cache.
+    """
+    def __init__(self, use_ddb: bool = False, local_ttl_s: int = 15):
+        self.use_ddb = use_ddb
+        self.local_ttl_s = local_ttl_s
+        self.stats = CacheStats()
+        self._entries: Dict[str, _CacheEntry] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(namespace: str, *args) -> str:
+        return ':'.join([namespace] + [str(a) for a in args])
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+
+        if entry is not None and entry.expires_at > now:
+            local_ok = not self.use_ddb or (now - entry.stored_at) < self.local_ttl_s
+            if local_ok:
+                self.stats.record_hit(now - entry.stored_at)
+                return True, copy.deepcopy(entry.value)
+
+        if self.use_ddb:
+            item = DDB_CLIENT.get_response_cache_entry(key)
+            if item is not None and float(item['expires_at']) > now:
+                entry = _CacheEntry(item['value'], float(item['stored_at']), float(item['expires_at']))
+                with self._lock:
+                    # Restart the local trust window from now
+                    self._entries[key] = entry._replace(stored_at=now)
+                self.stats.record_hit(now - entry.stored_at, shared=True)
+                return True, copy.deepcopy(entry.value)
+
+        self.stats.misses += 1
+        return False, None
+
+    def set(self, key: str, value: Any, ttl_s: int):
+        now = time.time()
+        entry = _CacheEntry(copy.deepcopy(value), now, now + ttl_s)
+        with self._lock:
+            self._entries[key] = entry
+        if self.use_ddb:
+            DDB_CLIENT.put_response_cache_entry({
+                'cache_key': key,
+                'value': value,
+                'stored_at': int(entry.stored_at),
+                # Also used as the DynamoDB TTL attribute
+                'expires_at': int(entry.expires_at)
+            })
+
+    def invalidate(self, namespace: str, *args):
+        key = self.make_key(namespace, *args)
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.use_ddb:
+            DDB_CLIENT.delete_response_cache_entry(key)
+        self.stats.invalidations += 1
+        LOG.debug(f"Invalidated response cache key {key}")
+
+    def cached(self, namespace: str, ttl_s: int, invalidated_on_write: bool = False):
+        """
+        Caches the decorated function's return value under `namespace:<arg1>:<arg2>...`,
+        using the bound arguments (with defaults applied) as the rest of the key.
+
+        Set invalidated_on_write for namespaces that writers invalidate, so they're only cached for
+        local_ttl_s.
+        """
+        def decorator(func):
+            signature = inspect.signature(func)
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                key = self.make_key(namespace, *bound.arguments.values())
+
+                found, value = self.get(key)
+                if found:
+                    return value
+
+                value = func(*args, **kwargs)
+                if value is not None:
+                    self.set(key, value, min(ttl_s, self.local_ttl_s) if invalidated_on_write else ttl_s)
+                return value
+            return wrapper
+        return decorator
+
+
+RESPONSE_CACHE = ResponseCache(
+    use_ddb=FC_CONFIG.ddb_response_cache_table is not None,
+    local_ttl_s=FC_CONFIG.response_cache_local_ttl_s
+)
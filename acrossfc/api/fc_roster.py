@@ -1,9 +1,20 @@
-from typing import List
+# stdlib
+import logging
+from typing import TYPE_CHECKING, List, Dict, Optional
 
-from acrossfc.core.model import Member
+# Local
+from acrossfc.ext import discord_client as DISCORD_API
+from acrossfc.ext.ddb_client import DDB_CLIENT
 from acrossfc.ext.fflogs_client import FFLOGS_CLIENT
+from .cache import RESPONSE_CACHE
 
+if TYPE_CHECKING:
+    from acrossfc.core.model import Member
 
+LOG = logging.getLogger(__name__)
+
+
+@RESPONSE_CACHE.cached('fc_roster', ttl_s=600)
 def get_fc_roster():
     roster: List[Member] = FFLOGS_CLIENT.get_fc_roster()
     return [
@@ -25,3 +36,70 @@ def get_member_id_by_name(name: str):
             return m.fcid
 
     return None
+
+
+def _normalize_name(name: Optional[str]) -> Optional[str]:
+    if name is None:
+        return None
+    return ' '.join(name.split()).casefold()
+
+
+def match_discord_member(discord_member: Dict, name_to_member: Dict[str, 'Member']) -> Optional['Member']:
+    """
+    Matches a Discord guild member to an FFLogs roster entry by character name.
+    The server nickname is checked first, then the global display name, then the user name.
+    """
+    user = discord_member['user']
+    for candidate in (discord_member.get('nick'), user.get('global_name'), user.get('username')):
+        member = name_to_member.get(_normalize_name(candidate))
+        if member is not None:
+            return member
+    return None
+
+
+def sync_discord_members(dry_run: bool = False):
+    """
+    Streams all Discord guild members, matches them to the FFLogs roster and writes the matches
+    into the members table in batches. When several Discord members match the same roster entry,
+    the first one streamed (the lowest user ID) is kept.
+    """
+    roster: List[Member] = FFLOGS_CLIENT.get_fc_roster()
+    name_to_member = {_normalize_name(m.name): m for m in roster}
+
+    records_by_member_id: Dict[int, Dict] = {}
+    unmatched = 0
+    ambiguous = 0
+    for discord_member in DISCORD_API.iter_guild_members():
+        user = discord_member['user']
+        if user.get('bot', False):
+            continue
+        member = match_discord_member(discord_member, name_to_member)
+        if member is None:
+            unmatched += 1
+            continue
+        if member.fcid in records_by_member_id:
+            ambiguous += 1
+            LOG.warning(
+                f"Discord user {user['id']} also matches {member.name}, already matched to Discord user "
+                f"{records_by_member_id[member.fcid]['discord_user_id']}. Skipping it."
+            )
+            continue
+        records_by_member_id[member.fcid] = {
+            'member_id': member.fcid,
+            'name': member.name,
+            'discord_user_id': int(user['id']),
+            'discord_server_name': discord_member.get('nick'),
+            'discord_global_name': user.get('global_name'),
+            'discord_user_name': user.get('username')
+        }
+
+    records = list(records_by_member_id.values())
+    LOG.info(
+        f"Matched {len(records)} Discord members to the FC roster. {unmatched} could not be matched, "
+        f"{ambiguous} matched an FC member someone else already had."
+    )
+    if not dry_run:
+        DDB_CLIENT.batch_add_members(records)
+        LOG.info(f"Wrote {len(records)} members to DynamoDB.")
+
+    return records
@@ -0,0 +1,63 @@
+# stdlib
+import hmac
+import json
+import base64
+import hashlib
+from typing import Dict, NamedTuple
+
+# Local
+from acrossfc.core.config import FC_CONFIG
+from acrossfc.utils import json_dumps
+
+NEXT = 'next'
+PREV = 'prev'
+
+
+class Cursor(NamedTuple):
+    scope: str
+    key: Dict
+    direction: str
+
+
+def _signing_key() -> bytes:
+    if FC_CONFIG.api_cursor_key is not None:
+        return FC_CONFIG.api_cursor_key.encode('utf-8')
+    # Derive a dedicated key rather than signing with the FFLogs secret directly
+    return hmac.new(FC_CONFIG.fflogs_client_secret.encode('utf-8'), b'acrossfc-api-cursor', hashlib.sha256).digest()
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + '=' * (-len(data) % 4))
+
+
+def encode_cursor(scope: str, key: Dict, direction: str) -> str:
+    """
+    Encodes a DynamoDB key as an opaque, URL-safe cursor.
+    `scope` (e.g. the tier) is signed along with the key, so a cursor can't be replayed against another listing.
+    """
+    payload = json_dumps({'s': scope, 'k': key, 'd': direction}).encode('utf-8')
+    signature = hmac.new(_signing_key(), payload, hashlib.sha256).digest()[:16]
+    return f"{_b64encode(payload)}.{_b64encode(signature)}"
+
+
+def decode_cursor(cursor: str, scope: str) -> Cursor:
+    try:
+        payload_str, signature_str = cursor.split('.')
+        payload = _b64decode(payload_str)
+        signature = _b64decode(signature_str)
+    except ValueError:
+        raise ValueError("Malformed cursor")
+
+    expected_signature = hmac.new(_signing_key(), payload, hashlib.sha256).digest()[:16]
+    if not hmac.compare_digest(signature, expected_signature):
+        raise ValueError("Invalid cursor")
+
+    data = json.loads(payload)
+    if data['s'] != scope or data['d'] not in (NEXT, PREV):
+        raise ValueError("Cursor does not belong to this listing")
+
+    return Cursor(data['s'], data['k'], data['d'])
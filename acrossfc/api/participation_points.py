@@ -1,46 +1,93 @@
 # stdlib
 import logging
-from itertools import groupby
-from typing import Optional, List
+from collections import defaultdict
+from typing import Optional, Dict, List, Tuple
 
 # Local
 from acrossfc.core.config import FC_CONFIG
 from acrossfc.core.model import PointsCategory, PointsEvent, PointsEventStatus
 from acrossfc.api.fc_roster import get_member_id_by_name
 from acrossfc.ext.ddb_client import DDB_CLIENT
+from .cache import RESPONSE_CACHE
 
 LOG = logging.getLogger(__name__)
 
 
+def _new_member_points(tier: str, member_id: int):
+    return {
+        'member_id': member_id,
+        'tier': tier,
+        'total_points': 0,
+        'one_time': {},
+        'points_events': []
+    }
+
+
+def apply_points_events(member_points: Dict, points_events: List[PointsEvent]):
+    """
+    Adds points events to a member's points item in place.
+    One-time events that were already awarded are marked ONE_TIME_POINTS_ALREADY_AWARDED instead.
+    Events already in the item (by uuid) are skipped, so retrying a partly failed commit doesn't pay them twice.
+    """
+    committed_uuids = {pe['uuid'] for pe in member_points['points_events']}
+    committed_uuids.update(pe['uuid'] for pe in member_points['one_time'].values())
+    for pe in points_events:
+        if pe.uuid in committed_uuids:
+            continue
+        if pe.category.is_one_time:
+            if pe.category.name in member_points['one_time']:
+                pe.status = PointsEventStatus.ONE_TIME_POINTS_ALREADY_AWARDED
+            else:
+                member_points['one_time'][pe.category.name] = pe.to_user_json()
+                member_points['total_points'] += pe.points
+        else:
+            member_points['points_events'].append(pe.to_user_json())
+            member_points['total_points'] += pe.points
+
+
+def group_points_events_by_member(points_events: List[PointsEvent]) -> Dict[int, List[PointsEvent]]:
+    grouped = defaultdict(list)
+    for pe in points_events:
+        grouped[int(pe.member_id)].append(pe)
+    return grouped
+
+
 def commit_member_points_events(
     points_events: List[PointsEvent],
     tier: str
 ):
-    grouped = groupby(points_events, key=lambda pe: pe.member_id)
-
-    for member_id, group in grouped:
+    for member_id, group in group_points_events_by_member(points_events).items():
         member_points = DDB_CLIENT.get_member_points(tier, member_id)
         if member_points is None:
-            member_points = {
-                'member_id': member_id,
-                'tier': tier,
-                'total_points': 0,
-                'one_time': {},
-                'points_events': []
-            }
-        for pe in group:
-            if pe.category.is_one_time:
-                if pe.category.name in member_points['one_time']:
-                    pe.status = PointsEventStatus.ONE_TIME_POINTS_ALREADY_AWARDED
-                else:
-                    member_points['one_time'][pe.category.name] = pe.to_user_json()
-                    member_points['total_points'] += pe.points
-            else:
-                member_points['points_events'].append(pe.to_user_json())
-                member_points['total_points'] += pe.points
-
+            member_points = _new_member_points(tier, member_id)
+        apply_points_events(member_points, group)
         DDB_CLIENT.update_member_points(member_points)
 
+    RESPONSE_CACHE.invalidate('ppts_leaderboard', tier)
+
+
+def commit_member_points_events_bulk(points_events_by_tier: Dict[str, List[PointsEvent]]):
+    """
+    Commits points events for many members at once: every affected member's points item is read
+    with batched gets, updated once with all of their events, and written back with a batch writer.
+    """
+    member_points_to_write = []
+    for tier, points_events in points_events_by_tier.items():
+        grouped = group_points_events_by_member(points_events)
+        existing: Dict[Tuple[str, int], Dict] = {
+            (mp['tier'], int(mp['member_id'])): mp
+            for mp in DDB_CLIENT.batch_get_member_points(tier, list(grouped.keys()))
+        }
+        for member_id, group in grouped.items():
+            member_points = existing.get((tier, member_id), None) or _new_member_points(tier, member_id)
+            apply_points_events(member_points, group)
+            member_points_to_write.append(member_points)
+
+    DDB_CLIENT.batch_update_member_points(member_points_to_write)
+
+    for tier in points_events_by_tier:
+        RESPONSE_CACHE.invalidate('ppts_leaderboard', tier)
+
 
 def remove_points_events(tier: str, member_id: int, pe_uuid_list: List[str]):
     print(pe_uuid_list)
@@ -64,6 +111,7 @@ def remove_points_events(tier: str, member_id: int, pe_uuid_list: List[str]):
             member_points['total_points'] -= pe['points']
 
     DDB_CLIENT.update_member_points(member_points)
+    RESPONSE_CACHE.invalidate('ppts_leaderboard', tier)
 
 
 def get_points_for_member(tier: str, member_id: int):
@@ -86,6 +134,7 @@ def remove_one_time_points(tier: str, member_id: int, category: PointsCategory):
     member_points['total_points'] -= member_points['one_time'][category.name]['points']
     del member_points['one_time'][category.name]
     DDB_CLIENT.update_member_points(member_points)
+    RESPONSE_CACHE.invalidate('ppts_leaderboard', tier)
 
 
 def remove_points_event(member_id: int, tier: str, point_event_uuid: str):
@@ -95,8 +144,24 @@ def remove_points_event(member_id: int, tier: str, point_event_uuid: str):
             member_points['total_points'] -= pe['points']
             member_points['points_events'].remove(pe)
             DDB_CLIENT.update_member_points(member_points)
+            RESPONSE_CACHE.invalidate('ppts_leaderboard', tier)
             break
 
 
+@RESPONSE_CACHE.cached('ppts_leaderboard', ttl_s=300, invalidated_on_write=True)
 def get_points_leaderboard(tier: Optional[str] = FC_CONFIG.current_submissions_tier):
     return DDB_CLIENT.get_points_leaderboard(tier)
+
+
+@RESPONSE_CACHE.cached('ppts_table', ttl_s=86400)
+def get_points_table():
+    return [
+        {
+            'category_id': category.value,
+            'name': category.name,
+            'description': category.description,
+            'constraints': category.constraints,
+            'points': category.points
+        }
+        for category in PointsCategory
+    ]
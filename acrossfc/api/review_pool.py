@@ -0,0 +1,143 @@
+# stdlib
+import time
+import logging
+from dataclasses import dataclass, field
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Set, Tuple
+
+# Local
+from acrossfc.core.model import PointsEvent, PointsEventStatus, SubmissionType
+from acrossfc.ext.ddb_client import DDB_CLIENT
+from .participation_points import commit_member_points_events
+from .submissions import _get_approved_points_events, _mark_submission_reviewed
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_NUM_WORKERS = 4
+MAX_NUM_WORKERS = 8
+
+
+@dataclass
+class WorkerMetrics:
+    worker_id: int
+    members: int = 0
+    points_events: int = 0
+    elapsed_s: float = 0.0
+    failed: Set[Tuple[str, int]] = field(default_factory=set)
+
+    def to_dict(self) -> Dict:
+        return {
+            'worker_id': self.worker_id,
+            'members': self.members,
+            'points_events': self.points_events,
+            'elapsed_s': round(self.elapsed_s, 3),
+            'members_per_s': round(self.members / self.elapsed_s, 2) if self.elapsed_s > 0 else 0.0,
+            'points_events_per_s': round(self.points_events / self.elapsed_s, 2) if self.elapsed_s > 0 else 0.0,
+            'failed_members': len(self.failed),
+        }
+
+
+def is_ready_for_commit(submission: Dict) -> bool:
+    """
+    Queued additions a reviewer has recorded a decision on (see submissions.record_review_decision) can be
+    committed unattended. Evaluated points events start out PENDING, so anything without one is left queued.
+    """
+    return (
+        submission['submission_type'] != SubmissionType.REMOVE.value
+        and submission.get('decided_ts', None) is not None
+        and all(pe['status'] != PointsEventStatus.PENDING.value for pe in submission['points_events'])
+    )
+
+
+def partition_by_member(
+    points_events: List[PointsEvent],
+    tier_by_submission: Dict[str, str],
+    num_workers: int
+) -> List[Dict[Tuple[str, int], List[PointsEvent]]]:
+    """
+    Splits points events into num_workers partitions keyed by (tier, member_id).
+    A member always lands in the same partition, so no two workers read-modify-write the same points item.
+    """
+    partitions: List[Dict[Tuple[str, int], List[PointsEvent]]] = [defaultdict(list) for _ in range(num_workers)]
+    for pe in points_events:
+        member_id = int(pe.member_id)
+        partitions[member_id % num_workers][(tier_by_submission[pe.submission_uuid], member_id)].append(pe)
+    return partitions
+
+
+def _run_partition(worker_id: int, partition: Dict[Tuple[str, int], List[PointsEvent]]) -> WorkerMetrics:
+    metrics = WorkerMetrics(worker_id=worker_id)
+    start = time.perf_counter()
+    for (tier, member_id), points_events in partition.items():
+        try:
+            commit_member_points_events(points_events, tier=tier)
+            metrics.members += 1
+            metrics.points_events += len(points_events)
+        except Exception as e:
+            LOG.error(f"Worker {worker_id} failed to commit points for member {member_id} ({tier}): {e}")
+            metrics.failed.add((tier, member_id))
+    metrics.elapsed_s = time.perf_counter() - start
+    return metrics
+
+
+def drain_submissions_queue(num_workers: int = DEFAULT_NUM_WORKERS) -> Dict:
+    """
+    Commits every queued submission that is ready for commit, using num_workers threads (1 to MAX_NUM_WORKERS).
+
+    Points events are partitioned by member and each partition is committed by one worker. Submissions
+    are only marked reviewed and removed from the queue once every member they touch committed cleanly;
+    the rest stay queued and are reported as partially committed. The next drain retries them, and events
+    already in a member's points item are skipped, so members whose points were written aren't paid twice.
+    """
+    if not 1 <= num_workers <= MAX_NUM_WORKERS:
+        raise ValueError(f"num_workers must be between 1 and {MAX_NUM_WORKERS}, got {num_workers}")
+
+    start = time.perf_counter()
+    queue_entries = DDB_CLIENT.scan_submissions_queue()
+    submissions = [
+        sub for sub in DDB_CLIENT.batch_get_submissions([entry['uuid'] for entry in queue_entries])
+        if is_ready_for_commit(sub)
+    ]
+
+    points_events_by_submission: Dict[str, List[PointsEvent]] = {
+        sub['uuid']: _get_approved_points_events(sub)
+        for sub in submissions
+    }
+    tier_by_submission = {sub['uuid']: sub['tier'] for sub in submissions}
+    partitions = partition_by_member(
+        [pe for pes in points_events_by_submission.values() for pe in pes],
+        tier_by_submission,
+        num_workers
+    )
+
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        worker_metrics = list(executor.map(_run_partition, range(num_workers), partitions))
+
+    failed_members = set().union(*(metrics.failed for metrics in worker_metrics))
+
+    reviewed = []
+    partially_committed = []
+    for sub in submissions:
+        points_events = points_events_by_submission[sub['uuid']]
+        if any((sub['tier'], int(pe.member_id)) in failed_members for pe in points_events):
+            LOG.error(f"Submission {sub['uuid']} was only partially committed and was left in the queue.")
+            partially_committed.append(sub['uuid'])
+            continue
+        _mark_submission_reviewed(sub, points_events)
+        reviewed.append(sub)
+    DDB_CLIENT.batch_complete_submission_reviews(reviewed)
+
+    elapsed_s = time.perf_counter() - start
+    LOG.info(
+        f"Drained {len(reviewed)}/{len(queue_entries)} queued submissions "
+        f"with {num_workers} workers in {elapsed_s:.2f}s."
+    )
+    return {
+        'queued': len(queue_entries),
+        'ready': len(submissions),
+        'reviewed': len(reviewed),
+        'partially_committed': partially_committed,
+        'elapsed_s': round(elapsed_s, 3),
+        'workers': [metrics.to_dict() for metrics in worker_metrics],
+    }
@@ -0,0 +1,283 @@
+# stdlib
+import re
+import inspect
+import typing
+from collections import defaultdict
+from typing import Optional, Any, Callable, Dict, List, NamedTuple, Tuple
+
+# Local
+from acrossfc.core.config import FC_CONFIG
+from acrossfc.ext.ddb_client import DDB_CLIENT
+from . import submissions, participation_points, fc_roster, review_pool
+from .cache import RESPONSE_CACHE
+
+_PATH_PARAM_RE = re.compile(r'^\{([a-zA-Z_][a-zA-Z0-9_]*)\}$')
+_PATH_PARAM_VALUE_PATTERN = r'[a-zA-Z0-9_-]+'
+_TRUE_STRINGS = {'1', 'true', 'yes', 'on'}
+_FALSE_STRINGS = {'0', 'false', 'no', 'off'}
+
+
+class RouteNotFound(Exception):
+    pass
+
+
+class MethodNotAllowed(RouteNotFound):
+    """The path exists, but not for this method."""
+    def __init__(self, msg: str, allowed_methods: List[str]):
+        super().__init__(msg)
+        self.allowed_methods = allowed_methods
+
+
+class InvalidParameter(ValueError):
+    pass
+
+
+class Param(NamedTuple):
+    name: str
+    type: Any
+    required: bool
+    default: Any
+
+
+class Route(NamedTuple):
+    method: str
+    pattern: str
+    handler: Callable
+    regex: Optional[re.Pattern]
+    params: Dict[str, Param]
+
+    @property
+    def is_static(self):
+        return self.regex is None
+
+
+def _unwrap_optional(annotation):
+    if typing.get_origin(annotation) is typing.Union:
+        args = [a for a in typing.get_args(annotation) if a is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def _coerce(param: Param, value):
+    if value is None or param.type in (Any, inspect.Parameter.empty):
+        return value
+    try:
+        if param.type is bool:
+            if isinstance(value, bool):
+                return value
+            if str(value).lower() in _TRUE_STRINGS:
+                return True
+            if str(value).lower() in _FALSE_STRINGS:
+                return False
+            raise ValueError(value)
+        if param.type in (int, float, str):
+            return param.type(value)
+    except (TypeError, ValueError):
+        raise InvalidParameter(f"Invalid value for '{param.name}': {value!r}")
+    return value
+
+
+class Router:
+    """
+    Declarative route table shared by the API Lambda and the local dev server.
+
+    Route patterns are compiled once when they are registered. Static routes resolve with a single
+    dict lookup; parameterized routes are bucketed by (method, segment count, first segment) so only
+    a handful of precompiled patterns are ever tried. Path, query and body parameters are coerced
+    according to the handler's type annotations.
+    """
+    def __init__(self):
+        self._routes: List[Route] = []
+        self._static: Dict[Tuple[str, str], Route] = {}
+        self._dynamic: Dict[Tuple[str, int, str], List[Route]] = defaultdict(list)
+
+    @property
+    def routes(self) -> List[Route]:
+        return list(self._routes)
+
+    def route(self, method: str, pattern: str):
+        def decorator(handler: Callable):
+            self.add_route(method, pattern, handler)
+            return handler
+        return decorator
+
+    def add_route(self, method: str, pattern: str, handler: Callable):
+        method = method.upper()
+        segments = pattern.strip('/').split('/')
+
+        regex = None
+        if any(_PATH_PARAM_RE.match(s) for s in segments):
+            regex_parts = []
+            for s in segments:
+                m = _PATH_PARAM_RE.match(s)
+                regex_parts.append(f"(?P<{m.group(1)}>{_PATH_PARAM_VALUE_PATTERN})" if m else re.escape(s))
+            regex = re.compile('/' + '/'.join(regex_parts))
+
+        type_hints = typing.get_type_hints(handler)
+        params = {
+            name: Param(
+                name=name,
+                type=_unwrap_optional(type_hints.get(name, Any)),
+                required=p.default is inspect.Parameter.empty,
+                default=None if p.default is inspect.Parameter.empty else p.default
+            )
+            for name, p in inspect.signature(handler).parameters.items()
+        }
+
+        route = Route(method, pattern, handler, regex, params)
+        self._routes.append(route)
+        if route.is_static:
+            self._static[(method, '/' + '/'.join(segments))] = route
+        else:
+            self._dynamic[(method, len(segments), segments[0])].append(route)
+
+    def _match(self, method: str, path: str) -> Optional[Tuple[Route, Dict[str, str]]]:
+        route = self._static.get((method, path), None)
+        if route is not None:
+            return route, {}
+
+        segments = path[1:].split('/')
+        for route in self._dynamic.get((method, len(segments), segments[0]), []):
+            m = route.regex.fullmatch(path)
+            if m:
+                return route, m.groupdict()
+        return None
+
+    def resolve(self, method: str, path: str) -> Tuple[Route, Dict[str, str]]:
+        method = method.upper()
+        path = '/' + path.strip('/')
+
+        match = self._match(method, path)
+        if match is not None:
+            return match
+
+        # Only looked up once the request is already failing
+        allowed_methods = sorted({
+            route.method for route in self._routes
+            if route.method != method and self._match(route.method, path) is not None
+        })
+        if len(allowed_methods) > 0:
+            raise MethodNotAllowed(f"{method} {path}", allowed_methods)
+        raise RouteNotFound(f"{method} {path}")
+
+    def dispatch(
+        self,
+        method: str,
+        path: str,
+        query_params: Optional[Dict[str, str]] = None,
+        body: Optional[Dict] = None,
+        caller_discord_id: Optional[str] = None
+    ):
+        """
+        Calls the handler for the request. Handlers that take a caller_discord_id parameter get the Discord ID
+        the request was authenticated as (None for bot-signed requests); it can't be given in the query.
+        """
+        route, path_params = self.resolve(method, path)
+        given = (query_params or {}) | path_params
+        if 'body' in route.params:
+            given['body'] = body or {}
+        if 'caller_discord_id' in route.params:
+            given['caller_discord_id'] = caller_discord_id
+
+        kwargs = {}
+        for name, param in route.params.items():
+            if name in given:
+                kwargs[name] = _coerce(param, given[name])
+            elif param.required:
+                raise InvalidParameter(f"Missing required parameter '{name}'")
+
+        return route.handler(**kwargs)
+
+
+ROUTER = Router()
+
+
+@ROUTER.route('GET', '/current_tier')
+def get_current_submissions_tier():
+    return submissions.get_current_submissions_tier()
+
+
+@ROUTER.route('GET', '/fc_roster')
+def get_fc_roster():
+    return fc_roster.get_fc_roster()
+
+
+@ROUTER.route('GET', '/submissions')
+def get_submissions(
+    tier: str = FC_CONFIG.current_submissions_tier,
+    cursor: Optional[str] = None,
+    limit: int = submissions.DEFAULT_PAGE_SIZE,
+    fields: str = 'summary'
+):
+    # Full items are only served by /submissions/{uuid}
+    try:
+        return submissions.get_submissions_for_tier(tier, cursor=cursor, limit=limit, fields=fields)
+    except ValueError as e:
+        raise InvalidParameter(str(e))
+
+
+@ROUTER.route('GET', '/submissions/queue')
+def get_submissions_queue():
+    return submissions.get_submissions_queue()
+
+
+@ROUTER.route('GET', '/submissions/{uuid}')
+def get_submission_by_uuid(uuid: str):
+    return DDB_CLIENT.get_submission_by_uuid(uuid)
+
+
+@ROUTER.route('POST', '/submissions/fflogs')
+def submit_fflogs(body: Dict, caller_discord_id: Optional[str] = None):
+    return submissions.submit_fflogs(**(body | {'caller_discord_id': caller_discord_id}))
+
+
+@ROUTER.route('POST', '/submissions/fflogs/bulk')
+def submit_fflogs_bulk(body: Dict, caller_discord_id: Optional[str] = None):
+    return submissions.submit_fflogs_bulk(**(body | {'caller_discord_id': caller_discord_id}))
+
+
+@ROUTER.route('POST', '/submissions/review')
+def review_submission(body: Dict):
+    return submissions.review_submission(body['submission'])
+
+
+@ROUTER.route('POST', '/submissions/review/decision')
+def record_review_decision(body: Dict):
+    try:
+        return submissions.record_review_decision(body['submission'])
+    except ValueError as e:
+        raise InvalidParameter(str(e))
+
+
+@ROUTER.route('POST', '/submissions/review/bulk')
+def review_submissions_bulk(body: Dict):
+    return submissions.review_submissions_bulk(body['submissions'])
+
+
+@ROUTER.route('POST', '/submissions/queue/drain')
+def drain_submissions_queue(num_workers: int = review_pool.DEFAULT_NUM_WORKERS):
+    try:
+        return review_pool.drain_submissions_queue(num_workers)
+    except ValueError as e:
+        raise InvalidParameter(str(e))
+
+
+@ROUTER.route('GET', '/ppts')
+def get_points_for_member(member_id: int, tier: str = FC_CONFIG.current_submissions_tier):
+    return participation_points.get_points_for_member(tier, member_id)
+
+
+@ROUTER.route('GET', '/ppts/leaderboard')
+def get_points_leaderboard(tier: str = FC_CONFIG.current_submissions_tier):
+    return participation_points.get_points_leaderboard(tier)
+
+
+@ROUTER.route('GET', '/ppts/table')
+def get_points_table():
+    return participation_points.get_points_table()
+
+
+@ROUTER.route('GET', '/cache/stats')
+def get_cache_stats():
+    return RESPONSE_CACHE.stats.to_dict()
@@ -1,12 +1,11 @@
 # stdlib
+import re
 import uuid
 import time
 import logging
-from typing import Optional, Any, Dict, List, Union
-
-# 3rd-party
-import boto3
-from boto3.dynamodb.conditions import Key
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Optional, Any, Dict, List, Tuple, Union
 
 # Local
 from acrossfc.core.config import FC_CONFIG
@@ -17,9 +16,19 @@ from acrossfc.core.model import (
     SubmissionsChannel,
     SubmissionType
 )
-from acrossfc.core.points_evaluator import PointsEvaluator
 from acrossfc.ext.ddb_client import DDB_CLIENT
-from .participation_points import commit_member_points_events, remove_points_events
+from acrossfc.ext.fflogs_client import FFLOGS_CLIENT, parse_fflogs_url
+from .participation_points import (
+    commit_member_points_events,
+    commit_member_points_events_bulk,
+    remove_points_events
+)
+from .cache import RESPONSE_CACHE
+from .throttle import SUBMISSION_THROTTLE
+from . import pagination
+
+if TYPE_CHECKING:
+    from acrossfc.core.points_evaluator import PointsEvaluator
 
 LOG = logging.getLogger(__name__)
 
@@ -27,35 +36,99 @@ PointsCategoryLike = Union[PointsCategory, int, str]
 SubmissionsChannelLike = Union[SubmissionsChannel, int, str]
 ComboUserID = Dict[str, Union[int, str]]
 
+# Key attributes of the submissions table and its tier-ts-index
+SUBMISSION_KEY_FIELDS = ('uuid', 'tier', 'ts')
+SUBMISSION_SUMMARY_FIELDS = SUBMISSION_KEY_FIELDS + ('submitted_by', 'status_counts')
+_FIELD_NAME_RE = re.compile(r'[a-zA-Z_][a-zA-Z0-9_]*')
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+
 
 def get_submissions_for_tier(
     tier: str = FC_CONFIG.current_submissions_tier,
-    exclusive_start_key: Optional[Any] = None
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    fields: Optional[str] = None
 ):
-    # TODO: Iteratively get all, move to DDB_CLIENT
-    ddb = boto3.resource('dynamodb')
-    submissions_table = ddb.Table(FC_CONFIG.ddb_submissions_table)
-    query_args = {
-        'IndexName': 'tier-ts-index',
-        'KeyConditionExpression': Key('tier').eq(tier),
-        'ScanIndexForward': False,
-    }
-    if exclusive_start_key is not None:
-        query_args['ExclusiveStartKey'] = exclusive_start_key
+    """
+    Lists a page of submissions for a tier, newest first.
+
+    `cursor` is an opaque cursor from a previous page's `next_cursor` (older submissions) or
+    `prev_cursor` (newer submissions). Each page is a single query on the tier-ts-index starting at
+    the cursor, so deep pages cost the same as the first one.
+
+    `fields` is either "summary" or a comma-separated list of attribute names. It is pushed down to
+    DynamoDB as a ProjectionExpression, so unrequested attributes (e.g. points_events) are never read.
+    Full items are returned when it is None.
+    """
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    projection = parse_submission_fields(fields)
+
+    direction = pagination.NEXT
+    start_key = None
+    if cursor is not None:
+        _, start_key, direction = pagination.decode_cursor(cursor, scope=tier)
+
+    response = DDB_CLIENT.query_submissions_by_tier(
+        tier,
+        projection=projection,
+        exclusive_start_key=start_key,
+        limit=limit,
+        # Paging backwards walks the index in ascending order from the cursor
+        newest_first=(direction == pagination.NEXT)
+    )
+    items = response['Items']
+    has_more = response.get('LastEvaluatedKey', None) is not None
+
+    if direction == pagination.PREV:
+        items.reverse()
+        has_newer, has_older = has_more, True
+    else:
+        has_newer, has_older = start_key is not None, has_more
 
-    response = submissions_table.query(**query_args)
+    next_cursor = None
+    prev_cursor = None
+    if len(items) > 0:
+        if has_older:
+            next_cursor = pagination.encode_cursor(tier, _submission_index_key(items[-1]), pagination.NEXT)
+        if has_newer:
+            prev_cursor = pagination.encode_cursor(tier, _submission_index_key(items[0]), pagination.PREV)
 
     return {
-        'items': response['Items'],
-        'count': response['Count'],
-        'lastEvalutedKey': response.get('LastEvaluatedKey', None)
+        'items': items,
+        'count': len(items),
+        'next_cursor': next_cursor,
+        'prev_cursor': prev_cursor
     }
 
 
+def _submission_index_key(item: Dict) -> Dict:
+    return {k: item[k] for k in SUBMISSION_KEY_FIELDS}
+
+
+def parse_submission_fields(fields: Optional[str]) -> Optional[List[str]]:
+    if fields is None:
+        return None
+    if fields == 'summary':
+        return list(SUBMISSION_SUMMARY_FIELDS)
+
+    projection = [f.strip() for f in fields.split(',') if f.strip() != '']
+    for f in projection:
+        if not _FIELD_NAME_RE.fullmatch(f):
+            raise ValueError(f"Invalid submission field name: {f}")
+    # Always include the key attributes so that items can be identified
+    return list(dict.fromkeys(list(SUBMISSION_KEY_FIELDS) + projection))
+
+
+def get_submission_status_counts(points_events_json: List[Dict]) -> Dict[str, int]:
+    """Number of points events per PointsEventStatus name, stored on submissions for summary listings."""
+    counts = Counter(PointsEventStatus(pe['status']).name for pe in points_events_json)
+    return dict(counts)
+
+
 def get_submissions_queue(exclusive_start_key: Optional[Any] = None):
-    # TODO: Iteratively get all, move to DDB_CLIENT
-    ddb = boto3.resource('dynamodb')
-    submissions_table = ddb.Table(FC_CONFIG.ddb_submissions_queue_table)
+    # TODO: Iteratively get all
+    submissions_table = DDB_CLIENT.subs_q_table
 
     if exclusive_start_key is not None:
         response = submissions_table.scan(ExclusiveStartKey=exclusive_start_key)
@@ -70,10 +143,24 @@ def get_submissions_queue(exclusive_start_key: Optional[Any] = None):
     return data
 
 
+@RESPONSE_CACHE.cached('current_tier', ttl_s=86400)
 def get_current_submissions_tier():
     return FC_CONFIG.current_submissions_tier
 
 
+def _submission_throttle_key(submitted_by: ComboUserID, caller_discord_id: Optional[str]) -> str:
+    """
+    Submissions are throttled before any FFLogs queries are made, per Discord user: the caller the API
+    authenticated, or else the Discord user the bot submitted for. Submissions with neither (the CLI) are
+    throttled per submitter name.
+    """
+    if caller_discord_id is not None:
+        return f"submit_fflogs:{caller_discord_id}"
+    if submitted_by.get('discord_user_id', None) is not None:
+        return f"submit_fflogs:{submitted_by['discord_user_id']}"
+    return f"submit_fflogs:name:{submitted_by.get('name', None)}"
+
+
 def submit_fflogs(
     fflogs_url: str,
     submitted_by: ComboUserID,
@@ -82,13 +169,155 @@ def submit_fflogs(
     is_fc_pf: bool,
     fc_pf_id: Optional[str] = None,
     notes: Optional[str] = None,
-    eval_mode: bool = False
+    eval_mode: bool = False,
+    caller_discord_id: Optional[str] = None
 ):
     submission_channel = SubmissionsChannel.to_enum(submission_channel)
-    timestamp = int(time.time())
+    SUBMISSION_THROTTLE.acquire(_submission_throttle_key(submitted_by, caller_discord_id))
+
+    # Deferred: the evaluator pulls in ClearDB models and constants, which only submissions need
+    from acrossfc.core.points_evaluator import PointsEvaluator
 
     # Get all point events
     evaluator = PointsEvaluator(fflogs_url, is_fc_pf, is_static, fc_pf_id)
+    submission = _build_fflogs_submission(
+        fflogs_url, evaluator, submitted_by, submission_channel, is_static, is_fc_pf, fc_pf_id, notes
+    )
+
+    if not eval_mode:
+        DDB_CLIENT.upsert_submission(submission)
+        DDB_CLIENT.upsert_submission_queue_entry({
+            'uuid': submission['uuid'],
+            'ts': submission['ts']
+        })
+        LOG.info(f"Inserted submission {submission['uuid']} into DynamoDB.")
+
+    return submission
+
+
+def submit_fflogs_bulk(
+    fflogs_urls: List[str],
+    submitted_by: ComboUserID,
+    submission_channel: SubmissionsChannelLike,
+    is_static: bool,
+    is_fc_pf: bool,
+    fc_pf_id: Optional[str] = None,
+    notes: Optional[str] = None,
+    eval_mode: bool = False,
+    max_workers: int = 4,
+    caller_discord_id: Optional[str] = None
+):
+    """
+    Submits many FFLogs URLs at once.
+
+    URLs are de-duplicated by (report, fight) and grouped by report, so each report is fetched from
+    FFLogs once. Reports are evaluated concurrently (at most max_workers at a time) and the
+    resulting submissions are written in batches. Returns one result per given URL, in order.
+    A bulk request takes one token from the same throttle bucket as a single submission.
+    """
+    submission_channel = SubmissionsChannel.to_enum(submission_channel)
+    SUBMISSION_THROTTLE.acquire(_submission_throttle_key(submitted_by, caller_discord_id))
+    results: List[Optional[Dict]] = [None] * len(fflogs_urls)
+
+    first_index_by_fight: Dict[Tuple[str, int], int] = {}
+    fight_ids_by_report: Dict[str, List[int]] = defaultdict(list)
+    for i, fflogs_url in enumerate(fflogs_urls):
+        try:
+            report_id, fight_id = parse_fflogs_url(fflogs_url)
+        except ValueError as e:
+            results[i] = {'fflogs_url': fflogs_url, 'status': 'invalid', 'error': str(e)}
+            continue
+
+        if (report_id, fight_id) in first_index_by_fight:
+            duplicate_of = fflogs_urls[first_index_by_fight[(report_id, fight_id)]]
+            results[i] = {'fflogs_url': fflogs_url, 'status': 'duplicate', 'duplicate_of': duplicate_of}
+            continue
+
+        first_index_by_fight[(report_id, fight_id)] = i
+        fight_ids_by_report[report_id].append(fight_id)
+
+    # Fetch the roster up-front so that every evaluation shares the cached copy
+    FFLOGS_CLIENT.get_fc_roster()
+
+    from acrossfc.core.points_evaluator import PointsEvaluator
+
+    def evaluate_report(report_id: str, fight_ids: List[int]):
+        fight_data_by_id = FFLOGS_CLIENT.get_report_fight_data(report_id, fight_ids)
+        report_results = []
+        for fight_id in fight_ids:
+            i = first_index_by_fight[(report_id, fight_id)]
+            fflogs_url = fflogs_urls[i]
+            fight_data = fight_data_by_id[fight_id]
+            if fight_data is None:
+                report_results.append((i, {
+                    'fflogs_url': fflogs_url,
+                    'status': 'error',
+                    'error': f"Fight {fight_id} is not a tracked encounter"
+                }, None))
+                continue
+            try:
+                evaluator = PointsEvaluator(fflogs_url, is_fc_pf, is_static, fc_pf_id, fight_data=fight_data)
+                submission = _build_fflogs_submission(
+                    fflogs_url, evaluator, submitted_by, submission_channel, is_static, is_fc_pf, fc_pf_id, notes
+                )
+            except Exception as e:
+                LOG.error(f"Error while evaluating {fflogs_url}: {e}")
+                report_results.append((i, {'fflogs_url': fflogs_url, 'status': 'error', 'error': str(e)}, None))
+                continue
+            report_results.append((i, {
+                'fflogs_url': fflogs_url,
+                'status': 'evaluated' if eval_mode else 'submitted',
+                'submission_uuid': submission['uuid'],
+                'points_events': len(submission['points_events'])
+            }, submission))
+        return report_results
+
+    new_submissions = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        future_to_report = {
+            executor.submit(evaluate_report, report_id, fight_ids): report_id
+            for report_id, fight_ids in fight_ids_by_report.items()
+        }
+        for future in as_completed(future_to_report):
+            report_id = future_to_report[future]
+            try:
+                report_results = future.result()
+            except Exception as e:
+                LOG.error(f"Error while fetching report {report_id}: {e}")
+                report_results = [
+                    (first_index_by_fight[(report_id, fight_id)], {
+                        'fflogs_url': fflogs_urls[first_index_by_fight[(report_id, fight_id)]],
+                        'status': 'error',
+                        'error': str(e)
+                    }, None)
+                    for fight_id in fight_ids_by_report[report_id]
+                ]
+            for i, result, submission in report_results:
+                results[i] = result
+                if submission is not None:
+                    new_submissions.append(submission)
+
+    if not eval_mode and len(new_submissions) > 0:
+        DDB_CLIENT.batch_upsert_submissions(new_submissions)
+        LOG.info(f"Inserted {len(new_submissions)} submissions into DynamoDB.")
+
+    return {
+        'results': results,
+        'submitted': 0 if eval_mode else len(new_submissions)
+    }
+
+
+def _build_fflogs_submission(
+    fflogs_url: str,
+    evaluator: 'PointsEvaluator',
+    submitted_by: ComboUserID,
+    submission_channel: SubmissionsChannel,
+    is_static: bool,
+    is_fc_pf: bool,
+    fc_pf_id: Optional[str],
+    notes: Optional[str]
+):
+    timestamp = int(time.time())
     points_events: List[PointsEvent] = evaluator.points_events
     fight_signature: int = evaluator.fight_data.fight_signature
 
@@ -97,7 +326,6 @@ def submit_fflogs(
 
     points_events_json = [pe.to_submission_json() for pe in points_events]
 
-    # Upload submission to DDB
     submission_uuid = str(uuid.uuid4())
     submission = {
         'uuid': submission_uuid,
@@ -112,20 +340,13 @@ def submit_fflogs(
         'fight_signature': fight_signature,
         'tier': FC_CONFIG.current_submissions_tier,
         'points_events': points_events_json,
+        'status_counts': get_submission_status_counts(points_events_json),
         'evaluator_notes': evaluator.notes,
         'last_update_ts': None,
         'last_update_by': None,
         'notes': notes
     }
 
-    if not eval_mode:
-        DDB_CLIENT.upsert_submission(submission)
-        DDB_CLIENT.upsert_submission_queue_entry({
-            'uuid': submission_uuid,
-            'ts': timestamp
-        })
-        LOG.info(f"Inserted submission {submission_uuid} into DynamoDB.")
-
     return submission
 
 
@@ -147,34 +368,120 @@ def _remove_points_submission(submission):
 
 def _add_points_submission(submission):
     # Add all approved points for member
-    user_points_events_to_commit: List[PointsEvent] = []
-    for pe in submission['points_events']:
-        if pe['status'] == PointsEventStatus.APPROVED.value:
-            user_points_events_to_commit.append(PointsEvent(
-                uuid=pe['uuid'],
-                member_id=pe['member_id'],
-                points=pe['points'],
-                category=PointsCategory.to_enum(pe['category']),
-                description=pe['description'],
-                ts=pe['ts'],
-                submission_uuid=submission['uuid'],
-                status=PointsEventStatus.APPROVED
-            ))
+    user_points_events_to_commit = _get_approved_points_events(submission)
 
     commit_member_points_events(user_points_events_to_commit, tier=submission['tier'])
 
+    _mark_submission_reviewed(submission, user_points_events_to_commit)
+
+    DDB_CLIENT.upsert_submission(submission)
+    DDB_CLIENT.delete_submission_queue_entry(submission['uuid'])
+
+    return None
+
+
+def record_review_decision(submission):
+    """
+    Saves a reviewer's approve / deny decisions on a queued addition without committing any points.
+    The submission stays queued until drain_submissions_queue commits it.
+    """
+    if submission['submission_type'] == SubmissionType.REMOVE.value:
+        raise ValueError("Removal submissions are reviewed directly")
+    if any(pe['status'] == PointsEventStatus.PENDING.value for pe in submission['points_events']):
+        raise ValueError(f"Submission {submission['uuid']} still has pending points events")
+
+    submission['status_counts'] = get_submission_status_counts(submission['points_events'])
+    submission['decided_ts'] = int(time.time())
+    DDB_CLIENT.upsert_submission(submission)
+    return submission
+
+
+def review_submissions_bulk(submissions: List[Dict]):
+    """
+    Reviews many submissions at once.
+
+    Approved points events are grouped by member across all submissions, so each member's points item
+    is read and written once. Reviewed submissions are written, and their queue entries deleted, in
+    batches. Removal submissions are still applied one at a time. Returns one result per submission.
+
+    A submission given more than once is only reviewed with its first decision; the repeats are
+    reported as duplicates.
+    """
+    results: Dict[str, Dict] = {}
+    duplicates: List[Optional[Dict]] = [None] * len(submissions)
+    add_submissions = []
+    points_events_by_submission: Dict[str, List[PointsEvent]] = {}
+    points_events_by_tier: Dict[str, List[PointsEvent]] = defaultdict(list)
+
+    for i, submission in enumerate(submissions):
+        if submission['uuid'] in results or submission['uuid'] in points_events_by_submission:
+            duplicates[i] = {'uuid': submission['uuid'], 'status': 'duplicate'}
+            continue
+
+        if submission['submission_type'] == SubmissionType.REMOVE.value:
+            try:
+                _remove_points_submission(submission)
+                results[submission['uuid']] = {'uuid': submission['uuid'], 'status': 'reviewed'}
+            except Exception as e:
+                LOG.error(f"Error while reviewing submission {submission['uuid']}: {e}")
+                results[submission['uuid']] = {'uuid': submission['uuid'], 'status': 'error', 'error': str(e)}
+            continue
+
+        points_events = _get_approved_points_events(submission)
+        add_submissions.append(submission)
+        points_events_by_submission[submission['uuid']] = points_events
+        points_events_by_tier[submission['tier']].extend(points_events)
+
+    if len(add_submissions) > 0:
+        commit_member_points_events_bulk(points_events_by_tier)
+
+        for submission in add_submissions:
+            points_events = points_events_by_submission[submission['uuid']]
+            _mark_submission_reviewed(submission, points_events)
+            results[submission['uuid']] = {
+                'uuid': submission['uuid'],
+                'status': 'reviewed',
+                'points_awarded': sum(
+                    pe.points for pe in points_events
+                    if pe.status == PointsEventStatus.APPROVED
+                )
+            }
+
+        DDB_CLIENT.batch_complete_submission_reviews(add_submissions)
+        LOG.info(f"Reviewed {len(add_submissions)} submissions.")
+
+    return [
+        duplicates[i] or results[submission['uuid']]
+        for i, submission in enumerate(submissions)
+    ]
+
+
+def _get_approved_points_events(submission) -> List[PointsEvent]:
+    return [
+        PointsEvent(
+            uuid=pe['uuid'],
+            member_id=pe['member_id'],
+            points=pe['points'],
+            category=PointsCategory.to_enum(pe['category']),
+            description=pe['description'],
+            ts=pe['ts'],
+            submission_uuid=submission['uuid'],
+            status=PointsEventStatus.APPROVED
+        )
+        for pe in submission['points_events']
+        if pe['status'] == PointsEventStatus.APPROVED.value
+    ]
+
+
+def _mark_submission_reviewed(submission, committed_points_events: List[PointsEvent]):
     # Update points event statuses based on the commit result
     updated_points_event_status: Dict[str, PointsEventStatus] = {
         pe.uuid: pe.status
-        for pe in user_points_events_to_commit
+        for pe in committed_points_events
     }
     for pe in submission['points_events']:
         if pe['uuid'] in updated_points_event_status:
             pe['status'] = updated_points_event_status[pe['uuid']].value
+    submission['status_counts'] = get_submission_status_counts(submission['points_events'])
 
     submission['last_update_ts'] = int(time.time())
-
-    DDB_CLIENT.upsert_submission(submission)
-    DDB_CLIENT.delete_submission_queue_entry(submission['uuid'])
-
-    return None
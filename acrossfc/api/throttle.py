@@ -0,0 +1,100 @@
+# stdlib
+import math
+import time
+import logging
+import threading
+from decimal import Decimal
+from typing import Dict, NamedTuple, Optional, Tuple
+
+# Local
+from acrossfc.core.config import FC_CONFIG
+from acrossfc.ext.ddb_client import DDB_CLIENT
+
+LOG = logging.getLogger(__name__)
+
+# Attempts at the conditional DynamoDB write before giving up on a contended bucket
+MAX_DDB_ATTEMPTS = 5
+
+
+class SubmissionThrottled(Exception):
+    def __init__(self, retry_after_s: int):
+        super().__init__(f"Too many submissions. Try again in {retry_after_s} s.")
+        self.retry_after_s = retry_after_s
+
+
+class _Bucket(NamedTuple):
+    tokens: float
+    updated_at: float
+
+
+class TokenBucketThrottle:
+    """
+    Token bucket per key: up to capacity requests in a burst, refilled at one token every refill_s.
+
+    Buckets are held in-process, which is enough for a single instance or local runs. With use_ddb
+    they live in DynamoDB instead, updated with a conditional write so concurrent Lambda instances
+    can't both spend the same token.
+    """
+    def __init__(self, capacity: int, refill_s: int, use_ddb: bool = False):
+        self.capacity = capacity
+        self.refill_s = refill_s
+        self.use_ddb = use_ddb
+        self._buckets: Dict[str, _Bucket] = {}
+        self._lock = threading.Lock()
+
+    def _take(self, bucket: Optional[_Bucket], now: float) -> Tuple[_Bucket, int]:
+        """Returns the bucket after trying to spend a token, and 0 or the seconds until one is available."""
+        tokens = self.capacity
+        if bucket is not None:
+            tokens = min(self.capacity, bucket.tokens + (now - bucket.updated_at) / self.refill_s)
+        if tokens >= 1:
+            return _Bucket(tokens - 1, now), 0
+        return _Bucket(tokens, now), max(1, math.ceil((1 - tokens) * self.refill_s))
+
+    def acquire(self, key: str):
+        """Spends one token for key, or raises SubmissionThrottled with the wait until the next one."""
+        if self.use_ddb:
+            retry_after_s = self._acquire_ddb(key)
+        else:
+            with self._lock:
+                bucket, retry_after_s = self._take(self._buckets.get(key), time.time())
+                self._buckets[key] = bucket
+
+        if retry_after_s > 0:
+            LOG.info(f"Throttled {key} for {retry_after_s}s.")
+            raise SubmissionThrottled(retry_after_s)
+
+    def _acquire_ddb(self, key: str) -> int:
+        for _ in range(MAX_DDB_ATTEMPTS):
+            item = DDB_CLIENT.get_throttle_entry(key)
+            bucket = None
+            if item is not None:
+                bucket = _Bucket(float(item['tokens']), float(item['updated_at']))
+
+            new_bucket, retry_after_s = self._take(bucket, time.time())
+            if retry_after_s > 0:
+                # Nothing spent, so there's nothing to write
+                return retry_after_s
+
+            written = DDB_CLIENT.put_throttle_entry(
+                {
+                    'throttle_key': key,
+                    'tokens': Decimal(f"{new_bucket.tokens:.6f}"),
+                    'updated_at': Decimal(f"{new_bucket.updated_at:.6f}"),
+                    # Full buckets carry no information, let DynamoDB TTL clean them up
+                    'expires_at': int(new_bucket.updated_at + self.capacity * self.refill_s)
+                },
+                expected_updated_at=item['updated_at'] if item is not None else None
+            )
+            if written:
+                return 0
+
+        LOG.warning(f"Throttle bucket {key} is contended, treating as throttled.")
+        return self.refill_s
+
+
+SUBMISSION_THROTTLE = TokenBucketThrottle(
+    capacity=FC_CONFIG.submission_throttle_capacity,
+    refill_s=FC_CONFIG.submission_throttle_refill_s,
+    use_ddb=FC_CONFIG.ddb_throttle_table is not None
+)
@@ -0,0 +1,225 @@
+# stdlib
+import logging
+from typing import Dict, List, Set, Tuple, TYPE_CHECKING
+from datetime import date
+
+# 3rd-party
+import numpy as np
+
+# Local
+from acrossfc.core.model import (
+    Member,
+    TrackedEncounterName,
+    JobCategory,
+    Job,
+    ClearRate,
+    FirstClear,
+    EncounterClearRate,
+    MemberJobClear,
+)
+from acrossfc.core.constants import ALL_MODELS
+
+if TYPE_CHECKING:
+    from acrossfc.core.database import ClearDatabase
+
+LOG = logging.getLogger(__name__)
+
+# first_clear_day value for (member, encounter) pairs without a clear
+NO_CLEAR = np.iinfo(np.int32).max
+
+# Days are counted from the Unix epoch, like numpy's datetime64[D]
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def _to_day(d: date) -> int:
+    return d.toordinal() - _EPOCH_ORDINAL
+
+
+def _from_day(day: int) -> date:
+    return date.fromordinal(int(day) + _EPOCH_ORDINAL)
+
+
+class ClearMatrix:
+    """
+    Member x encounter view of a ClearDatabase's aggregate tables, held in NumPy arrays:
+
+        first_clear_day[m, e]  int32, days since 1970-01-01 of the member's first clear, NO_CLEAR if none
+        cleared[m, e]          bool, whether the member has cleared the encounter at all
+        job_bits[m, e]         uint64, bit j set if the member has cleared the encounter as jobs[j]
+
+    Rows follow the roster order, columns are encounter names (variants of an encounter share a column).
+    The report queries are then reductions over these arrays instead of their own SQL and Python loops.
+    The arrays are read-only, so a single matrix can be shared by every report of a run.
+    """
+    def __init__(
+        self,
+        members: List[Member],
+        encounter_names: List[TrackedEncounterName],
+        jobs: List[Job],
+        first_clear_day: np.ndarray,
+        job_bits: np.ndarray,
+    ):
+        if len(jobs) > 64:
+            raise ValueError(f"Job bitsets hold at most 64 jobs, got {len(jobs)}")
+
+        self.members = members
+        self.encounter_names = encounter_names
+        self.jobs = jobs
+        self.first_clear_day = first_clear_day
+        self.cleared = first_clear_day != NO_CLEAR
+        self.job_bits = job_bits
+        for array in (self.first_clear_day, self.cleared, self.job_bits):
+            array.flags.writeable = False
+
+        self._encounter_index = {name: i for i, name in enumerate(encounter_names)}
+        self._job_index = {job.tla: i for i, job in enumerate(jobs)}
+
+    @staticmethod
+    def from_database(database: "ClearDatabase", include_echo: bool = False) -> "ClearMatrix":
+        # Built from the materialized aggregates, so the raw clears are never read
+        database.ensure_aggregates()
+        db = database._db
+        with db.bind_ctx(ALL_MODELS):
+            members = list(Member.select().order_by(Member.rank, Member.name))
+            jobs = list(Job.select().order_by(Job.tla))
+
+            # One clear_rate row per tracked encounter name, cleared or not
+            encounter_names = [
+                name for name, in (
+                    EncounterClearRate.select(EncounterClearRate.encounter_name)
+                    .where(EncounterClearRate.include_echo == include_echo)
+                    .order_by(EncounterClearRate.encounter_name)
+                    .tuples()
+                )
+            ]
+
+            # One row per (encounter, member, job), with the member's first clear of the encounter
+            rows = list(
+                MemberJobClear.select(
+                    MemberJobClear.encounter_name,
+                    MemberJobClear.member_id,
+                    MemberJobClear.job_id,
+                    FirstClear.first_clear_date,
+                )
+                .join(FirstClear, on=(
+                    (FirstClear.encounter_name == MemberJobClear.encounter_name)
+                    & (FirstClear.include_echo == MemberJobClear.include_echo)
+                    & (FirstClear.member == MemberJobClear.member)
+                ))
+                .where(MemberJobClear.include_echo == include_echo)
+                .tuples()
+            )
+
+        member_index = {m.fcid: i for i, m in enumerate(members)}
+        encounter_index = {name: i for i, name in enumerate(encounter_names)}
+        job_index = {job.tla: i for i, job in enumerate(jobs)}
+
+        first_clear_day = np.full((len(members), len(encounter_names)), NO_CLEAR, dtype=np.int32)
+        job_bits = np.zeros((len(members), len(encounter_names)), dtype=np.uint64)
+        if len(rows) > 0:
+            names, member_ids, job_tlas, first_dates = zip(*rows)
+            m = np.fromiter((member_index[i] for i in member_ids), dtype=np.intp, count=len(rows))
+            e = np.fromiter((encounter_index[n] for n in names), dtype=np.intp, count=len(rows))
+            days = np.fromiter((_to_day(d) for d in first_dates), dtype=np.int32, count=len(rows))
+            bits = np.left_shift(
+                np.uint64(1),
+                np.fromiter((job_index[t] for t in job_tlas), dtype=np.uint64, count=len(rows))
+            )
+            # Several rows land on the same cell (one per job), so reduce instead of assigning
+            np.minimum.at(first_clear_day, (m, e), days)
+            np.bitwise_or.at(job_bits, (m, e), bits)
+
+        LOG.info(
+            f"Built clear matrix of {len(members)} members x {len(encounter_names)} encounters "
+            f"from {len(rows)} rows."
+        )
+        return ClearMatrix(members, encounter_names, jobs, first_clear_day, job_bits)
+
+    def _columns(self, array: np.ndarray, encounter_names: List[TrackedEncounterName], missing) -> np.ndarray:
+        """
+        array's columns for the given encounters, in order. Like the SQL queries, an encounter with no
+        clear_rate row (not tracked, echo-only without include_echo, or newer than the ClearDB) has no
+        clears, so its column is filled with missing.
+        """
+        columns = np.full((len(self.members), len(encounter_names)), missing, dtype=array.dtype)
+        for j, name in enumerate(encounter_names):
+            i = self._encounter_index.get(name, None)
+            if i is not None:
+                columns[:, j] = array[:, i]
+        return columns
+
+    def _column(self, array: np.ndarray, encounter_name: TrackedEncounterName, missing) -> np.ndarray:
+        return self._columns(array, [encounter_name], missing)[:, 0]
+
+    def _job_mask(self, jobs: List[Job]) -> np.uint64:
+        mask = 0
+        for job in jobs:
+            mask |= 1 << self._job_index[job.tla]
+        return np.uint64(mask)
+
+    def _members_where(self, rows: np.ndarray) -> Set[Member]:
+        return {self.members[i] for i in np.flatnonzero(rows)}
+
+    def clear_counts(self) -> Dict[TrackedEncounterName, int]:
+        counts = self.cleared.sum(axis=0)
+        return {name: int(counts[i]) for i, name in enumerate(self.encounter_names)}
+
+    def clear_rates(self) -> Dict[TrackedEncounterName, ClearRate]:
+        eligible_members = len(self.members)
+        return {name: ClearRate(count, eligible_members) for name, count in self.clear_counts().items()}
+
+    def _cleared_column(self, encounter_name: TrackedEncounterName) -> np.ndarray:
+        return self._column(self.cleared, encounter_name, False)
+
+    def cleared_members(self, encounter_name: TrackedEncounterName) -> Set[Member]:
+        return self._members_where(self._cleared_column(encounter_name))
+
+    def uncleared_members(self, encounter_name: TrackedEncounterName) -> Set[Member]:
+        return self._members_where(~self._cleared_column(encounter_name))
+
+    def cleared_encounters(
+        self,
+        encounter_names: List[TrackedEncounterName]
+    ) -> Dict[Member, List[TrackedEncounterName]]:
+        """Each member with at least one of the given encounters cleared, and which of them (in the given order)."""
+        cleared = self._columns(self.cleared, encounter_names, False)
+        return {
+            self.members[i]: [encounter_names[j] for j in np.flatnonzero(cleared[i])]
+            for i in np.flatnonzero(cleared.any(axis=1))
+        }
+
+    def legend_counts(self, encounter_names: List[TrackedEncounterName]) -> np.ndarray:
+        """Number of the given encounters each member has cleared, by roster row."""
+        return self._columns(self.cleared, encounter_names, False).sum(axis=1)
+
+    def cleared_role_counts(
+        self,
+        encounter_name: TrackedEncounterName,
+        categories: List[JobCategory]
+    ) -> Dict[str, int]:
+        """Members who've cleared the encounter on any job of each category, main or sub."""
+        column = self._column(self.job_bits, encounter_name, 0)
+        counts = {}
+        for category in categories:
+            mask = self._job_mask([
+                job for job in self.jobs
+                if category.name in (job.main_category_id, job.sub_category_id)
+            ])
+            counts[category.name] = int(np.count_nonzero(column & mask))
+        return counts
+
+    def cleared_jobs(self, member: Member, encounter_name: TrackedEncounterName) -> List[Job]:
+        bits = int(self._column(self.job_bits, encounter_name, 0)[self.members.index(member)])
+        return [job for j, job in enumerate(self.jobs) if bits >> j & 1]
+
+    def clear_order(self, encounter_name: TrackedEncounterName) -> List[Tuple[date, Set[Member]]]:
+        """Same shape as one encounter of ClearDatabase.get_clear_order: members grouped by first clear date."""
+        days = self._column(self.first_clear_day, encounter_name, NO_CLEAR)
+        rows = np.flatnonzero(days != NO_CLEAR)
+        rows = rows[np.argsort(days[rows], kind='stable')]
+        unique_days, starts = np.unique(days[rows], return_index=True)
+        groups = np.split(rows, starts[1:])
+        return [
+            (_from_day(day), {self.members[i] for i in group})
+            for day, group in zip(unique_days, groups)
+        ]
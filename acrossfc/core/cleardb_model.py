@@ -0,0 +1,158 @@
+# 3rd-party
+from peewee import (
+    Model,
+    IntegerField,
+    CharField,
+    ForeignKeyField,
+    DateTimeField,
+    FloatField,
+    BooleanField,
+    DateField,
+    CompositeKey,
+)
+
+
+# -----------------------------------------------
+# ClearDB peewee models
+# -----------------------------------------------
+
+class Member(Model):
+    fcid = IntegerField(primary_key=True)
+    name = CharField(255)
+    rank = IntegerField()
+
+
+class TrackedEncounter(Model):
+    id = CharField(16, primary_key=True)
+    name = CharField(16)
+    encounter_id = IntegerField()
+    difficulty_id = IntegerField(null=True)
+    partition_id = IntegerField(null=True)
+    with_echo = BooleanField(default=False)
+
+    class Meta:
+        indexes = ((("encounter_id", "difficulty_id", "partition_id"), True),)
+
+    def __str__(self):
+        return f"{self.name}_{self.encounter_id}_{self.difficulty_id}_{self.partition_id}"
+
+    def __repr__(self):
+        return str(self)
+
+
+class JobCategory(Model):
+    name = CharField(32, primary_key=True)
+    long_name = CharField(64)
+
+
+class Job(Model):
+    tla = CharField(3, primary_key=True)
+    name = CharField(64)
+    main_category = ForeignKeyField(JobCategory)
+    sub_category = ForeignKeyField(JobCategory, null=True)
+
+
+class Clear(Model):
+    member = ForeignKeyField(Member)
+    encounter = ForeignKeyField(TrackedEncounter)
+    start_time = DateTimeField()
+    historical_pct = FloatField()
+    report_code = CharField(32)
+    report_fight_id = IntegerField()
+    job = ForeignKeyField(Job)
+    locked_in = BooleanField()
+
+    class Meta:
+        # Natural key: one row per member per kill, so re-importing a report merges instead of duplicating
+        indexes = ((("member", "encounter", "report_code", "report_fight_id"), True),)
+
+
+# -----------------------------------------------
+# Aggregates materialized from Clear by ClearDatabase.
+# include_echo=False rows only count the encounters fought without echo,
+# include_echo=True rows count every variant of the encounter name.
+# -----------------------------------------------
+
+class FirstClear(Model):
+    encounter_name = CharField(16)
+    include_echo = BooleanField()
+    member = ForeignKeyField(Member)
+    first_clear_date = DateField()
+
+    class Meta:
+        table_name = 'first_clear'
+        primary_key = CompositeKey('encounter_name', 'include_echo', 'member')
+
+
+class EncounterClearRate(Model):
+    encounter_name = CharField(16)
+    include_echo = BooleanField()
+    clears = IntegerField()
+    eligible_members = IntegerField()
+
+    class Meta:
+        table_name = 'clear_rate'
+        primary_key = CompositeKey('encounter_name', 'include_echo')
+
+
+class MemberJobClear(Model):
+    encounter_name = CharField(16)
+    include_echo = BooleanField()
+    member = ForeignKeyField(Member)
+    job = ForeignKeyField(Job)
+
+    class Meta:
+        table_name = 'member_job_clear'
+        primary_key = CompositeKey('encounter_name', 'include_echo', 'member', 'job')
+
+
+# -----------------------------------------------
+# Timeline database: every daily snapshot folded into one file.
+# Rows carry the dates they were observed, see acrossfc.core.timeline.
+# -----------------------------------------------
+
+class TimelineSnapshot(Model):
+    snapshot_date = DateField(primary_key=True)
+    members = IntegerField()
+    clears = IntegerField()
+
+    class Meta:
+        table_name = 'timeline_snapshot'
+
+
+class TimelineMember(Model):
+    """One version of a member: valid from valid_from until the day before valid_to (NULL while current)."""
+    fcid = IntegerField()
+    name = CharField(255)
+    rank = IntegerField()
+    valid_from = DateField()
+    valid_to = DateField(null=True)
+
+    class Meta:
+        table_name = 'timeline_member'
+        indexes = (
+            (("fcid", "valid_from"), True),
+            (("valid_from", "valid_to"), False),
+        )
+
+
+class TimelineClear(Model):
+    """A clear as seen in the snapshots from first_seen through last_seen."""
+    member_id = IntegerField()
+    encounter = ForeignKeyField(TrackedEncounter)
+    start_time = DateTimeField()
+    historical_pct = FloatField()
+    report_code = CharField(32)
+    report_fight_id = IntegerField()
+    job = ForeignKeyField(Job)
+    locked_in = BooleanField()
+    first_seen = DateField()
+    last_seen = DateField()
+
+    class Meta:
+        table_name = 'timeline_clear'
+        indexes = (
+            # A clear that drops out of the snapshots and comes back gets a second row
+            (("member_id", "encounter", "report_code", "report_fight_id", "first_seen"), True),
+            (("last_seen", "first_seen"), False),
+        )
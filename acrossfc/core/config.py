@@ -1,6 +1,7 @@
 # stdlib
 import os
 import logging
+import tempfile
 import configparser
 
 # Local
@@ -74,6 +75,38 @@ class FCConfig:
             LOG.info("No admin IDs configured. Auto-approve will be disabled.")
             self.fc_admin_ids = []
 
+        # Optional DynamoDB table to share resolved Discord access tokens across Lambda instances
+        self.ddb_auth_cache_table = default_configs.get("ddb_auth_cache_table", None)
+        self.auth_cache_ttl_s = int(default_configs.get("auth_cache_ttl_s", 300))
+
+        # Optional DynamoDB table to share cached API responses across Lambda instances. Either way,
+        # responses that writes invalidate (e.g. the leaderboard) are only cached for the local TTL.
+        self.ddb_response_cache_table = default_configs.get("ddb_response_cache_table", None)
+        self.response_cache_local_ttl_s = int(default_configs.get("response_cache_local_ttl_s", 15))
+
+        # Optional key used to sign API pagination cursors
+        self.api_cursor_key = default_configs.get("api_cursor_key", None)
+
+        # Per-user submission throttle: a bucket of submission_throttle_capacity tokens, refilled at
+        # one token every submission_throttle_refill_s. Shared across instances when the table is set.
+        self.ddb_throttle_table = default_configs.get("ddb_throttle_table", None)
+        self.submission_throttle_capacity = int(default_configs.get("submission_throttle_capacity", 5))
+        self.submission_throttle_refill_s = int(default_configs.get("submission_throttle_refill_s", 600))
+
+        # ClearDB snapshots are uploaded zstd-compressed. With cleardb_delta_snapshots, days in between full
+        # snapshots upload only the rows that changed, and a full snapshot is taken every cleardb_compaction_days.
+        self.cleardb_delta_snapshots = default_configs.get("cleardb_delta_snapshots", "false").lower() == "true"
+        self.cleardb_compaction_days = int(default_configs.get("cleardb_compaction_days", 7))
+        self.cleardb_zstd_level = int(default_configs.get("cleardb_zstd_level", 10))
+        # Also upload the uncompressed per-day ClearDB, for consumers that haven't moved to the snapshots yet.
+        # Turn off once nothing reads s3://<bucket>/<date> anymore.
+        self.cleardb_legacy_uploads = default_configs.get("cleardb_legacy_uploads", "true").lower() == "true"
+
+        # Local directory ClearDBs opened from S3 are cached in, revalidated against S3 by ETag
+        self.cleardb_cache_dir = default_configs.get(
+            "cleardb_cache_dir", os.path.join(tempfile.gettempdir(), "acrossfc-cleardb")
+        )
+
         # Set flag
         self.initialized = True
 
@@ -10,6 +10,9 @@ from .model import (
     TrackedEncounter,
     Job,
     JobCategory,
+    FirstClear,
+    EncounterClearRate,
+    MemberJobClear,
     PointsCategory,
     TrackedEncounterName
 )
@@ -24,7 +27,9 @@ def create(cls, *args):
     })
 
 
-ALL_MODELS = [Member, TrackedEncounter, JobCategory, Job, Clear]
+# Rebuilt from Clear by ClearDatabase, never written directly
+AGGREGATE_MODELS = [FirstClear, EncounterClearRate, MemberJobClear]
+ALL_MODELS = [Member, TrackedEncounter, JobCategory, Job, Clear] + AGGREGATE_MODELS
 
 # -----------------------------------------
 # Encounters
@@ -1,13 +1,18 @@
 # stdlib
+import os
+import sqlite3
+import inspect
 import tempfile
 import logging
 import shutil
-from typing import List, Dict, Set, Tuple
+import functools
+from typing import Any, Optional, List, Dict, Set, Tuple, TYPE_CHECKING
 from datetime import date
 from collections import defaultdict
+from urllib.request import pathname2url
 
 # 3rd-party
-from peewee import SqliteDatabase, fn, JOIN
+from peewee import AutoField, SqliteDatabase, Value, fn
 
 # Local
 from acrossfc.core.model import (
@@ -18,32 +23,165 @@ from acrossfc.core.model import (
     Job,
     Clear,
     ClearRate,
+    FirstClear,
+    EncounterClearRate,
+    MemberJobClear,
 )
 from acrossfc.core.constants import (
     ALL_MODELS,
+    AGGREGATE_MODELS,
     ALL_ENCOUNTERS,
     JOB_CATEGORIES,
     JOBS,
 )
 
+if TYPE_CHECKING:
+    from acrossfc.core.clear_matrix import ClearMatrix
+
 LOG = logging.getLogger(__name__)
 LOG.setLevel(logging.INFO)
 
+# Secondary indexes on Clear. Reports read the aggregate tables, so Clear is only read to rebuild them, for
+# every encounter or just a few. peewee only indexes each foreign key on its own, which still means a table
+# lookup per row; these lead with the encounter and cover every column the rebuilds read:
+#   (encounter, member, start_time): first_clear
+#   (encounter, member, job): member_job_clear
+CLEAR_INDEXES = {
+    'clear_encounter_member_start_time': ('encounter', 'member', 'start_time'),
+    'clear_encounter_member_job': ('encounter', 'member', 'job'),
+}
+
+# Indexes earlier files were built with, dropped when they're opened for updates
+RETIRED_CLEAR_INDEXES = ('clear_encounter_start_time', 'clear_member_encounter_job')
+
+
+def _open_sqlite(db_filename: str, read_only: bool = False) -> SqliteDatabase:
+    if read_only:
+        # immutable=1: SQLite skips locking and change detection, for files nothing will write to again
+        return SqliteDatabase(f"file:{pathname2url(os.path.abspath(db_filename))}?immutable=1", uri=True)
+    return SqliteDatabase(db_filename)
+
+
+def _insert_rows(db: SqliteDatabase, model, rows: list, conflict_fields: Optional[Tuple[str, ...]] = None):
+    """
+    Inserts model instances with a single executemany over plain tuples, skipping peewee's per-row
+    query building. Values are read from the instances' raw data, so foreign keys are never loaded.
+
+    With conflict_fields, rows that collide on those (unique) fields update the existing row instead.
+    """
+    fields = [f for f in model._meta.sorted_fields if not isinstance(f, AutoField)]
+    columns = ", ".join(f'"{f.column_name}"' for f in fields)
+    placeholders = ", ".join("?" for _ in fields)
+    sql = f'INSERT INTO "{model._meta.table_name}" ({columns}) VALUES ({placeholders})'
+    if conflict_fields is not None:
+        conflict_columns = [model._meta.fields[name].column_name for name in conflict_fields]
+        updates = ", ".join(
+            f'"{f.column_name}" = excluded."{f.column_name}"'
+            for f in fields if f.column_name not in conflict_columns
+        )
+        sql += f' ON CONFLICT ({", ".join(conflict_columns)}) '
+        sql += f'DO UPDATE SET {updates}' if updates else 'DO NOTHING'
+    db.cursor().executemany(sql, (
+        tuple(f.db_value(row.__data__.get(f.name, f.default)) for f in fields)
+        for row in rows
+    ))
+
+
+def _copy_result(value: Any) -> Any:
+    """
+    Copies the containers (dicts, lists, sets, tuples) of a memoized result, so callers can mutate what
+    they get back. The members, jobs and dates inside are shared.
+    """
+    if isinstance(value, defaultdict):
+        return defaultdict(value.default_factory, {k: _copy_result(v) for k, v in value.items()})
+    elif isinstance(value, dict):
+        return {k: _copy_result(v) for k, v in value.items()}
+    elif isinstance(value, list):
+        return [_copy_result(v) for v in value]
+    elif isinstance(value, (set, frozenset)):
+        return type(value)(_copy_result(v) for v in value)
+    elif isinstance(value, tuple) and not hasattr(value, '_fields'):
+        return tuple(_copy_result(v) for v in value)
+    return value
+
+
+def _memoized(method):
+    """
+    Caches a read query's result on the ClearDatabase, keyed by method and (defaulted) arguments.
+    Writes clear the cache. Every call gets its own copy of the result.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = (method.__name__,) + tuple(list(bound.arguments.items())[1:])
+        if key in self._memo:
+            self.memo_hits += 1
+        else:
+            self._memo[key] = method(self, *args, **kwargs)
+        return _copy_result(self._memo[key])
+
+    return wrapper
+
+
+# Natural key of a clear, matching the unique index on Clear
+CLEAR_KEY_FIELDS = ('member', 'encounter', 'report_code', 'report_fight_id')
+
+ENCOUNTER_NAMES_BY_ID = {e.id: e.name for e in ALL_ENCOUNTERS}
+
+# ClearDatabase.open locations besides local files
+LATEST = 'latest'
+S3_URL_PREFIX = 's3://'
+
 
 class ClearDatabase:
-    def __init__(self, db_filename: str):
+    def __init__(self, db_filename: str, read_only: bool = False):
         self.db_filename = db_filename
-        self._db = SqliteDatabase(self.db_filename)
+        self._db = _open_sqlite(db_filename, read_only)
+        self._members_by_id: Optional[Dict[int, Member]] = None
+        self._jobs_by_tla: Optional[Dict[str, Job]] = None
+        self._memo: Dict[Tuple, Any] = {}
+        self.memo_hits = 0
+        self._aggregates_ready = False
+
+    def _invalidate(self):
+        self._members_by_id = None
+        self._jobs_by_tla = None
+        self._memo.clear()
 
     def save(self, filename: str):
         shutil.copy(self.db_filename, filename)
 
+    @staticmethod
+    def open(location: str) -> "ClearDatabase":
+        """
+        Opens a ClearDB from a local file, an s3://bucket/key object, or "latest" for the latest snapshot in
+        the ClearDB bucket. S3 databases are cached locally and opened read-only.
+        """
+        if location == LATEST or location.startswith(S3_URL_PREFIX):
+            from acrossfc.ext.cleardb_cache import CLEARDB_CACHE
+            return CLEARDB_CACHE.open(location)
+        return ClearDatabase(location)
+
     @staticmethod
     def from_fflogs(
         members: List[Member],
-        clears: List[Clear]
+        clears: List[Clear],
+        bulk_load: bool = True
     ) -> "ClearDatabase":
+        """
+        Builds a new database file from the FC roster and its clears.
+
+        With bulk_load, the database is built in memory with journaling and syncing off, in a single
+        transaction, with rows inserted straight from tuples. The result is then written out with the
+        SQLite backup API. Otherwise rows go through peewee's bulk_create into the file directly.
+        """
         db_filename = tempfile.NamedTemporaryFile().name
+        if bulk_load:
+            return ClearDatabase._bulk_load(db_filename, members, clears)
+
         db = ClearDatabase(db_filename)
 
         # Setup database
@@ -53,80 +191,337 @@ class ClearDatabase:
             JobCategory.bulk_create(JOB_CATEGORIES)
             Job.bulk_create(JOBS)
             Member.bulk_create(members)
-            Clear.bulk_create(clears, batch_size=50)
+            # Same as the bulk load's ON CONFLICT: one row per natural key, in first-seen order, with the
+            # values of the last copy FFLogs reported
+            unique_clears = {tuple(c.__data__[name] for name in CLEAR_KEY_FIELDS): c for c in clears}
+            Clear.bulk_create(list(unique_clears.values()), batch_size=50)
+
+        # Building indexes once over the loaded table is cheaper than maintaining them on every insert
+        db.create_indexes()
+        db.refresh_aggregates()
+
+        return db
+
+    @staticmethod
+    def _bulk_load(
+        db_filename: str,
+        members: List[Member],
+        clears: List[Clear]
+    ) -> "ClearDatabase":
+        mem_db = ClearDatabase(':memory:')
+        # Nothing to recover if the process dies mid-load: the in-memory database is simply gone
+        mem_db._db.execute_sql("PRAGMA journal_mode = OFF")
+        mem_db._db.execute_sql("PRAGMA synchronous = OFF")
+
+        with mem_db._db.bind_ctx(ALL_MODELS):
+            mem_db._db.create_tables(ALL_MODELS)
+            with mem_db._db.atomic():
+                for model, rows in (
+                    (TrackedEncounter, ALL_ENCOUNTERS),
+                    (JobCategory, JOB_CATEGORIES),
+                    (Job, JOBS),
+                    (Member, members),
+                ):
+                    _insert_rows(mem_db._db, model, rows)
+                # FFLogs can report the same kill more than once, keep one row per natural key
+                _insert_rows(mem_db._db, Clear, clears, conflict_fields=CLEAR_KEY_FIELDS)
+        mem_db.create_indexes()
+        mem_db.refresh_aggregates()
 
+        # Copies the database page by page, indexes and aggregates included
+        with sqlite3.connect(db_filename) as file_conn:
+            mem_db._db.connection().backup(file_conn)
+        file_conn.close()
+        mem_db._db.close()
+
+        db = ClearDatabase(db_filename)
+        db._aggregates_ready = True
         return db
 
+    @staticmethod
+    def open_existing(db_filename: str) -> "ClearDatabase":
+        """
+        Opens a database file built earlier so it can be updated in place with upsert_members / upsert_clears.
+        Files from before Clear had a natural key are de-duplicated and given the unique index, and the
+        tracked encounters and jobs are brought in line with the current constants.
+        """
+        db = ClearDatabase(db_filename)
+        with db._db.bind_ctx(ALL_MODELS):
+            if db._db.table_exists(Clear._meta.table_name):
+                key_columns = ", ".join(Clear._meta.fields[name].column_name for name in CLEAR_KEY_FIELDS)
+                db._db.execute_sql(
+                    f'DELETE FROM "clear" WHERE id NOT IN (SELECT MIN(id) FROM "clear" GROUP BY {key_columns})'
+                )
+            # Adds any missing tables and indexes, leaves existing ones alone
+            db._db.create_tables(ALL_MODELS, safe=True)
+            with db._db.atomic():
+                _insert_rows(db._db, TrackedEncounter, ALL_ENCOUNTERS, conflict_fields=('id',))
+                _insert_rows(db._db, JobCategory, JOB_CATEGORIES, conflict_fields=('name',))
+                _insert_rows(db._db, Job, JOBS, conflict_fields=('tla',))
+        db.create_indexes()
+        db.ensure_aggregates()
+        return db
+
+    def upsert_members(self, members: List[Member], prune: bool = True):
+        """
+        Inserts new members and updates the name / rank of existing ones.
+        With prune, members missing from the given roster are removed together with their clears, which
+        leaves the same result as rebuilding from that roster.
+        """
+        with self._db.bind_ctx(ALL_MODELS):
+            with self._db.atomic():
+                _insert_rows(self._db, Member, members, conflict_fields=('fcid',))
+                if prune:
+                    member_ids = [m.fcid for m in members]
+                    for model in (FirstClear, MemberJobClear, Clear):
+                        model.delete().where(model.member.not_in(member_ids)).execute()
+                    removed = Member.delete().where(Member.fcid.not_in(member_ids)).execute()
+                    if removed > 0:
+                        LOG.info(f"Removed {removed} members that left the roster.")
+                # The roster size is every clear rate's denominator
+                self._refresh_clear_rates()
+        self._invalidate()
+
+    def upsert_clears(self, clears: List[Clear]) -> int:
+        """
+        Adds clears that aren't in the database yet, matched on (member, encounter, report, fight).
+        Clears that are already there get their parse, job and locked-in values refreshed.
+        The aggregates of the encounters the clears belong to are rebuilt in the same transaction.
+        Returns the number of new clears.
+        """
+        encounter_names = {ENCOUNTER_NAMES_BY_ID[c.__data__['encounter']] for c in clears}
+        with self._db.bind_ctx(ALL_MODELS):
+            num_before = Clear.select().count()
+            with self._db.atomic():
+                _insert_rows(self._db, Clear, clears, conflict_fields=CLEAR_KEY_FIELDS)
+                self.refresh_aggregates(encounter_names)
+            num_added = Clear.select().count() - num_before
+        self._invalidate()
+        LOG.info(f"Upserted {len(clears)} clears, {num_added} of them new.")
+        return num_added
+
+    def sync_clears(self, clears: List[Clear], member_ids: List[int], encounter_ids: List[int]) -> Tuple[int, int]:
+        """
+        Makes the clears of the given members and encounters match what FFLogs returned for them: the given
+        clears are upserted, and the ones that weren't returned again (e.g. from reports deleted or made private
+        since) are deleted. Clears of other members and encounters are left alone.
+        Returns the number of clears added and deleted.
+        """
+        returned = {tuple(c.__data__[name] for name in CLEAR_KEY_FIELDS) for c in clears}
+        with self._db.bind_ctx(ALL_MODELS):
+            with self._db.atomic():
+                num_added = self.upsert_clears(clears)
+                stale = [
+                    key for key in (
+                        Clear.select(*[getattr(Clear, name) for name in CLEAR_KEY_FIELDS])
+                        .where(Clear.member.in_(member_ids) & Clear.encounter.in_(encounter_ids))
+                        .tuples()
+                    )
+                    if key not in returned
+                ]
+                num_deleted = self.delete_clears(stale)
+        LOG.info(f"Removed {num_deleted} clears that are no longer on FFLogs.")
+        return num_added, num_deleted
+
+    def delete_clears(self, keys: List[Tuple]) -> int:
+        """
+        Deletes clears by natural key, given as tuples in CLEAR_KEY_FIELDS order with raw IDs, and rebuilds
+        the aggregates of their encounters. Returns the number of clears deleted.
+        """
+        if len(keys) == 0:
+            return 0
+        encounter_names = {ENCOUNTER_NAMES_BY_ID[key[1]] for key in keys}
+        conditions = " AND ".join(f'"{Clear._meta.fields[name].column_name}" = ?' for name in CLEAR_KEY_FIELDS)
+        with self._db.bind_ctx(ALL_MODELS):
+            with self._db.atomic():
+                num_before = Clear.select().count()
+                self._db.cursor().executemany(f'DELETE FROM "clear" WHERE {conditions}', keys)
+                num_deleted = num_before - Clear.select().count()
+                self.refresh_aggregates(encounter_names)
+        self._invalidate()
+        return num_deleted
+
+    def create_indexes(self):
+        with self._db.bind_ctx(ALL_MODELS):
+            for name, field_names in CLEAR_INDEXES.items():
+                fields = [getattr(Clear, field_name) for field_name in field_names]
+                self._db.execute(Clear.index(*fields, name=name).safe())
+            for name in RETIRED_CLEAR_INDEXES:
+                self._db.execute_sql(f'DROP INDEX IF EXISTS "{name}"')
+            # Refresh the planner's statistics now that the table is populated
+            self._db.execute_sql("ANALYZE")
+
+    def refresh_aggregates(self, encounter_names: Optional[Set[TrackedEncounterName]] = None):
+        """
+        Rebuilds the first_clear and member_job_clear rows of the given encounter names (all of them by
+        default) from Clear, then the clear_rate table from first_clear.
+        """
+        with self._db.bind_ctx(ALL_MODELS):
+            with self._db.atomic():
+                for model in (FirstClear, MemberJobClear):
+                    query = model.delete()
+                    if encounter_names is not None:
+                        query = query.where(model.encounter_name.in_(list(encounter_names)))
+                    query.execute()
+
+                for include_echo in (False, True):
+                    query = Clear.select().join(TrackedEncounter)
+                    if not include_echo:
+                        query = query.where(TrackedEncounter.with_echo == False)
+                    if encounter_names is not None:
+                        query = query.where(TrackedEncounter.name.in_(list(encounter_names)))
+
+                    FirstClear.insert_from(
+                        query.select(
+                            TrackedEncounter.name,
+                            Value(include_echo),
+                            Clear.member_id,
+                            fn.MIN(fn.DATE(Clear.start_time)),
+                        ).group_by(TrackedEncounter.name, Clear.member_id),
+                        [
+                            FirstClear.encounter_name,
+                            FirstClear.include_echo,
+                            FirstClear.member,
+                            FirstClear.first_clear_date,
+                        ]
+                    ).execute()
+                    # Grouped in index order, so SQLite walks clear_encounter_member_job instead of the table
+                    MemberJobClear.insert_from(
+                        query.select(
+                            TrackedEncounter.name,
+                            Value(include_echo),
+                            Clear.member_id,
+                            Clear.job_id,
+                        ).group_by(TrackedEncounter.name, Clear.member_id, Clear.job_id),
+                        [
+                            MemberJobClear.encounter_name,
+                            MemberJobClear.include_echo,
+                            MemberJobClear.member,
+                            MemberJobClear.job,
+                        ]
+                    ).execute()
+
+                self._refresh_clear_rates()
+        self._aggregates_ready = True
+        self._invalidate()
+
+    def _refresh_clear_rates(self):
+        # Reads only first_clear, which has one row per member and encounter name
+        eligible_members = Member.select().count()
+        clears = {
+            (name, bool(include_echo)): count
+            for name, include_echo, count in (
+                FirstClear.select(FirstClear.encounter_name, FirstClear.include_echo, fn.COUNT(FirstClear.member))
+                .group_by(FirstClear.encounter_name, FirstClear.include_echo)
+                .tuples()
+            )
+        }
+        rows = []
+        for include_echo in (False, True):
+            query = TrackedEncounter.select(TrackedEncounter.name).distinct()
+            if not include_echo:
+                query = query.where(TrackedEncounter.with_echo == False)
+            for name, in query.tuples():
+                rows.append(EncounterClearRate(
+                    encounter_name=name,
+                    include_echo=include_echo,
+                    clears=clears.get((name, include_echo), 0),
+                    eligible_members=eligible_members
+                ))
+        EncounterClearRate.delete().execute()
+        _insert_rows(self._db, EncounterClearRate, rows)
+
+    def ensure_aggregates(self):
+        """Materializes the aggregate tables of a database file built before they existed."""
+        if self._aggregates_ready:
+            return
+        with self._db.bind_ctx(ALL_MODELS):
+            missing = not all(self._db.table_exists(m._meta.table_name) for m in AGGREGATE_MODELS)
+            if missing:
+                self._db.create_tables(AGGREGATE_MODELS, safe=True)
+            # Every tracked encounter has a clear_rate row, so an empty table was never populated
+            if missing or EncounterClearRate.select().count() == 0:
+                LOG.info(f"Materializing aggregate tables in {self.db_filename}.")
+                self.refresh_aggregates()
+        self._aggregates_ready = True
+
+    def _member_map(self) -> Dict[int, Member]:
+        """Every member by FFLogs ID, loaded with a single query the first time it's needed."""
+        if self._members_by_id is None:
+            with self._db.bind_ctx(ALL_MODELS):
+                self._members_by_id = {m.fcid: m for m in Member.select()}
+        return self._members_by_id
+
+    def _job_map(self) -> Dict[str, Job]:
+        if self._jobs_by_tla is None:
+            with self._db.bind_ctx(ALL_MODELS):
+                self._jobs_by_tla = {j.tla: j for j in Job.select()}
+        return self._jobs_by_tla
+
+    @_memoized
+    def get_clear_matrix(self, include_echo: bool = False) -> "ClearMatrix":
+        """
+        The whole database as a member x encounter ClearMatrix, built once and shared by every caller
+        (its arrays are read-only).
+        """
+        from acrossfc.core.clear_matrix import ClearMatrix
+        return ClearMatrix.from_database(self, include_echo=include_echo)
+
+    @_memoized
     def get_fc_roster(self) -> List[Member]:
         with self._db.bind_ctx(ALL_MODELS):
-            return Member.select().order_by(Member.rank, Member.name)
+            return list(Member.select().order_by(Member.rank, Member.name))
 
+    @_memoized
     def get_clear_rates(
         self,
         include_echo: bool = False
     ) -> Dict[TrackedEncounterName, ClearRate]:
+        self.ensure_aggregates()
         with self._db.bind_ctx(ALL_MODELS):
-            eligible_members = Member.select().count()
             query = (
-                TrackedEncounter.select(
-                    TrackedEncounter.name, fn.Count(fn.Distinct(Clear.member)).alias("count")
+                EncounterClearRate.select(
+                    EncounterClearRate.encounter_name,
+                    EncounterClearRate.clears,
+                    EncounterClearRate.eligible_members,
                 )
-                .join(Clear, JOIN.LEFT_OUTER)
+                .where(EncounterClearRate.include_echo == include_echo)
+                .tuples()
             )
-            if not include_echo:
-                query = query.where(TrackedEncounter.with_echo == False)
-            query = query.group_by(TrackedEncounter.name)
-
-        ret = {row.name: ClearRate(row.count, eligible_members) for row in query}
+            return {name: ClearRate(clears, eligible_members) for name, clears, eligible_members in query}
 
-        return ret
+    def _cleared_member_ids(self, encounter_name: str, include_echo: bool):
+        return (
+            FirstClear.select(FirstClear.member)
+            .where(
+                (FirstClear.encounter_name == encounter_name)
+                & (FirstClear.include_echo == include_echo)
+            )
+        )
 
+    @_memoized
     def get_cleared_members_by_encounter(
         self,
         encounter_name: str,
         include_echo: bool = False
     ) -> Set[Member]:
+        self.ensure_aggregates()
         with self._db.bind_ctx(ALL_MODELS):
-            query = (
-                Member.select()
-                .join(Clear)
-                .join(TrackedEncounter)
-                .where(TrackedEncounter.name == encounter_name)
-            )
-            if not include_echo:
-                query = query.where(TrackedEncounter.with_echo == False)
-            query = query.distinct()
-
-        return query
+            query = Member.select().where(Member.fcid.in_(self._cleared_member_ids(encounter_name, include_echo)))
+            return set(query)
 
+    @_memoized
     def get_uncleared_members_by_encounter(
         self,
         encounter_name: str,
         include_echo: bool = False
     ) -> Set[Member]:
+        self.ensure_aggregates()
         with self._db.bind_ctx(ALL_MODELS):
-            members_with_clear = (
-                Member.select()
-                .join(Clear)
-                .join(TrackedEncounter)
-                .where(TrackedEncounter.name == encounter_name)
-            )
-            if not include_echo:
-                members_with_clear = members_with_clear.where(TrackedEncounter.with_echo == False)
-            members_with_clear = members_with_clear.distinct()
-
-            members_without_clear = (
-                Member.select()
-                .join(
-                    members_with_clear,
-                    JOIN.LEFT_OUTER,
-                    on=(Member.fcid == members_with_clear.c.fcid),
-                )
-                .where(members_with_clear.c.fcid >> None)
-            )
-
-        return set(members_without_clear)
+            query = Member.select().where(Member.fcid.not_in(self._cleared_member_ids(encounter_name, include_echo)))
+            return set(query)
 
+    @_memoized
     def get_clear_order(
         self,
         include_echo: bool = False
@@ -139,66 +534,61 @@ class ClearDatabase:
         #         ...
         #     ]
         # }
+        self.ensure_aggregates()
+        members_by_id = self._member_map()
+
         with self._db.bind_ctx(ALL_MODELS):
-            # Get index of members
             clear_chart = defaultdict(list)
+            # Select plain columns and iterate tuples, so no row lazily loads its member
             query = (
-                Clear.select(
-                    TrackedEncounter.name,
-                    Clear.member,
-                    fn.MIN(fn.DATE(Clear.start_time)).alias("first_clear_date"),
+                FirstClear.select(
+                    FirstClear.encounter_name,
+                    FirstClear.member_id,
+                    FirstClear.first_clear_date,
                 )
-                .join(TrackedEncounter)
-            )
-            if not include_echo:
-                query = query.where(TrackedEncounter.with_echo == False)
-            query = (
-                query
-                .group_by(TrackedEncounter.name, Clear.member)
-                .order_by(TrackedEncounter.name, fn.MIN(fn.DATE(Clear.start_time)))
-                .alias("subquery")
+                .where(FirstClear.include_echo == include_echo)
+                .order_by(FirstClear.encounter_name, FirstClear.first_clear_date)
+                .tuples()
             )
 
-            for row in query:
-                clear_date = date.fromisoformat(row.first_clear_date)
-                encounter_clear_chart = clear_chart[row.encounter.name]
+            for encounter_name, member_id, clear_date in query:
+                member = members_by_id[member_id]
+                encounter_clear_chart = clear_chart[encounter_name]
                 if len(encounter_clear_chart) == 0:
-                    encounter_clear_chart.append((clear_date, {row.member}))
+                    encounter_clear_chart.append((clear_date, {member}))
                 else:
                     last_clear_date = encounter_clear_chart[-1][0]
                     if clear_date > last_clear_date:
-                        encounter_clear_chart.append((clear_date, {row.member}))
+                        encounter_clear_chart.append((clear_date, {member}))
                     else:
-                        encounter_clear_chart[-1][1].add(row.member)
+                        encounter_clear_chart[-1][1].add(member)
 
         return clear_chart
 
+    @_memoized
     def get_cleared_jobs(
         self,
         include_echo: bool = False
     ) -> Dict[TrackedEncounterName, Set[Tuple[Member, Job]]]:
+        self.ensure_aggregates()
         encounter_cleared_jobs = defaultdict(set)
+        members_by_id = self._member_map()
+        jobs_by_tla = self._job_map()
 
         with self._db.bind_ctx(ALL_MODELS):
             query = (
-                Clear.select(Clear.encounter, Clear.member, Clear.job)
-            )
-            if not include_echo:
-                query = (
-                    query
-                    .join(TrackedEncounter)
-                    .where(TrackedEncounter.with_echo == False)
+                MemberJobClear.select(
+                    MemberJobClear.encounter_name,
+                    MemberJobClear.member_id,
+                    MemberJobClear.job_id,
                 )
-            query = (
-                query
-                .group_by(Clear.encounter, Clear.member, Clear.job)
-                .order_by(Clear.encounter, Clear.member, Clear.job)
+                .where(MemberJobClear.include_echo == include_echo)
+                .tuples()
             )
 
-            for row in query:
-                new_datapoint = (row.member, row.job)
-                encounter_cleared_jobs[row.encounter.name].add(
-                    new_datapoint
-                )  # Set will automatically de-dupe
+            for encounter_name, member_id, job_tla in query:
+                encounter_cleared_jobs[encounter_name].add(
+                    (members_by_id[member_id], jobs_by_tla[job_tla])
+                )
 
         return encounter_cleared_jobs
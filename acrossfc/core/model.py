@@ -1,73 +1,37 @@
 # stdlib
 from datetime import datetime
-from typing import Optional, NamedTuple, Callable, List
-from dataclasses import dataclass, asdict
+from typing import TYPE_CHECKING, Optional, NamedTuple, Callable, List
+from dataclasses import dataclass
 from enum import Enum
 
-# 3rd-party
-from peewee import (
-    Model,
-    IntegerField,
-    CharField,
-    ForeignKeyField,
-    DateTimeField,
-    FloatField,
-    BooleanField,
-)
-
 
 # -----------------------------------------------
 # ClearDB peewee models
 # -----------------------------------------------
 
-class Member(Model):
-    fcid = IntegerField(primary_key=True)
-    name = CharField(255)
-    rank = IntegerField()
-
-
-class TrackedEncounter(Model):
-    id = CharField(16, primary_key=True)
-    name = CharField(16)
-    encounter_id = IntegerField()
-    difficulty_id = IntegerField(null=True)
-    partition_id = IntegerField(null=True)
-    with_echo = BooleanField(default=False)
+# The peewee models live in cleardb_model and are only imported when first used, since most of the
+# API and bot never touch ClearDB. `from acrossfc.core.model import Member` keeps working.
+_CLEARDB_MODELS = {
+    'Member', 'TrackedEncounter', 'JobCategory', 'Job', 'Clear',
+    'FirstClear', 'EncounterClearRate', 'MemberJobClear',
+    'TimelineSnapshot', 'TimelineMember', 'TimelineClear',
+}
 
-    class Meta:
-        indexes = ((("encounter_id", "difficulty_id", "partition_id"), True),)
 
-    def __str__(self):
-        return f"{self.name}_{self.encounter_id}_{self.difficulty_id}_{self.partition_id}"
-
-    def __repr__(self):
-        return str(self)
+def __getattr__(name):
+    if name in _CLEARDB_MODELS:
+        from acrossfc.core import cleardb_model
+        return getattr(cleardb_model, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 TrackedEncounterName = str
 
-
-class JobCategory(Model):
-    name = CharField(32, primary_key=True)
-    long_name = CharField(64)
-
-
-class Job(Model):
-    tla = CharField(3, primary_key=True)
-    name = CharField(64)
-    main_category = ForeignKeyField(JobCategory)
-    sub_category = ForeignKeyField(JobCategory, null=True)
-
-
-class Clear(Model):
-    member = ForeignKeyField(Member)
-    encounter = ForeignKeyField(TrackedEncounter)
-    start_time = DateTimeField()
-    historical_pct = FloatField()
-    report_code = CharField(32)
-    report_fight_id = IntegerField()
-    job = ForeignKeyField(Job)
-    locked_in = BooleanField()
+if TYPE_CHECKING:
+    from acrossfc.core.cleardb_model import (  # noqa: F401
+        Member, TrackedEncounter, JobCategory, Job, Clear, FirstClear, EncounterClearRate, MemberJobClear,
+        TimelineSnapshot, TimelineMember, TimelineClear,
+    )
 
 
 # -----------------------------------------------
@@ -195,19 +159,28 @@ class PointsEvent:
         return f"{self.member_id}: {self.category.name} ({self.points})"
 
     def to_user_json(self):
-        ret = asdict(self)
-        ret['category'] = self.category.value
         # Keep submission ID but remove status
-        del ret['status']
-        return ret
+        return {
+            'uuid': self.uuid,
+            'member_id': self.member_id,
+            'points': self.points,
+            'category': self.category.value,
+            'description': self.description,
+            'ts': self.ts,
+            'submission_uuid': self.submission_uuid,
+        }
 
     def to_submission_json(self):
-        ret = asdict(self)
-        ret['category'] = self.category.value
         # Keep status but remove submissions ID
-        ret['status'] = self.status.value
-        del ret['submission_uuid']
-        return ret
+        return {
+            'uuid': self.uuid,
+            'member_id': self.member_id,
+            'points': self.points,
+            'category': self.category.value,
+            'description': self.description,
+            'ts': self.ts,
+            'status': self.status.value,
+        }
 
 
 class SubmissionsChannel(Enum):
@@ -240,7 +213,7 @@ class ClearRate(NamedTuple):
 
 class FFLogsFightData(NamedTuple):
     report_id: str
-    encounter: TrackedEncounter
+    encounter: 'TrackedEncounter'
     start_time: datetime
     player_names: List[str]
 
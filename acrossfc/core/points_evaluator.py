@@ -34,9 +34,13 @@ class PointsEvaluator:
         fflogs_url: str,
         is_fc_pf: bool,
         is_static: bool,
-        fc_pf_id: Optional[str]
+        fc_pf_id: Optional[str],
+        fight_data: Optional[FFLogsFightData] = None
     ):
-        self.fight_data: FFLogsFightData = FFLOGS_CLIENT.get_fight_data(fflogs_url)
+        # Fight data can be passed in when it was already fetched, e.g. in bulk with other fights of the same report
+        if fight_data is None:
+            fight_data = FFLOGS_CLIENT.get_fight_data(fflogs_url)
+        self.fight_data: FFLogsFightData = fight_data
         self.fc_roster: List[Member] = FFLOGS_CLIENT.get_fc_roster()
         self.is_fc_pf = is_fc_pf
         self.is_static = is_static
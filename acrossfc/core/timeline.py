@@ -0,0 +1,224 @@
+# stdlib
+import logging
+from typing import Dict, List, Optional
+from datetime import date
+
+# 3rd-party
+from peewee import fn
+
+# Local
+from acrossfc.core.model import (
+    Member,
+    TrackedEncounter,
+    JobCategory,
+    Job,
+    Clear,
+    TimelineSnapshot,
+    TimelineMember,
+    TimelineClear,
+)
+from acrossfc.core.constants import ALL_ENCOUNTERS, JOB_CATEGORIES, JOBS
+from acrossfc.core.database import ClearDatabase, _insert_rows, _open_sqlite
+
+LOG = logging.getLogger(__name__)
+
+# S3 key of the timeline, in the ClearDB bucket
+TIMELINE_OBJECT_KEY = 'timeline'
+
+TIMELINE_MODELS = [TrackedEncounter, JobCategory, Job, TimelineSnapshot, TimelineMember, TimelineClear]
+
+# Natural key of a clear, same as CLEAR_KEY_FIELDS but without the Member foreign key
+TIMELINE_CLEAR_KEY_FIELDS = ('member_id', 'encounter', 'report_code', 'report_fight_id')
+
+# Updated on a clear that is seen again, so the timeline has its latest values
+_REFRESHED_FIELDS = ('start_time', 'historical_pct', 'job', 'locked_in')
+
+# Clear fields copied into the timeline as they are
+_CLEAR_VALUE_FIELDS = ('start_time', 'historical_pct', 'report_code', 'report_fight_id', 'locked_in')
+
+
+class TimelineDatabase:
+    """
+    Every daily ClearDB snapshot folded into one SQLite file. Each clear is stored once with the first and
+    last snapshot it appeared in, and each version of a member's roster entry with the dates it was valid,
+    so the roster and clears of any past day can be rebuilt with a couple of indexed queries.
+
+    Only append_snapshot writes to the file, so reading a timeline (e.g. the cached copy from S3, opened
+    with read_only) never changes it.
+    """
+    def __init__(self, db_filename: str, read_only: bool = False):
+        self.db_filename = db_filename
+        self._db = _open_sqlite(db_filename, read_only)
+
+    def _has_snapshots_table(self) -> bool:
+        return self._db.table_exists(TimelineSnapshot._meta.table_name)
+
+    def _create_tables(self):
+        self._db.create_tables(TIMELINE_MODELS, safe=True)
+        with self._db.atomic():
+            _insert_rows(self._db, TrackedEncounter, ALL_ENCOUNTERS, conflict_fields=('id',))
+            _insert_rows(self._db, JobCategory, JOB_CATEGORIES, conflict_fields=('name',))
+            _insert_rows(self._db, Job, JOBS, conflict_fields=('tla',))
+
+    def snapshot_dates(self) -> List[date]:
+        with self._db.bind_ctx(TIMELINE_MODELS):
+            if not self._has_snapshots_table():
+                return []
+            query = TimelineSnapshot.select(TimelineSnapshot.snapshot_date).order_by(TimelineSnapshot.snapshot_date)
+            return [d for d, in query.tuples()]
+
+    def _latest_snapshot(self, on_or_before: Optional[date] = None, before: Optional[date] = None) -> Optional[date]:
+        if not self._has_snapshots_table():
+            # A new file, or not a timeline at all
+            return None
+        query = TimelineSnapshot.select(fn.MAX(TimelineSnapshot.snapshot_date))
+        if on_or_before is not None:
+            query = query.where(TimelineSnapshot.snapshot_date <= on_or_before)
+        if before is not None:
+            query = query.where(TimelineSnapshot.snapshot_date < before)
+        latest = query.scalar()
+        return date.fromisoformat(latest) if isinstance(latest, str) else latest
+
+    def append_snapshot(self, snapshot_date: date, database: ClearDatabase):
+        """
+        Folds the roster and clears of a ClearDB built on snapshot_date into the timeline.
+        Snapshots must be appended in date order. Appending the latest date again merges into what it recorded.
+        """
+        members = database.get_fc_roster()
+        with database._db.bind_ctx([Clear]):
+            clears = list(
+                Clear.select(
+                    Clear.member, Clear.encounter, Clear.job,
+                    *[getattr(Clear, name) for name in _CLEAR_VALUE_FIELDS]
+                ).dicts()
+            )
+
+        with self._db.bind_ctx(TIMELINE_MODELS):
+            latest = self._latest_snapshot()
+            if latest is not None and snapshot_date < latest:
+                raise ValueError(
+                    f"Snapshot {snapshot_date} is older than the latest snapshot in the timeline ({latest})"
+                )
+
+            self._create_tables()
+
+            with self._db.atomic():
+                self._append_members(snapshot_date, members)
+                self._append_clears(snapshot_date, clears)
+                _insert_rows(
+                    self._db,
+                    TimelineSnapshot,
+                    [TimelineSnapshot(snapshot_date=snapshot_date, members=len(members), clears=len(clears))],
+                    conflict_fields=('snapshot_date',)
+                )
+        LOG.info(f"Appended snapshot {snapshot_date} ({len(members)} members, {len(clears)} clears) to the timeline.")
+
+    def _append_clears(self, snapshot_date: date, clears: List[Dict]):
+        # Clears seen in the previous snapshot are extended to this one. Anything else starts a new row, including
+        # a clear that comes back after missing from a snapshot, so it doesn't count as present in between.
+        previous = self._latest_snapshot(before=snapshot_date)
+        open_rows = {
+            key[1:]: key[0]
+            for key in (
+                TimelineClear.select(TimelineClear.id, *[getattr(TimelineClear, f) for f in TIMELINE_CLEAR_KEY_FIELDS])
+                .where(TimelineClear.last_seen >= (previous if previous is not None else snapshot_date))
+                .tuples()
+            )
+        }
+
+        extended = []
+        added = []
+        for c in clears:
+            row_id = open_rows.get((c['member'], c['encounter'], c['report_code'], c['report_fight_id']))
+            if row_id is None:
+                added.append(TimelineClear(
+                    member_id=c['member'],
+                    encounter=c['encounter'],
+                    job=c['job'],
+                    first_seen=snapshot_date,
+                    last_seen=snapshot_date,
+                    **{name: c[name] for name in _CLEAR_VALUE_FIELDS}
+                ))
+            else:
+                extended.append(
+                    tuple(TimelineClear._meta.fields[f].db_value(c[f]) for f in _REFRESHED_FIELDS)
+                    + (TimelineClear.last_seen.db_value(snapshot_date), row_id)
+                )
+
+        updates = ", ".join(f'"{TimelineClear._meta.fields[f].column_name}" = ?' for f in _REFRESHED_FIELDS)
+        self._db.cursor().executemany(
+            f'UPDATE "{TimelineClear._meta.table_name}" SET {updates}, "last_seen" = ? WHERE "id" = ?', extended
+        )
+        _insert_rows(self._db, TimelineClear, added)
+        LOG.info(f"Timeline: {len(extended)} clears seen again, {len(added)} new.")
+
+    def _append_members(self, snapshot_date: date, members: List[Member]):
+        current: Dict[int, TimelineMember] = {
+            m.fcid: m for m in TimelineMember.select().where(TimelineMember.valid_to >> None)
+        }
+        roster = {m.fcid: m for m in members}
+
+        # Members who left, or whose name / rank changed, close their current version on this date
+        closed = [
+            fcid for fcid, row in current.items()
+            if fcid not in roster or (row.name, row.rank) != (roster[fcid].name, roster[fcid].rank)
+        ]
+        if len(closed) > 0:
+            (
+                TimelineMember.update(valid_to=snapshot_date)
+                .where((TimelineMember.fcid.in_(closed)) & (TimelineMember.valid_to >> None))
+                .execute()
+            )
+            # A version opened and closed on the same date never applied to any day
+            TimelineMember.delete().where(
+                (TimelineMember.fcid.in_(closed)) & (TimelineMember.valid_from == snapshot_date)
+            ).execute()
+
+        opened = [
+            TimelineMember(fcid=m.fcid, name=m.name, rank=m.rank, valid_from=snapshot_date, valid_to=None)
+            for m in members
+            if m.fcid not in current or m.fcid in closed
+        ]
+        _insert_rows(self._db, TimelineMember, opened)
+
+    def as_of(self, as_of_date: date) -> ClearDatabase:
+        """
+        Rebuilds the ClearDB as it was on as_of_date, taken from the latest snapshot on or before that date.
+        Every report can then run against it as usual.
+        """
+        with self._db.bind_ctx(TIMELINE_MODELS):
+            snapshot_date = self._latest_snapshot(on_or_before=as_of_date)
+            if snapshot_date is None:
+                raise ValueError(f"The timeline {self.db_filename} has no snapshots on or before {as_of_date}")
+
+            members = [
+                Member(fcid=fcid, name=name, rank=rank)
+                for fcid, name, rank in (
+                    TimelineMember.select(TimelineMember.fcid, TimelineMember.name, TimelineMember.rank)
+                    .where(
+                        (TimelineMember.valid_from <= snapshot_date)
+                        & ((TimelineMember.valid_to >> None) | (TimelineMember.valid_to > snapshot_date))
+                    )
+                    .tuples()
+                )
+            ]
+            clears = [
+                Clear(
+                    member=c['member_id'],
+                    encounter=c['encounter'],
+                    job=c['job'],
+                    **{name: c[name] for name in _CLEAR_VALUE_FIELDS}
+                )
+                for c in (
+                    TimelineClear.select(
+                        TimelineClear.member_id, TimelineClear.encounter, TimelineClear.job,
+                        *[getattr(TimelineClear, name) for name in _CLEAR_VALUE_FIELDS]
+                    )
+                    # Still present in the snapshot the date falls on
+                    .where((TimelineClear.first_seen <= snapshot_date) & (TimelineClear.last_seen >= snapshot_date))
+                    .dicts()
+                )
+            ]
+
+        LOG.info(f"Rebuilding ClearDB as of {as_of_date} from snapshot {snapshot_date}.")
+        return ClearDatabase.from_fflogs(members, clears)
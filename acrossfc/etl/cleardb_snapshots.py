@@ -0,0 +1,217 @@
+# stdlib
+import os
+import json
+import sqlite3
+import logging
+from typing import Dict, List, Optional, Tuple
+from datetime import date
+
+# 3rd-party
+import zstandard
+
+# Local
+from acrossfc.core.config import FC_CONFIG
+from acrossfc.core.model import Clear, Member
+from acrossfc.core.database import ClearDatabase, CLEAR_KEY_FIELDS
+
+LOG = logging.getLogger(__name__)
+
+# S3 layout, next to the legacy per-day files in the ClearDB bucket:
+#   snapshots/manifest.json            every snapshot still available, oldest first
+#   snapshots/<date>.sqlite.zst        full ClearDB, zstd-compressed
+#   snapshots/<date>.delta.json.zst    rows that changed since the snapshot before it
+SNAPSHOT_PREFIX = 'snapshots/'
+MANIFEST_KEY = f'{SNAPSHOT_PREFIX}manifest.json'
+
+FULL = 'full'
+DELTA = 'delta'
+DELTA_FORMAT_VERSION = 1
+
+# Clear columns carried in a delta, in field order. Aggregates aren't, they're rebuilt on replay.
+DELTA_CLEAR_FIELDS = (
+    'member', 'encounter', 'start_time', 'historical_pct', 'report_code', 'report_fight_id', 'job', 'locked_in'
+)
+
+
+def compress_file(src_filename: str, dst_filename: str, level: int):
+    with open(src_filename, 'rb') as src, open(dst_filename, 'wb') as dst:
+        zstandard.ZstdCompressor(level=level, threads=-1).copy_stream(src, dst)
+
+
+def decompress_file(src_filename: str, dst_filename: str):
+    with open(src_filename, 'rb') as src, open(dst_filename, 'wb') as dst:
+        zstandard.ZstdDecompressor().copy_stream(src, dst)
+
+
+def _columns(fields) -> str:
+    return ", ".join(f'"{Clear._meta.fields[f].column_name}"' for f in fields)
+
+
+def make_delta(base_filename: str, cleardb_filename: str) -> Dict:
+    """
+    Diffs two ClearDB files. The delta carries the full roster (it's small, and replaying it with pruning
+    also drops the clears of members who left), the clears that are new or changed, and the natural keys
+    of clears that are gone.
+    """
+    conn = sqlite3.connect(cleardb_filename)
+    try:
+        conn.execute("ATTACH DATABASE ? AS base", (base_filename,))
+        members = conn.execute('SELECT fcid, name, rank FROM main."member" ORDER BY fcid').fetchall()
+        clear_columns = _columns(DELTA_CLEAR_FIELDS)
+        upserts = conn.execute(
+            f'SELECT {clear_columns} FROM main."clear" EXCEPT SELECT {clear_columns} FROM base."clear"'
+        ).fetchall()
+        key_columns = _columns(CLEAR_KEY_FIELDS)
+        deletes = conn.execute(
+            f'SELECT {key_columns} FROM base."clear" EXCEPT SELECT {key_columns} FROM main."clear"'
+        ).fetchall()
+    finally:
+        conn.close()
+
+    return {
+        'format': DELTA_FORMAT_VERSION,
+        'members': members,
+        'clear_fields': list(DELTA_CLEAR_FIELDS),
+        'clear_upserts': upserts,
+        'clear_deletes': deletes,
+    }
+
+
+def apply_delta(database: ClearDatabase, delta: Dict):
+    """Replays a delta from make_delta on top of its base, opened with ClearDatabase.open_existing."""
+    if delta['format'] != DELTA_FORMAT_VERSION:
+        raise ValueError(f"Unsupported ClearDB delta format {delta['format']}")
+
+    database.upsert_members(
+        [Member(fcid=fcid, name=name, rank=rank) for fcid, name, rank in delta['members']],
+        prune=True
+    )
+    database.delete_clears([tuple(key) for key in delta['clear_deletes']])
+    database.upsert_clears([Clear(**dict(zip(delta['clear_fields'], row))) for row in delta['clear_upserts']])
+
+
+def latest_chain(manifest: Dict) -> List[Dict]:
+    """The latest full snapshot and every delta after it, i.e. what rebuilds the latest snapshot."""
+    snapshots = manifest['snapshots']
+    fulls = [i for i, entry in enumerate(snapshots) if entry['kind'] == FULL]
+    return [] if len(fulls) == 0 else snapshots[fulls[-1]:]
+
+
+def _encode_delta(delta: Dict, level: int) -> bytes:
+    return zstandard.ZstdCompressor(level=level).compress(json.dumps(delta, separators=(',', ':')).encode('utf-8'))
+
+
+def _decode_delta(data: bytes) -> Dict:
+    return json.loads(zstandard.ZstdDecompressor().decompress(data))
+
+
+class SnapshotStore:
+    """
+    ClearDB snapshots in S3, recorded in a manifest. Each snapshot is either a full compressed database or a
+    delta on top of the snapshot before it. Consumers download the latest full snapshot and replay the
+    deltas after it. Writing a full snapshot compacts the chain: the deltas before it are deleted.
+    """
+    def __init__(self, s3, bucket_name: str):
+        self.s3 = s3
+        self.bucket_name = bucket_name
+
+    def _is_missing(self, e) -> bool:
+        return e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey')
+
+    def load_manifest(self) -> Dict:
+        try:
+            body = self.s3.get_object(Bucket=self.bucket_name, Key=MANIFEST_KEY)['Body'].read()
+        except self.s3.exceptions.ClientError as e:
+            if not self._is_missing(e):
+                raise
+            return {'snapshots': []}
+        return json.loads(body)
+
+    def _save_manifest(self, manifest: Dict):
+        self.s3.put_object(
+            Bucket=self.bucket_name,
+            Key=MANIFEST_KEY,
+            Body=json.dumps(manifest, indent=2).encode('utf-8'),
+            ContentType='application/json'
+        )
+
+    def download_latest(self, local_filename: str) -> Optional[date]:
+        """
+        Rebuilds the latest snapshot into local_filename and returns its date, or None if there are no
+        snapshots yet.
+        """
+        chain = latest_chain(self.load_manifest())
+        if len(chain) == 0:
+            return None
+
+        full, deltas = chain[0], chain[1:]
+        compressed_filename = f"{local_filename}.zst"
+        self.s3.download_file(self.bucket_name, full['key'], compressed_filename)
+        decompress_file(compressed_filename, local_filename)
+        LOG.info(f"Downloaded full ClearDB snapshot {full['date']} ({full['size']} bytes)")
+
+        if len(deltas) > 0:
+            database = ClearDatabase.open_existing(local_filename)
+            for entry in deltas:
+                data = self.s3.get_object(Bucket=self.bucket_name, Key=entry['key'])['Body'].read()
+                apply_delta(database, _decode_delta(data))
+                LOG.info(f"Applied ClearDB delta {entry['date']} ({entry['size']} bytes)")
+        return date.fromisoformat(chain[-1]['date'])
+
+    def upload(
+        self,
+        snapshot_date: date,
+        cleardb_filename: str,
+        base: Optional[Tuple[date, str]] = None
+    ) -> Dict:
+        """
+        Uploads the ClearDB built on snapshot_date. With delta snapshots enabled and base given as the
+        (date, local file) of the latest snapshot, only the changes since base are uploaded, unless it's
+        time to compact. Returns the manifest entry.
+        """
+        manifest = self.load_manifest()
+        # Re-running on the same day replaces that day's snapshot
+        replaced = [entry for entry in manifest['snapshots'] if entry['date'] == str(snapshot_date)]
+        snapshots = [entry for entry in manifest['snapshots'] if entry['date'] != str(snapshot_date)]
+        chain = latest_chain({'snapshots': snapshots})
+
+        kind = FULL
+        if (
+            FC_CONFIG.cleardb_delta_snapshots
+            and base is not None
+            and len(chain) > 0
+            and chain[-1]['date'] == str(base[0])
+            and (snapshot_date - date.fromisoformat(chain[0]['date'])).days < FC_CONFIG.cleardb_compaction_days
+        ):
+            kind = DELTA
+
+        if kind == DELTA:
+            key = f"{SNAPSHOT_PREFIX}{snapshot_date}.delta.json.zst"
+            data = _encode_delta(make_delta(base[1], cleardb_filename), FC_CONFIG.cleardb_zstd_level)
+            self.s3.put_object(Bucket=self.bucket_name, Key=key, Body=data)
+            size = len(data)
+        else:
+            key = f"{SNAPSHOT_PREFIX}{snapshot_date}.sqlite.zst"
+            compressed_filename = f"{cleardb_filename}.zst"
+            compress_file(cleardb_filename, compressed_filename, FC_CONFIG.cleardb_zstd_level)
+            self.s3.upload_file(compressed_filename, self.bucket_name, key)
+            size = os.path.getsize(compressed_filename)
+
+        entry = {'date': str(snapshot_date), 'kind': kind, 'key': key, 'size': size}
+        obsolete = replaced
+        if kind == FULL:
+            # Compaction: the new full snapshot supersedes the deltas before it
+            obsolete = obsolete + [e for e in snapshots if e['kind'] == DELTA]
+            snapshots = [e for e in snapshots if e['kind'] == FULL]
+        manifest['snapshots'] = snapshots + [entry]
+
+        # The manifest only ever points at objects that exist
+        self._save_manifest(manifest)
+        for e in obsolete:
+            if e['key'] != key:
+                self.s3.delete_object(Bucket=self.bucket_name, Key=e['key'])
+        if kind == FULL and len(obsolete) > 0:
+            LOG.info(f"Compacted {len(obsolete)} ClearDB deltas into snapshot {snapshot_date}")
+
+        LOG.info(f"Uploaded {kind} ClearDB snapshot {snapshot_date} ({size} bytes)")
+        return entry
@@ -2,9 +2,10 @@
 import os
 import json
 import boto3
+import shutil
 import logging
-from typing import List
-from datetime import date
+from typing import List, Optional
+from datetime import date, timedelta
 
 # 3rd-party
 import requests
@@ -15,11 +16,49 @@ from acrossfc.core.config import FC_CONFIG
 from acrossfc.core.model import Clear, Member
 from acrossfc.core.constants import ACTIVE_TRACKED_ENCOUNTERS
 from acrossfc.core.database import ClearDatabase
+from acrossfc.core.timeline import TimelineDatabase, TIMELINE_OBJECT_KEY
 from acrossfc.ext.fflogs_client import FFLOGS_CLIENT
+from .cleardb_snapshots import SnapshotStore
 
 LOG = logging.getLogger(__name__)
 
 
+def download_previous_cleardb(s3, bucket_name: str) -> Optional[str]:
+    """
+    Downloads yesterday's uncompressed ClearDB from S3, returning its local path, or None if it doesn't exist.
+    Only used until the first compressed snapshot exists.
+    """
+    object_key = str(date.today() - timedelta(days=1))
+    local_filename = f"/tmp/{object_key}"
+    try:
+        s3.download_file(bucket_name, object_key, local_filename)
+    except s3.exceptions.ClientError as e:
+        LOG.warning(f"Unable to download previous ClearDB {object_key}, rebuilding from scratch: {e}")
+        return None
+    LOG.info(f"Downloaded previous ClearDB {object_key}")
+    return local_filename
+
+
+def append_to_timeline(s3, bucket_name: str, database: ClearDatabase):
+    """Downloads the timeline database from S3, appends today's ClearDB to it and uploads it back."""
+    local_filename = f"/tmp/{TIMELINE_OBJECT_KEY}"
+    try:
+        s3.download_file(bucket_name, TIMELINE_OBJECT_KEY, local_filename)
+    except s3.exceptions.ClientError as e:
+        if e.response['Error']['Code'] not in ('404', 'NoSuchKey'):
+            # Starting over here would overwrite the history on upload
+            LOG.error(f"Unable to download the timeline, skipping today's snapshot: {e}")
+            return
+        LOG.info("No timeline found, starting a new one.")
+        if os.path.exists(local_filename):
+            os.remove(local_filename)
+
+    timeline = TimelineDatabase(local_filename)
+    timeline.append_snapshot(date.today(), database)
+    s3.upload_file(local_filename, bucket_name, TIMELINE_OBJECT_KEY)
+    LOG.info(f"{TIMELINE_OBJECT_KEY} uploaded successfully")
+
+
 def fc_clears_etl():
     fc_roster: List[Member] = FFLOGS_CLIENT.get_fc_roster()
     fc_clears: List[Clear] = []
@@ -30,15 +69,37 @@ def fc_clears_etl():
 
     # Needs to be in /tmp for it to work in Lambda
     cleardb_filename = f"/tmp/{str(date.today())}"
-    database = ClearDatabase.from_fflogs(fc_roster, fc_clears)
-    database.save(cleardb_filename)
-
-    # Upload ClearDB to S3
     s3 = boto3.client('s3')
     bucket_name = FC_CONFIG.s3_cleardb_bucket_name
-    object_key = f'{os.path.basename(cleardb_filename)}'
-    s3.upload_file(cleardb_filename, bucket_name, object_key)
-    LOG.info(f"{object_key} uploaded successfully")
+
+    # Start from the latest snapshot and merge today's data into it, or build from scratch if there isn't one
+    snapshot_store = SnapshotStore(s3, bucket_name)
+    previous_cleardb_filename = "/tmp/previous_cleardb"
+    previous_date = snapshot_store.download_latest(previous_cleardb_filename)
+    if previous_date is None:
+        previous_cleardb_filename = download_previous_cleardb(s3, bucket_name)
+    if previous_cleardb_filename is not None:
+        shutil.copy(previous_cleardb_filename, cleardb_filename)
+        database = ClearDatabase.open_existing(cleardb_filename)
+        database.upsert_members(fc_roster, prune=True)
+        # Every member was fetched for every active encounter, so anything FFLogs didn't return again is gone
+        database.sync_clears(fc_clears, [m.fcid for m in fc_roster], [e.id for e in ACTIVE_TRACKED_ENCOUNTERS])
+    else:
+        database = ClearDatabase.from_fflogs(fc_roster, fc_clears)
+        database.save(cleardb_filename)
+
+    # Upload ClearDB to S3, compressed, and only the changes since the previous snapshot if deltas are enabled
+    snapshot_store.upload(
+        date.today(),
+        cleardb_filename,
+        base=(previous_date, previous_cleardb_filename) if previous_date is not None else None
+    )
+    if FC_CONFIG.cleardb_legacy_uploads:
+        object_key = os.path.basename(cleardb_filename)
+        s3.upload_file(cleardb_filename, bucket_name, object_key)
+        LOG.info(f"{object_key} uploaded successfully")
+
+    append_to_timeline(s3, bucket_name, database)
 
     # Run clear rates report
     clear_rates_report = analytics.ClearRates(database)
@@ -0,0 +1,178 @@
+# stdlib
+import os
+import json
+import glob
+import shutil
+import logging
+import tempfile
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+# Local
+from acrossfc.core.config import FC_CONFIG
+from acrossfc.core.database import ClearDatabase, LATEST, S3_URL_PREFIX
+from acrossfc.utils import LazyProxy
+
+LOG = logging.getLogger(__name__)
+
+
+class ClearDBCache:
+    """
+    Local copies of ClearDBs in S3, kept in FC_CONFIG.cleardb_cache_dir. Every open revalidates the copy
+    with a conditional GET (If-None-Match on the stored ETag), so an unchanged database costs one round
+    trip and no download. Compressed snapshots are stored decompressed, and "latest" is rebuilt from the
+    snapshot manifest only when the manifest changes.
+
+    Opened databases are kept per process, so a warm Lambda reuses the connection and memoized results
+    for as long as the file behind them stays the same.
+    """
+    def __init__(self, cache_dir: str = None, s3=None):
+        if s3 is None:
+            # boto3 takes a while to import, so it's only loaded once the cache is first used
+            import boto3
+            s3 = boto3.client('s3')
+        self.s3 = s3
+        self.cache_dir = cache_dir if cache_dir is not None else FC_CONFIG.cleardb_cache_dir
+        self._databases: Dict[str, Tuple[Tuple[int, int], ClearDatabase]] = {}
+        self._lock = threading.Lock()
+
+    def _local_path(self, bucket_name: str, key: str) -> str:
+        # Keys can contain '/', which simply become subdirectories of the bucket's directory
+        path = os.path.join(self.cache_dir, bucket_name, key.removesuffix('.zst'))
+        if not os.path.abspath(path).startswith(os.path.abspath(self.cache_dir) + os.sep):
+            raise ValueError(f"Invalid S3 key {key}")
+        return path
+
+    def _temp_path(self, local_path: str, suffix: str) -> str:
+        # Unique per download, since downloads of the same object can run concurrently outside _lock
+        fd, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(local_path), prefix=f"{os.path.basename(local_path)}.", suffix=suffix
+        )
+        os.close(fd)
+        return temp_path
+
+    def fetch_object(
+        self,
+        bucket_name: str,
+        key: str,
+        prepare: Optional[Callable[[str], None]] = None
+    ) -> Tuple[str, bool]:
+        """
+        Makes sure the local copy of s3://bucket_name/key is current, downloading it only if the ETag
+        changed. .zst objects are decompressed, and prepare, if given, is run on a new download before it
+        replaces the local copy. Returns the local path, and whether it was downloaded.
+        """
+        local_path = self._local_path(bucket_name, key)
+        etag_path = f"{local_path}.etag"
+        request = {'Bucket': bucket_name, 'Key': key}
+        if os.path.exists(local_path) and os.path.exists(etag_path):
+            with open(etag_path) as f:
+                request['IfNoneMatch'] = f.read().strip()
+
+        try:
+            resp = self.s3.get_object(**request)
+        except self.s3.exceptions.ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('304', 'NotModified'):
+                LOG.debug(f"s3://{bucket_name}/{key} not modified, using {local_path}")
+                return local_path, False
+            raise
+
+        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+        # Written next to the final path and moved into place once complete, so readers never see a partial
+        # file, and the stored ETag only ever belongs to a finished file
+        download_path = self._temp_path(local_path, '.download')
+        try:
+            with open(download_path, 'wb') as f:
+                if key.endswith('.zst'):
+                    import zstandard
+                    zstandard.ZstdDecompressor().copy_stream(resp['Body'], f)
+                else:
+                    shutil.copyfileobj(resp['Body'], f)
+            if prepare is not None:
+                prepare(download_path)
+            with self._lock:
+                os.replace(download_path, local_path)
+                with open(etag_path, 'w') as f:
+                    f.write(resp['ETag'])
+        finally:
+            if os.path.exists(download_path):
+                os.remove(download_path)
+        LOG.info(f"Downloaded s3://{bucket_name}/{key} to {local_path}")
+        return local_path, True
+
+    def fetch_latest(self, bucket_name: str) -> str:
+        """Rebuilds the latest snapshot in the bucket, if the manifest changed, and returns its local path."""
+        from acrossfc.etl.cleardb_snapshots import MANIFEST_KEY, latest_chain, apply_delta
+
+        manifest_path, manifest_changed = self.fetch_object(bucket_name, MANIFEST_KEY)
+        with open(manifest_path) as f:
+            chain = latest_chain(json.load(f))
+        if len(chain) == 0:
+            raise FileNotFoundError(f"No ClearDB snapshots in s3://{bucket_name}")
+
+        latest_dir = os.path.join(self.cache_dir, bucket_name)
+        latest_path = os.path.join(latest_dir, f"latest-{chain[-1]['date']}.sqlite")
+        if os.path.exists(latest_path) and not manifest_changed:
+            return latest_path
+
+        full_path, _ = self.fetch_object(bucket_name, chain[0]['key'])
+        build_path = self._temp_path(latest_path, '.building')
+        try:
+            shutil.copy(full_path, build_path)
+            database = ClearDatabase.open_existing(build_path)
+            for entry in chain[1:]:
+                delta_path, _ = self.fetch_object(bucket_name, entry['key'])
+                with open(delta_path) as f:
+                    apply_delta(database, json.load(f))
+            database._db.close()
+            os.replace(build_path, latest_path)
+        finally:
+            if os.path.exists(build_path):
+                os.remove(build_path)
+
+        for stale_path in glob.glob(os.path.join(latest_dir, "latest-*.sqlite")):
+            if stale_path != latest_path:
+                os.remove(stale_path)
+        LOG.info(f"Rebuilt latest ClearDB ({chain[-1]['date']}, {len(chain) - 1} deltas) at {latest_path}")
+        return latest_path
+
+    def resolve(self, location: str) -> str:
+        """Local path of "latest" or s3://bucket/key, fetched or revalidated."""
+        if location == LATEST:
+            return self.fetch_latest(FC_CONFIG.s3_cleardb_bucket_name)
+
+        bucket_name, _, key = location.removeprefix(S3_URL_PREFIX).partition('/')
+        if bucket_name == '' or key == '':
+            raise ValueError(f"Expected s3://bucket/key, got {location}")
+        if key == LATEST:
+            return self.fetch_latest(bucket_name)
+
+        # Older snapshots predate the aggregate tables, which are added before the file is opened read-only
+        local_path, _ = self.fetch_object(bucket_name, key, prepare=_ensure_aggregates)
+        return local_path
+
+    def open(self, location: str) -> ClearDatabase:
+        local_path = self.resolve(location)
+        stat = os.stat(local_path)
+        version = (stat.st_ino, stat.st_mtime_ns)
+        with self._lock:
+            cached = self._databases.get(local_path)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            if cached is not None:
+                # The file was replaced, so the old connection would only pin the previous version
+                cached[1]._db.close()
+            database = ClearDatabase(local_path, read_only=True)
+            # Every cached file went through open_existing / ensure_aggregates before landing here
+            database._aggregates_ready = True
+            self._databases[local_path] = (version, database)
+            return database
+
+
+def _ensure_aggregates(cleardb_filename: str):
+    database = ClearDatabase(cleardb_filename)
+    database.ensure_aggregates()
+    database._db.close()
+
+
+CLEARDB_CACHE: ClearDBCache = LazyProxy(ClearDBCache)
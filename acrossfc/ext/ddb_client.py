@@ -1,21 +1,31 @@
 # stdlib
-from typing import Dict, Optional
-
-# 3rd-party
-import boto3
-from boto3.dynamodb.conditions import Key
+from decimal import Decimal
+from typing import Dict, List, Optional
 
 # Local
 from acrossfc.core.config import FC_CONFIG
+from acrossfc.utils import LazyProxy
 
 
 class DynamoDBClient:
     def __init__(self):
+        # boto3 takes a while to import, so it's only loaded once the client is first used
+        import boto3
+
         self.ddb = boto3.resource('dynamodb')
         self.ppts_table = self.ddb.Table(FC_CONFIG.ddb_participation_points_table)
         self.subs_table = self.ddb.Table(FC_CONFIG.ddb_submissions_table)
         self.subs_q_table = self.ddb.Table(FC_CONFIG.ddb_submissions_queue_table)
         self.members_table = self.ddb.Table(FC_CONFIG.ddb_members_table)
+        self.auth_cache_table = None
+        if FC_CONFIG.ddb_auth_cache_table is not None:
+            self.auth_cache_table = self.ddb.Table(FC_CONFIG.ddb_auth_cache_table)
+        self.response_cache_table = None
+        if FC_CONFIG.ddb_response_cache_table is not None:
+            self.response_cache_table = self.ddb.Table(FC_CONFIG.ddb_response_cache_table)
+        self.throttle_table = None
+        if FC_CONFIG.ddb_throttle_table is not None:
+            self.throttle_table = self.ddb.Table(FC_CONFIG.ddb_throttle_table)
 
     def delete_member(self, member_id: int):
         self.members_table.delete_item(
@@ -43,7 +53,15 @@ class DynamoDBClient:
         }
         self.members_table.put_item(Item=record)
 
+    def batch_add_members(self, records: List[Dict]):
+        """Writes member records (same shape as add_member) in batches of 25."""
+        with self.members_table.batch_writer(overwrite_by_pkeys=['member_id']) as batch:
+            for record in records:
+                batch.put_item(Item=record)
+
     def get_member_id(self, discord_user_id: int):
+        from boto3.dynamodb.conditions import Key
+
         response = self.members_table.query(
             IndexName='discord_user_id-index',
             KeyConditionExpression=Key('discord_user_id').eq(discord_user_id),
@@ -80,6 +98,25 @@ class DynamoDBClient:
     def update_member_points(self, member_points: Dict):
         self.ppts_table.put_item(Item=member_points)
 
+    def batch_get_member_points(self, tier: str, member_ids: List[int]) -> List[Dict]:
+        items = []
+        for i in range(0, len(member_ids), 100):
+            request_items = {
+                self.ppts_table.name: {
+                    'Keys': [{'tier': tier, 'member_id': member_id} for member_id in member_ids[i:i + 100]]
+                }
+            }
+            while request_items:
+                response = self.ddb.batch_get_item(RequestItems=request_items)
+                items.extend(response['Responses'].get(self.ppts_table.name, []))
+                request_items = response.get('UnprocessedKeys', None)
+        return items
+
+    def batch_update_member_points(self, member_points_list: List[Dict]):
+        with self.ppts_table.batch_writer(overwrite_by_pkeys=['tier', 'member_id']) as batch:
+            for member_points in member_points_list:
+                batch.put_item(Item=member_points)
+
     def get_submission_by_uuid(self, submission_uuid: str):
         response = self.subs_table.get_item(
             Key={
@@ -88,12 +125,81 @@ class DynamoDBClient:
         )
         return response.get('Item', None)
 
+    def batch_get_submissions(self, submission_uuids: List[str]) -> List[Dict]:
+        items = []
+        for i in range(0, len(submission_uuids), 100):
+            request_items = {
+                self.subs_table.name: {
+                    'Keys': [{'uuid': submission_uuid} for submission_uuid in submission_uuids[i:i + 100]]
+                }
+            }
+            while request_items:
+                response = self.ddb.batch_get_item(RequestItems=request_items)
+                items.extend(response['Responses'].get(self.subs_table.name, []))
+                request_items = response.get('UnprocessedKeys', None)
+        return items
+
+    def scan_submissions_queue(self) -> List[Dict]:
+        response = self.subs_q_table.scan()
+        items = response['Items']
+        while 'LastEvaluatedKey' in response:
+            response = self.subs_q_table.scan(ExclusiveStartKey=response['LastEvaluatedKey'])
+            items.extend(response['Items'])
+        return items
+
+    def query_submissions_by_tier(
+        self,
+        tier: str,
+        projection: Optional[List[str]] = None,
+        exclusive_start_key: Optional[Dict] = None,
+        limit: Optional[int] = None,
+        newest_first: bool = True
+    ):
+        from boto3.dynamodb.conditions import Key
+
+        query_args = {
+            'IndexName': 'tier-ts-index',
+            'KeyConditionExpression': Key('tier').eq(tier),
+            'ScanIndexForward': not newest_first,
+        }
+        if limit is not None:
+            query_args['Limit'] = limit
+        if projection is not None:
+            # Attribute name placeholders avoid clashes with DynamoDB reserved words
+            query_args['ProjectionExpression'] = ', '.join(f'#p{i}' for i in range(len(projection)))
+            query_args['ExpressionAttributeNames'] = {f'#p{i}': name for i, name in enumerate(projection)}
+        if exclusive_start_key is not None:
+            query_args['ExclusiveStartKey'] = exclusive_start_key
+
+        return self.subs_table.query(**query_args)
+
     def upsert_submission(self, submission: Dict):
         self.subs_table.put_item(Item=submission)
 
+    def batch_upsert_submissions(self, submissions: List[Dict]):
+        """Writes submissions and their queue entries in batches of 25."""
+        with self.subs_table.batch_writer(overwrite_by_pkeys=['uuid']) as batch:
+            for submission in submissions:
+                batch.put_item(Item=submission)
+        with self.subs_q_table.batch_writer(overwrite_by_pkeys=['uuid']) as batch:
+            for submission in submissions:
+                batch.put_item(Item={
+                    'uuid': submission['uuid'],
+                    'ts': submission['ts']
+                })
+
     def upsert_submission_queue_entry(self, submission_queue_entry: Dict):
         self.subs_q_table.put_item(Item=submission_queue_entry)
 
+    def batch_complete_submission_reviews(self, submissions: List[Dict]):
+        """Writes reviewed submissions and removes their queue entries, in batches of 25."""
+        with self.subs_table.batch_writer(overwrite_by_pkeys=['uuid']) as batch:
+            for submission in submissions:
+                batch.put_item(Item=submission)
+        with self.subs_q_table.batch_writer(overwrite_by_pkeys=['uuid']) as batch:
+            for submission in submissions:
+                batch.delete_item(Key={'uuid': submission['uuid']})
+
     def delete_submission_queue_entry(self, submission_uuid: str):
         self.subs_q_table.delete_item(
             Key={
@@ -102,11 +208,73 @@ class DynamoDBClient:
         )
 
     def get_points_leaderboard(self, tier: str):
+        from boto3.dynamodb.conditions import Key
+
         response = self.ppts_table.query(
             KeyConditionExpression=Key('tier').eq(tier),
             ProjectionExpression='tier, member_id, total_points'
         )
         return response.get('Items', None)
 
+    def get_auth_cache_entry(self, token_hash: str):
+        response = self.auth_cache_table.get_item(
+            Key={
+                'token_hash': token_hash
+            }
+        )
+        return response.get('Item', None)
+
+    def put_auth_cache_entry(self, entry: Dict):
+        self.auth_cache_table.put_item(Item=entry)
+
+    def get_response_cache_entry(self, cache_key: str):
+        response = self.response_cache_table.get_item(
+            Key={
+                'cache_key': cache_key
+            }
+        )
+        return response.get('Item', None)
+
+    def put_response_cache_entry(self, entry: Dict):
+        self.response_cache_table.put_item(Item=entry)
+
+    def delete_response_cache_entry(self, cache_key: str):
+        self.response_cache_table.delete_item(
+            Key={
+                'cache_key': cache_key
+            }
+        )
+
+    def get_throttle_entry(self, throttle_key: str):
+        response = self.throttle_table.get_item(
+            Key={
+                'throttle_key': throttle_key
+            },
+            ConsistentRead=True
+        )
+        return response.get('Item', None)
+
+    def put_throttle_entry(self, entry: Dict, expected_updated_at: Optional[Decimal]) -> bool:
+        """
+        Writes a throttle bucket only if nobody else has updated it since it was read.
+        Returns False if the write lost that race.
+        """
+        if expected_updated_at is None:
+            condition = {'ConditionExpression': 'attribute_not_exists(throttle_key)'}
+        else:
+            condition = {
+                'ConditionExpression': 'updated_at = :prev',
+                'ExpressionAttributeValues': {':prev': expected_updated_at}
+            }
+        from botocore.exceptions import ClientError
+
+        try:
+            self.throttle_table.put_item(Item=entry, **condition)
+            return True
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                return False
+            raise
+
 
-DDB_CLIENT = DynamoDBClient()
+DDB_CLIENT: DynamoDBClient = LazyProxy(DynamoDBClient)
@@ -1,44 +1,232 @@
-import os
+# stdlib
+import re
 import time
-import requests
+import random
+import logging
+import threading
 from enum import Enum
-from typing import Optional, List
+from typing import Optional, List, Dict, Tuple, Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+# 3rd-party
+import requests
+from requests.adapters import HTTPAdapter
 
 # Local
 from acrossfc.core.config import FC_CONFIG
 
+LOG = logging.getLogger(__name__)
+
 DISCORD_API_BASE_URL = "https://discord.com/api/v10"
 APP_ID = FC_CONFIG.discord_app_id
 GUILD_ID = FC_CONFIG.discord_guild_id
-COMMON_HEADERS = {
-    "Authorization": f"Bot {FC_CONFIG.discord_bot_token}",
-    "Content-Type": "application/json"
-}
 
+# Path segments whose following ID is a "major parameter". Discord tracks rate limits separately
+# for each distinct channel / guild / webhook, even when the route is otherwise the same.
+# Interactions are keyed the same way so that callbacks for different interactions don't queue up
+# behind one another.
+# Ref: https://discord.com/developers/docs/topics/rate-limits
+_MAJOR_PARAM_SEGMENTS = {'channels', 'guilds', 'webhooks', 'interactions'}
+_TOKEN_PARAM_SEGMENTS = {'webhooks', 'interactions'}
+_ID_SEGMENT_RE = re.compile(r'^(\d+|[A-Za-z0-9_\-.]{32,})$')
+
+
+class _RateLimitBucket:
+    """Pacing state for a single Discord rate limit bucket."""
+    def __init__(self):
+        # Held for the duration of a request, so calls sharing a bucket are queued one after another
+        self.lock = threading.Lock()
+        self.remaining: Optional[int] = None
+        self.reset_at: float = 0.0
+
+    def wait(self):
+        if self.remaining == 0:
+            delay = self.reset_at - time.monotonic()
+            if delay > 0:
+                LOG.debug(f"Rate limit bucket exhausted. Waiting {delay:.2f}s...")
+                time.sleep(delay)
+            self.remaining = None
+
+    def update(self, headers):
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset_after = headers.get('X-RateLimit-Reset-After')
+        if remaining is not None:
+            self.remaining = int(remaining)
+        if reset_after is not None:
+            self.reset_at = time.monotonic() + float(reset_after)
+
+
+class DiscordClient:
+    """
+    Discord REST client with a pooled HTTP session and per-route rate limit handling.
+
+    Requests are paced per rate limit bucket (learned from the X-RateLimit-Bucket header), and
+    429 / 5xx responses are retried with backoff instead of being dropped.
+    """
+    def __init__(
+        self,
+        bot_token: str,
+        base_url: str = DISCORD_API_BASE_URL,
+        max_retries: int = 5,
+        backoff_base_s: float = 0.5,
+        pool_size: int = 16
+    ):
+        self.base_url = base_url
+        self.max_retries = max_retries
+        self.backoff_base_s = backoff_base_s
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            "Authorization": f"Bot {bot_token}",
+            "Content-Type": "application/json"
+        })
 
-def _call(requests_method, path, **kwargs):
-    url = os.path.join(DISCORD_API_BASE_URL, path)
-    headers = COMMON_HEADERS
-    resp = requests_method(url, headers=headers, **kwargs)
-    if resp.status_code >= 300:
-        raise Exception(f"API call failed {resp.status_code}: {resp.text}")
-    return resp
+        self._lock = threading.Lock()
+        # route key -> bucket hash reported by Discord
+        self._route_to_bucket_hash: Dict[str, str] = {}
+        # (bucket hash or route key, major params) -> bucket state
+        self._buckets: Dict[Tuple[str, str], _RateLimitBucket] = {}
+        self._global_reset_at: float = 0.0
+
+    @staticmethod
+    def _route_key(method: str, path: str) -> Tuple[str, str]:
+        """
+        Returns (route, major_params) for a request path, e.g.
+            ('PATCH webhooks/:id/:id/messages/@original', '123/abcd...')
+        """
+        route_parts = []
+        major_parts = []
+        segments = path.split('?')[0].strip('/').split('/')
+        for i, segment in enumerate(segments):
+            if _ID_SEGMENT_RE.match(segment):
+                previous = segments[i - 1] if i > 0 else None
+                # Webhook / interaction tokens are also part of the major parameter
+                is_token = i > 1 and segments[i - 2] in _TOKEN_PARAM_SEGMENTS
+                if previous in _MAJOR_PARAM_SEGMENTS or is_token:
+                    major_parts.append(segment)
+                route_parts.append(':id')
+            else:
+                route_parts.append(segment)
+        return f"{method} {'/'.join(route_parts)}", '/'.join(major_parts)
+
+    def _get_bucket(self, method: str, path: str) -> Tuple[str, _RateLimitBucket]:
+        route, major = self._route_key(method, path)
+        with self._lock:
+            bucket_id = self._route_to_bucket_hash.get(route, route)
+            bucket = self._buckets.get((bucket_id, major))
+            if bucket is None:
+                bucket = self._buckets[(bucket_id, major)] = _RateLimitBucket()
+        return route, bucket
+
+    def _learn_bucket(self, method: str, path: str, headers) -> _RateLimitBucket:
+        """Maps the route to the bucket hash Discord reported, sharing state with other routes in it."""
+        bucket_hash = headers.get('X-RateLimit-Bucket')
+        route, major = self._route_key(method, path)
+        with self._lock:
+            if bucket_hash is not None:
+                self._route_to_bucket_hash[route] = bucket_hash
+            bucket_id = self._route_to_bucket_hash.get(route, route)
+            bucket = self._buckets.get((bucket_id, major))
+            if bucket is None:
+                bucket = self._buckets[(bucket_id, major)] = _RateLimitBucket()
+        return bucket
+
+    def _wait_for_global_limit(self):
+        delay = self._global_reset_at - time.monotonic()
+        if delay > 0:
+            LOG.debug(f"Global rate limit hit. Waiting {delay:.2f}s...")
+            time.sleep(delay)
+
+    def _backoff(self, attempt: int) -> float:
+        return self.backoff_base_s * (2 ** attempt) + random.uniform(0, self.backoff_base_s)
+
+    @staticmethod
+    def _retry_after(resp) -> float:
+        retry_after = resp.headers.get('Retry-After')
+        try:
+            retry_after = resp.json().get('retry_after', retry_after)
+        except ValueError:
+            pass
+        return float(retry_after or 1)
+
+    def request(self, method: str, path: str, headers: Optional[Dict] = None, **kwargs):
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        route, bucket = self._get_bucket(method, path)
+
+        resp = None
+        with bucket.lock:
+            for attempt in range(self.max_retries + 1):
+                self._wait_for_global_limit()
+                bucket.wait()
+
+                try:
+                    resp = self.session.request(method, url, headers=headers, **kwargs)
+                except requests.ConnectionError as e:
+                    if attempt == self.max_retries:
+                        raise
+                    delay = self._backoff(attempt)
+                    LOG.warning(f"{route}: Connection error ({e}). Retrying in {delay:.2f}s...")
+                    time.sleep(delay)
+                    continue
+
+                learned_bucket = self._learn_bucket(method, path, resp.headers)
+                learned_bucket.update(resp.headers)
+                if learned_bucket is not bucket:
+                    bucket.update(resp.headers)
+
+                if resp.status_code == 429:
+                    delay = self._retry_after(resp)
+                    if resp.headers.get('X-RateLimit-Global') or resp.headers.get('X-RateLimit-Scope') == 'global':
+                        self._global_reset_at = time.monotonic() + delay
+                    else:
+                        bucket.remaining = 0
+                        bucket.reset_at = time.monotonic() + delay
+                    LOG.warning(f"{route}: Rate limited. Retrying in {delay:.2f}s...")
+                    continue
+                elif resp.status_code >= 500 and attempt < self.max_retries:
+                    delay = self._backoff(attempt)
+                    LOG.warning(f"{route}: Server error {resp.status_code}. Retrying in {delay:.2f}s...")
+                    time.sleep(delay)
+                    continue
+
+                break
+
+        if resp.status_code >= 300:
+            raise Exception(f"API call failed {resp.status_code}: {resp.text}")
+        return resp
+
+    def post(self, path, json={}):
+        return self.request('POST', path, json=json)
+
+    def patch(self, path, json={}):
+        return self.request('PATCH', path, json=json)
+
+    def get(self, path, params={}):
+        return self.request('GET', path, params=params)
+
+    def delete(self, path, params={}):
+        return self.request('DELETE', path, params=params)
+
+
+DISCORD_CLIENT = DiscordClient(bot_token=FC_CONFIG.discord_bot_token)
 
 
 def _post(path, json={}):
-    return _call(requests.post, path, json=json)
+    return DISCORD_CLIENT.post(path, json=json)
 
 
 def _patch(path, json={}):
-    return _call(requests.patch, path, json=json)
+    return DISCORD_CLIENT.patch(path, json=json)
 
 
 def _get(path, params={}):
-    return _call(requests.get, path, params=params)
+    return DISCORD_CLIENT.get(path, params=params)
 
 
 def _delete(path, params={}):
-    return _call(requests.delete, path, params=params)
+    return DISCORD_CLIENT.delete(path, params=params)
 
 
 def get_user(user_id):
@@ -60,9 +248,28 @@ def get_guild_member(user_id):
     return resp.json()
 
 
+def iter_guild_members(page_size: int = 1000) -> Iterator[Dict]:
+    """
+    Lazily yields every member of the guild, following the `after` cursor across pages.
+
+    The next page is requested in the background while the current one is being consumed, so
+    pages keep flowing while the client paces requests for the rate limit bucket.
+    """
+    def fetch_page(after: int):
+        return _get(f"guilds/{GUILD_ID}/members", params={'limit': page_size, 'after': after}).json()
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        page_future = executor.submit(fetch_page, 0)
+        while page_future is not None:
+            page = page_future.result()
+            page_future = None
+            if len(page) == page_size:
+                page_future = executor.submit(fetch_page, int(page[-1]['user']['id']))
+            yield from page
+
+
 def get_guild_members():
-    resp = _get(f"guilds/{GUILD_ID}/members?limit=500")
-    return resp.json()
+    return list(iter_guild_members())
 
 
 class InteractionResponseType(Enum):
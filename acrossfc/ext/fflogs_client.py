@@ -1,28 +1,22 @@
 # stdlib
 import re
 import logging
-from typing import Optional, List, Dict
+import threading
+from typing import TYPE_CHECKING, Optional, List, Dict, Tuple
 from datetime import datetime
 from urllib.parse import urlparse
 
 # 3rd-party
 import requests
-from gql import gql, Client
-from gql.transport.aiohttp import AIOHTTPTransport
 
 # Local
 from acrossfc.core.config import FC_CONFIG
-from acrossfc.core.model import (
-    Member,
-    TrackedEncounter,
-    Clear,
-    FFLogsFightData,
-)
-from acrossfc.core.constants import (
-    ALL_ENCOUNTERS,
-    ACTIVE_TRACKED_ENCOUNTERS,
-    NAME_TO_JOB_MAP,
-)
+from acrossfc.core.model import FFLogsFightData
+from acrossfc.utils import LazyProxy
+
+if TYPE_CHECKING:
+    from gql import Client
+    from acrossfc.core.model import Member, TrackedEncounter, Clear
 
 LOG = logging.getLogger(__name__)
 LOG.setLevel(logging.INFO)
@@ -32,8 +26,8 @@ class FFLogsAPIClient:
     def __init__(self, client_id: str, client_secret: str):
         self.client_id = client_id
         self.client_secret = client_secret
-        self._cached_roster: Optional[List[Member]] = None
-        self._cached_member_id_to_member_map: Optional[Dict[int, Member]] = None
+        self._cached_roster: Optional[List['Member']] = None
+        self._cached_member_id_to_member_map: Optional[Dict[int, 'Member']] = None
 
         resp = requests.post(
             "https://www.fflogs.com/oauth/token",
@@ -45,24 +39,37 @@ class FFLogsAPIClient:
                 "Unable to get authorization token from the FFLogs API.", resp.text
             )
 
-        access_token = resp.json()["access_token"]
-
-        # Select your transport with a defined url endpoint
-        gql_transport = AIOHTTPTransport(
-            url="https://www.fflogs.com/api/v2/client",
-            headers={"Authorization": f"Bearer {access_token}"},
-        )
+        self._access_token = resp.json()["access_token"]
+        self._thread_local = threading.local()
+
+    @property
+    def gql_client(self) -> 'Client':
+        """
+        GraphQL client for the current thread.
+        A gql client can only run one request at a time, so concurrent callers each get their own.
+        """
+        gql_client = getattr(self._thread_local, 'gql_client', None)
+        if gql_client is None:
+            from gql import Client
+            from gql.transport.aiohttp import AIOHTTPTransport
+
+            # Select your transport with a defined url endpoint
+            gql_transport = AIOHTTPTransport(
+                url="https://www.fflogs.com/api/v2/client",
+                headers={"Authorization": f"Bearer {self._access_token}"},
+            )
 
-        # Create a GraphQL client using the defined transport
-        self.gql_client = Client(
-            transport=gql_transport, fetch_schema_from_transport=True
-        )
+            # Create a GraphQL client using the defined transport
+            gql_client = self._thread_local.gql_client = Client(
+                transport=gql_transport, fetch_schema_from_transport=True
+            )
+        return gql_client
 
     def is_member_in_guild(self, member_id) -> bool:
         if self._cached_member_id_to_member_map is not None:
             return member_id in self._cached_member_id_to_member_map
         else:
-            query = gql(
+            query = _gql(
                 """
                 query getCharacterData($id: Int!) {
                     characterData {
@@ -81,12 +88,14 @@ class FFLogsAPIClient:
                 return False
             return FC_CONFIG.fflogs_guild_id in [g['id'] for g in c['guilds']]
 
-    def get_fc_roster(self) -> List[Member]:
+    def get_fc_roster(self) -> List['Member']:
         # Use cached value if possible
         if self._cached_roster is not None:
             return self._cached_roster
 
-        query = gql(
+        from acrossfc.core.model import Member
+
+        query = _gql(
             """
             query getGuildData($id: Int!) {
                 guildData {
@@ -114,9 +123,14 @@ class FFLogsAPIClient:
 
     def get_clears_for_member(
         self,
-        member: Member,
-        tracked_encounters: List[TrackedEncounter] = ACTIVE_TRACKED_ENCOUNTERS,
-    ) -> List[Clear]:
+        member: 'Member',
+        tracked_encounters: Optional[List['TrackedEncounter']] = None,
+    ) -> List['Clear']:
+        from acrossfc.core.model import Clear
+        from acrossfc.core.constants import ACTIVE_TRACKED_ENCOUNTERS, NAME_TO_JOB_MAP
+
+        if tracked_encounters is None:
+            tracked_encounters = ACTIVE_TRACKED_ENCOUNTERS
         LOG.info(f"Getting clear data for {member.name}...")
 
         # Query header
@@ -142,14 +156,14 @@ class FFLogsAPIClient:
                 }
             }"""
 
-        query = gql(query_str)
+        query = _gql(query_str)
         result = self.gql_client.execute(query, variable_values={"id": member.fcid})
 
-        clears: List[Clear] = []
+        clears: List['Clear'] = []
 
         for i, boss_name in enumerate(result["characterData"]["character"]):
             # This assumes results are returned in the same order as given above
-            encounter: TrackedEncounter = tracked_encounters[i]
+            encounter: 'TrackedEncounter' = tracked_encounters[i]
             boss_kill_data = result["characterData"]["character"][boss_name]
             if "error" in boss_kill_data:
                 LOG.info(f"Unable to get kill data for {member.name}: {boss_kill_data['error']}")
@@ -179,67 +193,101 @@ class FFLogsAPIClient:
         return clears
 
     def get_fight_data(self, fflogs_url: str) -> FFLogsFightData:
-        parts = urlparse(fflogs_url)
-        report_id_match = re.match(r'.*/reports/(.*)$', parts.path)
-        if not report_id_match:
-            raise ValueError(f"FFLogs URL path does not match r'/reports/(.*)$'. Received: {fflogs_url}")
-
-        report_id = report_id_match.groups()[0]
-
-        fight_id_match = re.match(r'fight=(\d+)', parts.fragment)
-        if not fight_id_match:
-            raise ValueError(f"FFLogs URL fragment does not match r'fight=(\\d+)'. Received: {fflogs_url}")
-
-        fight_id = int(fight_id_match.groups()[0])
-
+        report_id, fight_id = parse_fflogs_url(fflogs_url)
         LOG.info(f"Getting fight data for report {report_id}, fight {fight_id}...")
-
-        # Query header
-        query_str = """
-            query getReportData($report_id: String!, $fight_id: Int!) {
-                reportData {
-                    report(code: $report_id) {
+        return self.get_report_fight_data(report_id, [fight_id])[fight_id]
+
+    def get_report_fight_data(self, report_id: str, fight_ids: List[int]) -> Dict[int, Optional[FFLogsFightData]]:
+        """
+        Gets the data for several fights of the same report in a single query.
+        Fights for encounters that aren't tracked map to None.
+        """
+        # Player details are aggregated across all requested fights, so each fight gets its own aliased field
+        player_details_fields = "\n".join(
+            f"players_{fight_id}: playerDetails(fightIDs: [{int(fight_id)}])"
+            for fight_id in fight_ids
+        )
+        query_str = f"""
+            query getReportData($report_id: String!, $fight_ids: [Int]!) {{
+                reportData {{
+                    report(code: $report_id) {{
                         startTime,
-                        fights(fightIDs: [$fight_id]) {
+                        fights(fightIDs: $fight_ids) {{
+                            id,
                             encounterID,
                             difficulty,
                             startTime
-                        }
-                        playerDetails(fightIDs: [$fight_id])
-                    }
-                }
-            }
+                        }}
+                        {player_details_fields}
+                    }}
+                }}
+            }}
             """
-        query = gql(query_str)
-        result = self.gql_client.execute(query, variable_values={"report_id": report_id, "fight_id": fight_id})
-        report_start_time_ms = result["reportData"]["report"]["startTime"]
-        fight_data = result["reportData"]["report"]["fights"][0]
-        encounter_id = fight_data["encounterID"]
-        difficulty_id = fight_data["difficulty"]
-        fight_start_time_relative_ms = fight_data["startTime"]
-        start_time = datetime.fromtimestamp(
-            # Python takes in seconds, API returns milliseconds
-            (report_start_time_ms + fight_start_time_relative_ms)
-            / 1000
-        )
-        player_details = result["reportData"]["report"]["playerDetails"]["data"]["playerDetails"]
-        player_names = [player["name"] for role in player_details for player in player_details[role]]
-
-        # Match encounter
-        for e in ALL_ENCOUNTERS:
-            if (
-                encounter_id == e.encounter_id and
-                (
-                    e.difficulty_id is None or
-                    difficulty_id == e.difficulty_id
-                )
-            ):
-                return FFLogsFightData(report_id, e, start_time, player_names)
+        query = _gql(query_str)
+        result = self.gql_client.execute(query, variable_values={"report_id": report_id, "fight_ids": fight_ids})
+        report = result["reportData"]["report"]
+        report_start_time_ms = report["startTime"]
+
+        from acrossfc.core.constants import ALL_ENCOUNTERS
+
+        ret: Dict[int, Optional[FFLogsFightData]] = {fight_id: None for fight_id in fight_ids}
+        for fight_data in report["fights"]:
+            fight_id = fight_data["id"]
+            encounter_id = fight_data["encounterID"]
+            difficulty_id = fight_data["difficulty"]
+            fight_start_time_relative_ms = fight_data["startTime"]
+            start_time = datetime.fromtimestamp(
+                # Python takes in seconds, API returns milliseconds
+                (report_start_time_ms + fight_start_time_relative_ms)
+                / 1000
+            )
+            player_details = report[f"players_{fight_id}"]["data"]["playerDetails"]
+            player_names = [player["name"] for role in player_details for player in player_details[role]]
+
+            # Match encounter
+            for e in ALL_ENCOUNTERS:
+                if (
+                    encounter_id == e.encounter_id and
+                    (
+                        e.difficulty_id is None or
+                        difficulty_id == e.difficulty_id
+                    )
+                ):
+                    ret[fight_id] = FFLogsFightData(report_id, e, start_time, player_names)
+                    break
+
+        return ret
+
+
+def parse_fflogs_url(fflogs_url: str) -> Tuple[str, int]:
+    """Returns (report ID, fight ID) from an FFLogs report URL."""
+    parts = urlparse(fflogs_url)
+    report_id_match = re.match(r'.*/reports/(.*)$', parts.path)
+    if not report_id_match:
+        raise ValueError(f"FFLogs URL path does not match r'/reports/(.*)$'. Received: {fflogs_url}")
+
+    report_id = report_id_match.groups()[0]
+
+    fight_id_match = re.match(r'fight=(\d+)', parts.fragment)
+    if not fight_id_match:
+        raise ValueError(f"FFLogs URL fragment does not match r'fight=(\\d+)'. Received: {fflogs_url}")
+
+    fight_id = int(fight_id_match.groups()[0])
+    return report_id, fight_id
+
+
+def _gql(query_str: str):
+    # gql (and aiohttp under it) is only imported once a query is actually made
+    from gql import gql
+    return gql(query_str)
+
 
-        return None
+def _build_fflogs_client() -> FFLogsAPIClient:
+    return FFLogsAPIClient(
+        client_id=FC_CONFIG.fflogs_client_id,
+        client_secret=FC_CONFIG.fflogs_client_secret,
+    )
 
 
-FFLOGS_CLIENT = FFLogsAPIClient(
-    client_id=FC_CONFIG.fflogs_client_id,
-    client_secret=FC_CONFIG.fflogs_client_secret,
-)
+# Built, and the OAuth token fetched, on first use rather than at import
+FFLOGS_CLIENT: FFLogsAPIClient = LazyProxy(_build_fflogs_client)
@@ -1,9 +1,8 @@
 # stdlib
 import os
 
-# 3rd-party
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
+# Local
+from acrossfc.utils import LazyProxy
 
 # Scopes required to access Google Sheets API
 _SCOPES = [
@@ -14,6 +13,10 @@ _SCOPES = [
 
 class GoogleCloudClient:
     def __init__(self, gc_creds_filename: str):
+        # The Google API client is slow to import and only the roster ETL needs it
+        from google.oauth2 import service_account
+        from googleapiclient.discovery import build
+
         # Authenticate with Google Sheets and Drive APIs
         creds = service_account.Credentials.from_service_account_file(
             gc_creds_filename, scopes=_SCOPES
@@ -31,4 +34,10 @@ class GoogleCloudClient:
 
 
 gc_creds_filename = os.environ.get('AX_GC_CREDS', '.gc_creds.json')
-GC_CLIENT = GoogleCloudClient(gc_creds_filename=gc_creds_filename)
+
+
+def _build_gc_client() -> GoogleCloudClient:
+    return GoogleCloudClient(gc_creds_filename=gc_creds_filename)
+
+
+GC_CLIENT: GoogleCloudClient = LazyProxy(_build_gc_client)
@@ -1,20 +1,89 @@
+import json
+import threading
+import dataclasses
 from enum import Enum
+from decimal import Decimal
+from typing import Any, Callable
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 
 def to_enum(cls, val):
     """Convenience method to take in any value type and try to turn it into an Enum instance"""
     assert issubclass(cls, Enum)
-    if val in cls:
+    # Not `val in cls`: before Python 3.12 that raises TypeError for anything but a member
+    if val in cls._value2member_map_:
         return cls(val)
     elif val in cls.__members__:
         return cls[val]
     elif type(val) is cls:
         return cls(val)
-    elif (type(val) is str) and val.isdigit() and ((v := int(val)) in cls):
+    elif (type(val) is str) and val.isdigit() and ((v := int(val)) in cls._value2member_map_):
         return cls(v)
     else:
         raise ValueError(f"Unable to convert {val} into an instance of {cls}")
 
 
+def json_default(obj):
+    """
+    `default` hook for JSON encoders. Handles the types that come back from DynamoDB and our models,
+    so payloads can be serialised in a single pass without copying them first.
+    """
+    if isinstance(obj, Decimal):
+        # DynamoDB returns every number as a Decimal. Keep integers as integers, but don't truncate fractions.
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    elif isinstance(obj, Enum):
+        return obj.value
+    elif dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        # Shallow: nested values go back through the encoder (and this hook) as it walks the result
+        return {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj)}
+    elif isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_dumps(obj) -> str:
+    """Serialises obj to a JSON string, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=json_default, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(obj, default=json_default)
+
+
+class LazyProxy:
+    """
+    Stands in for a module-level singleton and only builds it, with factory(), on first attribute access.
+    Modules can keep exporting e.g. DDB_CLIENT, while code paths that never touch it don't pay for building it.
+    """
+    def __init__(self, factory: Callable[[], Any]):
+        object.__setattr__(self, '_factory', factory)
+        object.__setattr__(self, '_instance', None)
+        object.__setattr__(self, '_lock', threading.Lock())
+
+    @property
+    def is_initialized(self) -> bool:
+        return self._instance is not None
+
+    def get_instance(self) -> Any:
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    object.__setattr__(self, '_instance', self._factory())
+        return self._instance
+
+    def __getattr__(self, name):
+        return getattr(self.get_instance(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self.get_instance(), name, value)
+
+    def __repr__(self):
+        if self._instance is None:
+            return f"<LazyProxy for {getattr(self._factory, '__qualname__', self._factory)} (not built)>"
+        return repr(self._instance)
+
+
 def setup_utils():
     Enum.to_enum = classmethod(to_enum)
@@ -0,0 +1,98 @@
+# stdlib
+import os
+import time
+import logging
+from typing import Callable, Dict, Iterable, Optional
+
+LOG = logging.getLogger(__name__)
+
+# Scheduled warm-up events are plain JSON like {"ax_warmup": true}, optionally with "steps": [...]
+WARMUP_EVENT_KEY = 'ax_warmup'
+
+
+def _prime_fflogs():
+    # Building the client fetches the OAuth token
+    from acrossfc.ext.fflogs_client import FFLOGS_CLIENT
+    FFLOGS_CLIENT.get_instance()
+
+
+def _prime_ddb():
+    # Any cheap read opens the (pooled) TLS connection to DynamoDB
+    from acrossfc.core.config import FC_CONFIG
+    from acrossfc.ext.ddb_client import DDB_CLIENT
+    DDB_CLIENT.get_member_points(FC_CONFIG.current_submissions_tier, 0)
+
+
+def _prime_roster():
+    from acrossfc.api.fc_roster import get_fc_roster
+    get_fc_roster()
+
+
+def _prime_cleardb():
+    # Downloads (or revalidates) the latest ClearDB into the local cache and keeps it open
+    from acrossfc.core.database import ClearDatabase, LATEST
+    ClearDatabase.open(LATEST).get_fc_roster()
+
+
+PRIME_STEPS: Dict[str, Callable[[], None]] = {
+    'fflogs': _prime_fflogs,
+    'ddb': _prime_ddb,
+    'roster': _prime_roster,
+    'cleardb': _prime_cleardb,
+}
+
+# Run when no steps are given. cleardb is opt-in, since only Lambdas that query ClearDB want the download.
+DEFAULT_PRIME_STEPS = ['fflogs', 'ddb', 'roster']
+
+
+def prime(steps: Optional[Iterable[str]] = None) -> Dict[str, Dict]:
+    """
+    Runs the given priming steps (DEFAULT_PRIME_STEPS by default), in order, and returns how long each took.
+    A failing step is logged and reported but doesn't stop the others.
+    """
+    results = {}
+    for step in (steps if steps is not None else DEFAULT_PRIME_STEPS):
+        if step not in PRIME_STEPS:
+            LOG.warning(f"Unknown warm-up step {step}, skipping.")
+            continue
+        start = time.perf_counter()
+        ok = True
+        try:
+            PRIME_STEPS[step]()
+        except Exception as e:
+            LOG.error(f"Warm-up step {step} failed: {e}")
+            ok = False
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        LOG.info(f"Warm-up step {step} took {elapsed_ms:.1f}ms{'' if ok else ' (failed)'}.")
+        results[step] = {'ok': ok, 'elapsed_ms': round(elapsed_ms, 1)}
+    return results
+
+
+def is_warmup_event(event) -> bool:
+    """
+    True for scheduled warm-up invocations. HTTP requests always carry a requestContext and keep
+    their payload under 'body', so callers of the public endpoints can't pass themselves off as one.
+    """
+    return (
+        isinstance(event, dict)
+        and event.get(WARMUP_EVENT_KEY, False) is True
+        and 'requestContext' not in event
+    )
+
+
+def handle_warmup_event(event) -> Dict:
+    steps = event.get('steps', None)
+    return {'warmup': True, 'steps': prime(steps)}
+
+
+def prime_on_init():
+    """
+    Opt-in priming during the Lambda init phase, controlled by AX_PREWARM:
+    unset / 0 disables it, 1 / true / all runs the default steps, or give a comma-separated list of steps.
+    """
+    setting = os.environ.get('AX_PREWARM', '').strip().lower()
+    if setting in ('', '0', 'false', 'no'):
+        return None
+    if setting in ('1', 'true', 'yes', 'all'):
+        return prime()
+    return prime([step.strip() for step in setting.split(',') if step.strip() != ''])
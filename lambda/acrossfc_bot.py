@@ -1,14 +1,19 @@
 import re
 import json
+import math
 import logging
 
 # Local
 from acrossfc import ANALYTICS_LOG
 from acrossfc.core.config import FC_CONFIG
 from acrossfc.api.submissions import SubmissionsChannel, submit_fflogs
+from acrossfc.api.throttle import SubmissionThrottled
 from acrossfc.ext.discord_client import Interaction
 from acrossfc.ext.ddb_client import DDB_CLIENT
 from acrossfc.ext.fflogs_client import FFLOGS_CLIENT
+from acrossfc.warmup import is_warmup_event, handle_warmup_event, prime_on_init
+
+prime_on_init()
 
 
 def validate_request(event):
@@ -123,6 +128,11 @@ SUBMISSION_SUCCESSFUL_MSG = """
 
 Any available points will be awarded within 48 hours. In the meantime, you can use `/fc_points` to see how many points you have.
 """ 
+SUBMISSION_THROTTLED_MSG = """
+:hourglass: **Slow down**
+
+You've submitted a lot of logs recently. Please try again in {retry_after}.
+"""
 SUBMISSION_ERROR_MSG = """
 :warning: **Server Error**
 
@@ -132,6 +142,12 @@ Please contact <@795916443891531786> immediately.
 """
 
 
+def _format_wait(seconds: int) -> str:
+    if seconds < 60:
+        return f"{seconds} s"
+    return f"{math.ceil(seconds / 60)} min"
+
+
 def handle_submit_fflogs_submission(body, interaction: Interaction, discord_user_id):
     interaction.thinking()
     fflogs_url = body['data']['components'][0]['components'][0]['value']
@@ -145,12 +161,17 @@ def handle_submit_fflogs_submission(body, interaction: Interaction, discord_user
                 'discord_global_name': body['member']['user']['global_name']
             }, SubmissionsChannel.FC_BOT_FFLOGS, False, False, None)
             interaction.update_msg(SUBMISSION_SUCCESSFUL_MSG)
+        except SubmissionThrottled as e:
+            interaction.update_msg(SUBMISSION_THROTTLED_MSG.format(retry_after=_format_wait(e.retry_after_s)))
         except Exception as e:
             logging.error(f"[INTERACTION ID: {interaction.interaction_id}] Exception while submitting FFLogs: {e}")
             interaction.update_msg(SUBMISSION_ERROR_MSG + f"\n(IID: {interaction.interaction_id})")
 
 
 def lambda_handler(event, context):
+    if is_warmup_event(event):
+        return handle_warmup_event(event)
+
     if not validate_request(event):
         return {
             'statusCode': 401
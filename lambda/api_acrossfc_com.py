@@ -1,20 +1,25 @@
 # stdlib
 import os
-import re
+import gzip
 import json
 import hmac
+import base64
 import hashlib
-import requests
-from typing import Optional, Dict
-from decimal import Decimal
-from collections.abc import MutableMapping, MutableSequence
+from typing import Optional, Dict, Set
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 # Local
 from acrossfc import ROOT_LOG as LOG
-from acrossfc.api import submissions, participation_points, fc_roster
-from acrossfc.core.model import PointsCategory
+from acrossfc.api.auth import authorize_discord_access_token
+from acrossfc.api.routes import ROUTER, RouteNotFound, MethodNotAllowed, InvalidParameter
+from acrossfc.api.throttle import SubmissionThrottled
 from acrossfc.core.config import FC_CONFIG
-from acrossfc.ext.ddb_client import DDB_CLIENT
+from acrossfc.utils import json_dumps
+from acrossfc.warmup import is_warmup_event, handle_warmup_event, prime_on_init
 
 ALLOWED_HEADER_NAMES = [
     'Content-Type',
@@ -23,41 +28,116 @@ ALLOWED_HEADER_NAMES = [
     'X-Api-Key',
     'X-Amz-Security-Token',
     'X-AX-DACCESS-TOKEN',
-    'X-AX-DBOT-TOKEN'
+    'X-AX-DBOT-TOKEN',
+    'If-None-Match'
 ]
 COMMON_HEADERS = {
     'Access-Control-Allow-Headers': ','.join(ALLOWED_HEADER_NAMES),
     'Access-Control-Allow-Origin': FC_CONFIG.cors_allow_origin,
-    'Access-Control-Allow-Methods': 'OPTIONS,POST,GET'
+    'Access-Control-Allow-Methods': 'OPTIONS,POST,GET',
+    'Access-Control-Expose-Headers': 'ETag,Retry-After'
 }
+# Bodies smaller than this aren't worth compressing
+MIN_COMPRESS_BYTES = 1024
+
+# Runs during the Lambda init phase when AX_PREWARM is set
+prime_on_init()
 
 
-def response(status_code: int, msg: Optional[str] = None, data: Optional[Dict] = None):
+def response(
+    status_code: int,
+    msg: Optional[str] = None,
+    data: Optional[Dict] = None,
+    request_headers: Optional[Dict] = None,
+    extra_headers: Optional[Dict] = None
+):
+    """
+    Builds an API Gateway response.
+
+    When the request headers are given, successful responses are treated as cacheable: they carry a
+    strong ETag, become a 304 if it matches If-None-Match, and are gzip / brotli encoded if accepted.
+    """
     body = msg
     headers = COMMON_HEADERS
     if data is not None:
-        body = json.dumps(convert_decimals_to_int(data))
+        body = json_dumps(data)
         headers = COMMON_HEADERS | {'Content-Type': 'application/json'}
+    if extra_headers is not None:
+        headers = headers | extra_headers
+
+    if request_headers is None or status_code != 200 or body is None:
+        return {
+            'statusCode': status_code,
+            'headers': headers,
+            'body': body
+        }
+
+    body_bytes = body.encode('utf-8')
+    etag = hashlib.sha256(body_bytes).hexdigest()[:32]
+    headers = headers | {
+        'Cache-Control': 'private, no-cache',
+        'Vary': 'Accept-Encoding'
+    }
+
+    if etag in _parse_if_none_match(request_headers.get('if-none-match')):
+        return {
+            'statusCode': 304,
+            'headers': headers | {'ETag': f'"{etag}"'}
+        }
+
+    encoding = _choose_encoding(request_headers.get('accept-encoding'))
+    if encoding is None or len(body_bytes) < MIN_COMPRESS_BYTES:
+        return {
+            'statusCode': status_code,
+            'headers': headers | {'ETag': f'"{etag}"'},
+            'body': body
+        }
+
+    if encoding == 'br':
+        encoded = brotli.compress(body_bytes, quality=5)
+    else:
+        encoded = gzip.compress(body_bytes, compresslevel=6)
 
     return {
         'statusCode': status_code,
-        'headers': headers,
-        'body': body
+        # Strong ETags must differ between encodings of the same representation
+        'headers': headers | {'ETag': f'"{etag}-{encoding}"', 'Content-Encoding': encoding},
+        'body': base64.b64encode(encoded).decode('ascii'),
+        'isBase64Encoded': True
     }
 
 
-def convert_decimals_to_int(obj):
-    """
-    Recursively converts all Decimal instances in a given object to integers.
-    """
-    if isinstance(obj, MutableMapping):  # If obj is a dictionary
-        return {k: convert_decimals_to_int(v) for k, v in obj.items()}
-    elif isinstance(obj, MutableSequence):  # If obj is a list
-        return [convert_decimals_to_int(i) for i in obj]
-    elif isinstance(obj, Decimal):  # If obj is a Decimal
-        return int(obj)
-    else:
-        return obj
+def _parse_if_none_match(value: Optional[str]) -> Set[str]:
+    """Returns the identity ETags listed in If-None-Match, ignoring weak prefixes and encoding suffixes."""
+    if value is None:
+        return set()
+    etags = set()
+    for tag in value.split(','):
+        tag = tag.strip()
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        tag = tag.strip('"')
+        for suffix in ('-gzip', '-br'):
+            if tag.endswith(suffix):
+                tag = tag[:-len(suffix)]
+        etags.add(tag)
+    return etags
+
+
+def _choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    if accept_encoding is None:
+        return None
+    accepted = set()
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        if params.replace(' ', '') in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            continue
+        accepted.add(coding.strip().lower())
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
 
 
 def verify_bot_signature(data, signature) -> bool:
@@ -70,29 +150,23 @@ def verify_bot_signature(data, signature) -> bool:
 
 
 def lambda_handler(event, context):
+    if is_warmup_event(event):
+        return handle_warmup_event(event)
+
     http_method = event['requestContext']['http']['method']
     if http_method == 'OPTIONS':
         return response(204)
 
     raw_path = event['rawPath']
-    PATH = raw_path.split('/')[1:]
     qs_params = event.get('queryStringParameters', {})
 
     # BEGIN Auth ------------------------
+    caller_discord_id = None
     if 'x-ax-daccess-token' in event['headers']:
-        token = f"Bearer {event['headers']['x-ax-daccess-token']}"
-        d_resp = requests.get("https://discord.com/api/v10/users/@me", headers={
-            'Authorization': token
-        })
-        if d_resp.status_code != 200:
-            LOG.error(f"Error while trying to authorize with Discord. {d_resp.text}")
-            return response(401)
-
-        discord_id = d_resp.json()['id']
-        discord_name = d_resp.json()['username']
-        if discord_id not in FC_CONFIG.allowed_discord_id_list:
-            LOG.warn(f"Discord user {discord_name} ({discord_id}) tried to access the API.")
-            return response(403)
+        auth = authorize_discord_access_token(event['headers']['x-ax-daccess-token'])
+        if auth.status_code != 200:
+            return response(auth.status_code)
+        caller_discord_id = auth.discord_id
     elif 'x-ax-bot-signature' in event['headers']:
         if not verify_bot_signature(event['body'], event['headers']['x-ax-bot-signature']):
             LOG.warn(f"Failed to verify bot signature. Request rejected. {event}")
@@ -102,63 +176,26 @@ def lambda_handler(event, context):
 
     # END Auth ------------------------
 
-    if PATH[0] == "fc_roster":
-        data = fc_roster.get_fc_roster()
-        return response(200, data=data)
-
-    if PATH[0] == "current_tier":
-        data = submissions.get_current_submissions_tier()
-        return response(200, data=data)
-
-    if PATH[0] == "submissions":
-        if http_method == 'GET':
-            if len(PATH) == 1:
-                # DDB Scan, paginated
-                subs = submissions.get_submissions_for_tier(**qs_params)
-                return response(200, data=subs)
-            elif PATH[1] == "queue":
-                queue = submissions.get_submissions_queue()
-                return response(200, data=queue)
-            elif (m := re.fullmatch(r'^/submissions/([a-zA-Z0-9-]+)$', raw_path)):
-                sub_uuid = m.groups()[0]
-                sub = DDB_CLIENT.get_submission_by_uuid(sub_uuid)
-                return response(200, data=sub)
-        elif http_method == 'POST':
-            data_str = event.get('body', None)
-            data = json.loads(data_str) if data_str is not None else {}
-            if PATH[1] == "review":
-                data = submissions.review_submission(**data)
-                return response(200, data=data)
-            elif PATH[1] == "fflogs":
-                submissions.submit_fflogs(**data)
-                return response(200)
-
-    if PATH[0] == "ppts":
-        if http_method == 'GET':
-            if len(PATH) == 1:
-                if 'member_id' in qs_params:
-                    # TODO: Figure out a cleaner solution
-                    qs_params['member_id'] = int(qs_params['member_id'])
-                    data = participation_points.get_points_for_member(**qs_params)
-                    return response(200, data=data)
-            elif PATH[1] == "leaderboard":
-                data = participation_points.get_points_leaderboard(**qs_params)
-                return response(200, data=data)
-            elif PATH[1] == "table":
-                data = [
-                    {
-                        'category_id': category.value,
-                        'name': category.name,
-                        'description': category.description,
-                        'constraints': category.constraints,
-                        'points': category.points
-                    }
-                    for category in PointsCategory
-                ]
-                return response(200, data=data)
-
-    data = None
-    if os.environ.get('AX_ENV') == "TEST":
-        data = event
-
-    return response(404, data=data)
+    data_str = event.get('body', None)
+    body = json.loads(data_str) if data_str else None
+    try:
+        data = ROUTER.dispatch(http_method, raw_path, qs_params, body, caller_discord_id=caller_discord_id)
+    except MethodNotAllowed as e:
+        return response(405, extra_headers={'Allow': ', '.join(e.allowed_methods)})
+    except RouteNotFound:
+        data = None
+        if os.environ.get('AX_ENV') == "TEST":
+            data = event
+        return response(404, data=data)
+    except InvalidParameter as e:
+        return response(400, msg=str(e))
+    except SubmissionThrottled as e:
+        return response(
+            429,
+            data={'error': str(e), 'retry_after_s': e.retry_after_s},
+            extra_headers={'Retry-After': str(e.retry_after_s)}
+        )
+
+    if http_method == 'GET':
+        return response(200, data=data, request_headers=event['headers'])
+    return response(200, data=data)
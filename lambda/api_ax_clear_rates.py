@@ -1,8 +1,13 @@
 import json
 import boto3
 
+from acrossfc.warmup import is_warmup_event
+
 
 def lambda_handler(event, context):
+    if is_warmup_event(event):
+        return {'warmup': True}
+
     # Initialize a DynamoDB client
     dynamodb = boto3.client('dynamodb')
 
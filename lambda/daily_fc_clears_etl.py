@@ -1,6 +1,10 @@
 from acrossfc.etl.fc_clears_etl import fc_clears_etl
+from acrossfc.warmup import is_warmup_event
 
 
 def lambda_handler(event, context):
+    if is_warmup_event(event):
+        return {'warmup': True}
+
     fc_clears_etl()
     return "Completed successfuly."
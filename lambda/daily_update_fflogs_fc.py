@@ -1,6 +1,10 @@
 from acrossfc.etl.update_fflogs_fc import update_fflogs_fc
+from acrossfc.warmup import is_warmup_event
 
 
 def lambda_handler(event, context):
+    if is_warmup_event(event):
+        return {'warmup': True}
+
     update_fflogs_fc()
     return "Completed successfully."
@@ -1,6 +1,10 @@
 from acrossfc.etl.fc_roster_etl import fc_roster_etl
+from acrossfc.warmup import is_warmup_event
 
 
 def lambda_handler(event, context):
+    if is_warmup_event(event):
+        return {'warmup': True}
+
     fc_roster_etl()
     return "Completed successfuly."
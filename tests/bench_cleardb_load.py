@@ -0,0 +1,64 @@
+"""
+Benchmarks building a ClearDatabase with bulk_load (in-memory, one transaction, executemany, backup to file)
+against the peewee bulk_create path, for an FC-sized roster.
+
+    python tests/bench_cleardb_load.py [--members 300] [--clears-per-member 150]
+
+No .fcconfig is needed: the script sets up the tests' config the same way pytest does.
+"""
+# stdlib
+import os
+import time
+import random
+import argparse
+from datetime import datetime, timedelta
+
+# Local
+# Sets up the same throwaway FC config as the tests (unless AX_FC_CONFIG points at one), before acrossfc loads it
+import conftest  # noqa: F401
+from acrossfc.core.database import ClearDatabase
+from acrossfc.core.model import Member, Clear
+from acrossfc.core.constants import ALL_ENCOUNTERS, JOBS
+
+
+def make_roster(num_members: int, clears_per_member: int):
+    rng = random.Random(0)
+    members = [Member(fcid=i, name=f"Member {i}", rank=rng.randint(1, 8)) for i in range(num_members)]
+    start = datetime(2024, 1, 1)
+    clears = [
+        Clear(
+            member=member,
+            encounter=rng.choice(ALL_ENCOUNTERS),
+            start_time=start + timedelta(minutes=rng.randint(0, 365 * 24 * 60)),
+            historical_pct=rng.random() * 100,
+            report_code=f"report{member.fcid}_{i}",
+            report_fight_id=rng.randint(1, 40),
+            job=rng.choice(JOBS),
+            locked_in=True
+        )
+        for member in members
+        for i in range(clears_per_member)
+    ]
+    return members, clears
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--members', type=int, default=300)
+    parser.add_argument('--clears-per-member', type=int, default=150)
+    args = parser.parse_args()
+
+    members, clears = make_roster(args.members, args.clears_per_member)
+    print(f"{len(members)} members, {len(clears)} clears")
+
+    for name, bulk_load in (('bulk_create (peewee, file)', False), ('bulk_load (memory + backup)', True)):
+        start = time.perf_counter()
+        db = ClearDatabase.from_fflogs(members, clears, bulk_load=bulk_load)
+        elapsed_s = time.perf_counter() - start
+        size_kb = os.path.getsize(db.db_filename) / 1024
+        print(f"{name:<30} {elapsed_s:8.3f} s  ({size_kb:,.0f} KiB)")
+        os.remove(db.db_filename)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmarks JSON encoding of a realistic /submissions page (DynamoDB items full of Decimals).
+
+    python tests/bench_json_encoding.py
+"""
+# stdlib
+import json
+import uuid
+import timeit
+from decimal import Decimal
+from collections.abc import MutableMapping, MutableSequence
+
+# Local
+from acrossfc import utils
+from acrossfc.utils import json_default, json_dumps
+
+
+def legacy_convert_decimals_to_int(obj):
+    """The recursive copy that API responses used to go through before json.dumps."""
+    if isinstance(obj, MutableMapping):
+        return {k: legacy_convert_decimals_to_int(v) for k, v in obj.items()}
+    elif isinstance(obj, MutableSequence):
+        return [legacy_convert_decimals_to_int(i) for i in obj]
+    elif isinstance(obj, Decimal):
+        return int(obj)
+    else:
+        return obj
+
+
+def make_submissions_page(num_submissions: int = 100, num_points_events: int = 8):
+    return {
+        'items': [
+            {
+                'uuid': str(uuid.uuid4()),
+                'ts': Decimal(1718000000 + i),
+                'submitted_by': {
+                    'discord_user_id': Decimal(795916443891531786),
+                    'discord_server_name': 'Some Member',
+                    'discord_global_name': 'some_member',
+                },
+                'submission_channel': Decimal(2),
+                'submission_type': Decimal(1),
+                'is_fc_pf': False,
+                'is_static': False,
+                'fc_pf_id': None,
+                'fflogs_url': 'https://www.fflogs.com/reports/W9VNKackfztR13g2#fight=16',
+                'fight_signature': Decimal(-4417593729873223442),
+                'tier': '7_0',
+                'points_events': [
+                    {
+                        'uuid': str(uuid.uuid4()),
+                        'member_id': Decimal(19000000 + j),
+                        'points': Decimal(10),
+                        'category': Decimal(202),
+                        'description': 'FC Savage: P9S',
+                        'ts': Decimal(1718000000 + i),
+                        'status': Decimal(0),
+                    }
+                    for j in range(num_points_events)
+                ],
+                'evaluator_notes': [
+                    'Not an FC PF ticket. No FC PF event participation points awarded.',
+                ],
+                'last_update_ts': None,
+                'last_update_by': None,
+                'notes': None,
+            }
+            for i in range(num_submissions)
+        ],
+        'count': Decimal(num_submissions),
+    }
+
+
+def main():
+    page = make_submissions_page()
+    number = 200
+
+    candidates = {
+        'legacy (convert_decimals_to_int + json.dumps)': lambda: json.dumps(legacy_convert_decimals_to_int(page)),
+        'json.dumps(default=json_default)': lambda: json.dumps(page, default=json_default),
+    }
+    if utils.orjson is not None:
+        candidates['json_dumps (orjson)'] = lambda: json_dumps(page)
+
+    print(f"Payload: {len(json_dumps(page))} bytes, {number} iterations")
+    for name, func in candidates.items():
+        seconds = timeit.timeit(func, number=number)
+        print(f"{name:<48} {seconds / number * 1000:8.3f} ms/op")
+
+
+if __name__ == '__main__':
+    main()
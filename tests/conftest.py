@@ -0,0 +1,236 @@
+# stdlib
+import os
+import copy
+import tempfile
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+
+# 3rd-party
+import pytest
+
+# Enough config for every module to import. Nothing here points at a real service.
+TEST_FC_CONFIG = """
+[DEFAULT]
+fflogs_client_id = test
+fflogs_client_secret = test
+fflogs_guild_id = 1
+s3_cleardb_bucket_name = test
+current_submissions_tier = 7_0
+cors_allow_origin = *
+allowed_discord_id_list = []
+il_palazzo_key = test
+discord_app_public_key = 00
+discord_app_id = 1
+discord_bot_token = test
+discord_guild_id = 1
+ddb_participation_points_table = test
+ddb_submissions_table = test
+ddb_submissions_queue_table = test
+ddb_members_table = test
+
+[TEST]
+"""
+
+_TEST_FC_CONFIG_PATH = Path(tempfile.mkdtemp()) / 'fcconfig'
+_TEST_FC_CONFIG_PATH.write_text(TEST_FC_CONFIG)
+
+# FC_CONFIG is loaded at import, so this has to be set before any test module imports acrossfc.
+# A developer's own config still wins if they've pointed AX_FC_CONFIG at one.
+if 'AX_FC_CONFIG' not in os.environ:
+    os.environ['AX_FC_CONFIG'] = str(_TEST_FC_CONFIG_PATH)
+os.environ.setdefault('AX_ENV', 'TEST')
+
+# acrossfc's logging dictConfig disables loggers that already exist, which would silence the 'peewee'
+# logger that playhouse.test_utils.count_queries listens on, unless acrossfc is configured first.
+import acrossfc  # noqa: E402,F401
+from acrossfc.core.model import PointsCategory, PointsEvent, PointsEventStatus, SubmissionType  # noqa: E402
+
+
+@pytest.fixture
+def test_fc_config_path() -> Path:
+    return _TEST_FC_CONFIG_PATH
+
+
+TIER = '7_0'
+
+
+def make_submission(submission_uuid: str, member_ids, ts: int = 1700000000):
+    """A queued FFLogs submission as it is after evaluation: every points event PENDING."""
+    return {
+        'uuid': submission_uuid,
+        'ts': ts,
+        'tier': TIER,
+        'submission_type': SubmissionType.ADD_FFLOGS.value,
+        'points_events': [
+            {
+                'uuid': f"{submission_uuid}-{member_id}",
+                'member_id': member_id,
+                'points': 10,
+                'category': PointsCategory.FC_PF.value,
+                'description': "FC PF",
+                'ts': ts,
+                'status': PointsEventStatus.PENDING.value,
+            }
+            for member_id in member_ids
+        ],
+    }
+
+
+class FakeDynamoDBClient:
+    """In-memory stand-in for DynamoDBClient, covering the calls the API modules make."""
+    def __init__(self):
+        self.submissions: Dict[str, Dict] = {}
+        self.queue: Dict[str, Dict] = {}
+        self.member_points: Dict[Tuple[str, int], Dict] = {}
+        self.throttle: Dict[str, Dict] = {}
+        self.response_cache: Dict[str, Dict] = {}
+        self.members: Dict[int, Dict] = {}
+        self.projections: List[Optional[List[str]]] = []
+        self.member_points_writes = 0
+
+    def batch_add_members(self, records: List[Dict]):
+        for record in records:
+            self.members[record['member_id']] = dict(record)
+
+    def get_submission_by_uuid(self, submission_uuid: str):
+        return copy.deepcopy(self.submissions.get(submission_uuid, None))
+
+    def batch_get_submissions(self, submission_uuids: List[str]) -> List[Dict]:
+        return [copy.deepcopy(self.submissions[u]) for u in submission_uuids if u in self.submissions]
+
+    def scan_submissions_queue(self) -> List[Dict]:
+        return list(self.queue.values())
+
+    def query_submissions_by_tier(
+        self,
+        tier: str,
+        projection: Optional[List[str]] = None,
+        exclusive_start_key: Optional[Dict] = None,
+        limit: Optional[int] = None,
+        newest_first: bool = True
+    ):
+        self.projections.append(projection)
+        items = sorted(
+            (s for s in self.submissions.values() if s['tier'] == tier),
+            key=lambda s: (s['ts'], s['uuid']),
+            reverse=newest_first
+        )
+        if exclusive_start_key is not None:
+            keys = [(s['ts'], s['uuid']) for s in items]
+            items = items[keys.index((exclusive_start_key['ts'], exclusive_start_key['uuid'])) + 1:]
+
+        response = {'Items': items[:limit] if limit is not None else items}
+        if limit is not None and len(items) > limit:
+            last = response['Items'][-1]
+            response['LastEvaluatedKey'] = {'uuid': last['uuid'], 'tier': last['tier'], 'ts': last['ts']}
+        if projection is not None:
+            response['Items'] = [{k: s[k] for k in projection if k in s} for s in response['Items']]
+        else:
+            response['Items'] = copy.deepcopy(response['Items'])
+        return response
+
+    def upsert_submission(self, submission: Dict):
+        self.submissions[submission['uuid']] = copy.deepcopy(submission)
+
+    def upsert_submission_queue_entry(self, submission_queue_entry: Dict):
+        self.queue[submission_queue_entry['uuid']] = dict(submission_queue_entry)
+
+    def batch_upsert_submissions(self, submissions: List[Dict]):
+        for submission in submissions:
+            self.upsert_submission(submission)
+            self.upsert_submission_queue_entry({'uuid': submission['uuid'], 'ts': submission['ts']})
+
+    def batch_complete_submission_reviews(self, submissions: List[Dict]):
+        for submission in submissions:
+            self.upsert_submission(submission)
+            self.queue.pop(submission['uuid'], None)
+
+    def delete_submission_queue_entry(self, submission_uuid: str):
+        self.queue.pop(submission_uuid, None)
+
+    def get_member_points(self, tier: str, member_id: int):
+        return copy.deepcopy(self.member_points.get((tier, int(member_id)), None))
+
+    def update_member_points(self, member_points: Dict):
+        self.member_points_writes += 1
+        self.member_points[(member_points['tier'], int(member_points['member_id']))] = copy.deepcopy(member_points)
+
+    def batch_get_member_points(self, tier: str, member_ids: List[int]) -> List[Dict]:
+        return [
+            copy.deepcopy(self.member_points[(tier, int(member_id))])
+            for member_id in member_ids if (tier, int(member_id)) in self.member_points
+        ]
+
+    def batch_update_member_points(self, member_points_list: List[Dict]):
+        for member_points in member_points_list:
+            self.update_member_points(member_points)
+
+    def get_response_cache_entry(self, cache_key: str):
+        return copy.deepcopy(self.response_cache.get(cache_key, None))
+
+    def put_response_cache_entry(self, entry: Dict):
+        self.response_cache[entry['cache_key']] = copy.deepcopy(entry)
+
+    def delete_response_cache_entry(self, cache_key: str):
+        self.response_cache.pop(cache_key, None)
+
+    def get_throttle_entry(self, throttle_key: str):
+        return copy.deepcopy(self.throttle.get(throttle_key, None))
+
+    def put_throttle_entry(self, entry: Dict, expected_updated_at: Optional[Decimal]) -> bool:
+        current = self.throttle.get(entry['throttle_key'], None)
+        current_updated_at = current['updated_at'] if current is not None else None
+        if current_updated_at != expected_updated_at:
+            return False
+        self.throttle[entry['throttle_key']] = dict(entry)
+        return True
+
+
+@pytest.fixture
+def fake_ddb(monkeypatch) -> FakeDynamoDBClient:
+    """Points the DDB_CLIENT singleton at a FakeDynamoDBClient for the test."""
+    from acrossfc.ext.ddb_client import DDB_CLIENT
+
+    fake = FakeDynamoDBClient()
+    # Set on the proxy's own __dict__, since setting attributes on a LazyProxy forwards them to the instance
+    monkeypatch.setitem(vars(DDB_CLIENT), '_instance', fake)
+    return fake
+
+
+class FakeFFLogsClient:
+    """Stand-in for FFLogsClient that records the reports fetched. Fight 9 is never a tracked encounter."""
+    def __init__(self):
+        self.fetched_reports = []
+
+    def get_fc_roster(self):
+        return []
+
+    def get_report_fight_data(self, report_id, fight_ids):
+        self.fetched_reports.append((report_id, sorted(fight_ids)))
+        return {
+            fight_id: None if fight_id == 9 else SimpleNamespace(fight_signature=fight_id)
+            for fight_id in fight_ids
+        }
+
+
+class FakePointsEvaluator:
+    """Awards 10 FC PF points to member 1 for any fight, without querying FFLogs."""
+    def __init__(self, fflogs_url, is_fc_pf, is_static, fc_pf_id, fight_data=None):
+        self.fight_data = fight_data or SimpleNamespace(fight_signature=0)
+        self.notes = []
+        self.points_events = [
+            PointsEvent(uuid=fflogs_url, member_id=1, points=10, category=PointsCategory.FC_PF, description="", ts=0)
+        ]
+
+
+@pytest.fixture
+def fake_fflogs(monkeypatch) -> FakeFFLogsClient:
+    """Points the FFLOGS_CLIENT singleton at a FakeFFLogsClient and swaps in FakePointsEvaluator for the test."""
+    from acrossfc.ext.fflogs_client import FFLOGS_CLIENT
+
+    fake = FakeFFLogsClient()
+    monkeypatch.setitem(vars(FFLOGS_CLIENT), '_instance', fake)
+    monkeypatch.setattr('acrossfc.core.points_evaluator.PointsEvaluator', FakePointsEvaluator)
+    return fake
@@ -0,0 +1,61 @@
+"""
+Local load-test harness for the API.
+
+Start the dev server first (`make runapi`), then e.g.:
+
+    python tests/load_test_api.py -p /ppts/table -p /current_tier -n 2000 -c 16
+"""
+# stdlib
+import time
+import statistics
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+# 3rd-party
+import click
+import requests
+
+# Local
+from acrossfc.api.routes import ROUTER
+
+
+@click.command()
+@click.option('-u', '--base-url', default='http://127.0.0.1:8000', show_default=True)
+@click.option('-p', '--path', 'paths', multiple=True,
+              help="GET path to hit. Defaults to every static GET route in the route table")
+@click.option('-n', '--num-requests', default=500, show_default=True)
+@click.option('-c', '--concurrency', default=8, show_default=True)
+@click.option('-H', '--header', 'headers', multiple=True, help="Extra header, e.g. 'X-AX-DACCESS-TOKEN: ...'")
+def load_test(base_url, paths, num_requests, concurrency, headers):
+    if len(paths) == 0:
+        paths = [r.pattern for r in ROUTER.routes if r.method == 'GET' and r.is_static]
+    header_dict = dict(h.split(':', 1) for h in headers)
+    header_dict = {k.strip(): v.strip() for k, v in header_dict.items()}
+
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    def hit(i):
+        path = paths[i % len(paths)]
+        start = time.perf_counter()
+        resp = session.get(f"{base_url}{path}", headers=header_dict)
+        return path, resp.status_code, (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(hit, range(num_requests)))
+    elapsed_s = time.perf_counter() - start
+
+    click.echo(f"{num_requests} requests in {elapsed_s:.2f}s ({num_requests / elapsed_s:.1f} req/s)\n")
+    for path in paths:
+        latencies = sorted(ms for p, _, ms in results if p == path)
+        statuses = Counter(status for p, status, _ in results if p == path)
+        p50 = statistics.median(latencies)
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        click.echo(f"{path:<24} p50={p50:7.1f}ms  p99={p99:7.1f}ms  max={latencies[-1]:7.1f}ms  {dict(statuses)}")
+
+
+if __name__ == '__main__':
+    load_test()
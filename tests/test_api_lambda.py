@@ -0,0 +1,131 @@
+# stdlib
+import gzip
+import hmac
+import json
+import base64
+import hashlib
+import importlib.util
+from pathlib import Path
+
+# 3rd-party
+import pytest
+
+# Local
+from acrossfc.api import submissions
+from acrossfc.api.auth import AuthResult
+from acrossfc.api.throttle import TokenBucketThrottle
+from acrossfc.core.config import FC_CONFIG
+
+LAMBDA_PATH = Path(__file__).parent.parent / 'lambda' / 'api_acrossfc_com.py'
+
+
+@pytest.fixture(scope='module')
+def api():
+    spec = importlib.util.spec_from_file_location('api_acrossfc_com', LAMBDA_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_event(method: str, path: str, query=None, body: str = '', headers=None):
+    """An API Gateway HTTP API event, signed like the Discord bot's requests."""
+    signature = hmac.new(FC_CONFIG.il_palazzo_key.encode('utf-8'), body.encode('utf-8'), hashlib.sha256).hexdigest()
+    return {
+        'requestContext': {'http': {'method': method}},
+        'rawPath': path,
+        'queryStringParameters': query or {},
+        'headers': {'x-ax-bot-signature': signature} | (headers or {}),
+        'body': body,
+    }
+
+
+def test_unknown_route_is_404(api):
+    assert api.lambda_handler(make_event('GET', '/nope'), None)['statusCode'] == 404
+
+
+def test_wrong_method_is_405(api):
+    resp = api.lambda_handler(make_event('GET', '/submissions/review/bulk'), None)
+    assert resp['statusCode'] == 405
+    assert resp['headers']['Allow'] == 'POST'
+
+
+def test_invalid_parameter_is_400(api):
+    resp = api.lambda_handler(make_event('POST', '/submissions/queue/drain', {'num_workers': '0'}), None)
+    assert resp['statusCode'] == 400
+
+
+def get_points_table(api, **headers):
+    return api.lambda_handler(make_event('GET', '/ppts/table', headers=headers), None)
+
+
+def test_etag_and_conditional_get(api):
+    resp = get_points_table(api)
+    assert resp['statusCode'] == 200
+    etag = resp['headers']['ETag']
+    assert json.loads(resp['body'])[0]['name'] == 'FC_PF'
+
+    not_modified = get_points_table(api, **{'if-none-match': etag})
+    assert not_modified['statusCode'] == 304
+    assert 'body' not in not_modified
+    assert not_modified['headers']['ETag'] == etag
+
+    # Weak comparison, lists, and the ETag of a compressed representation all match
+    assert get_points_table(api, **{'if-none-match': f'"other", W/{etag}'})['statusCode'] == 304
+    assert get_points_table(api, **{'if-none-match': f'{etag[:-1]}-gzip"'})['statusCode'] == 304
+    assert get_points_table(api, **{'if-none-match': '"other"'})['statusCode'] == 200
+
+
+def test_gzip_when_accepted(api):
+    plain = get_points_table(api)
+    resp = get_points_table(api, **{'accept-encoding': 'gzip, deflate'})
+
+    assert resp['headers']['Content-Encoding'] == 'gzip'
+    assert resp['isBase64Encoded']
+    assert gzip.decompress(base64.b64decode(resp['body'])).decode('utf-8') == plain['body']
+    # Each encoding gets its own strong ETag
+    assert resp['headers']['ETag'] == f'{plain["headers"]["ETag"][:-1]}-gzip"'
+    assert resp['headers']['Vary'] == 'Accept-Encoding'
+
+
+@pytest.mark.parametrize('accept_encoding, expected', [
+    (None, None),
+    ('identity', None),
+    ('gzip;q=0', None),
+    ('GZIP', 'gzip'),
+    ('br, gzip', 'br'),
+    ('br;q=0, gzip', 'gzip'),
+])
+def test_choose_encoding(api, accept_encoding, expected):
+    # Without brotli installed, br is never chosen
+    if expected == 'br' and api.brotli is None:
+        expected = 'gzip'
+    assert api._choose_encoding(accept_encoding) == expected
+
+
+def test_small_and_non_get_responses_are_not_compressed(api):
+    small = api.response(200, data={'a': 1}, request_headers={'accept-encoding': 'gzip'})
+    assert 'Content-Encoding' not in small['headers']
+    assert 'ETag' in small['headers']
+
+    not_cached = api.response(200, data={'a': 1})
+    assert 'ETag' not in not_cached['headers']
+
+
+def test_submissions_are_throttled_as_the_token_caller(api, fake_ddb, monkeypatch):
+    monkeypatch.setattr(api, 'authorize_discord_access_token', lambda token: AuthResult(200, token, 'Admin'))
+    throttle = TokenBucketThrottle(capacity=1, refill_s=60)
+    throttle.acquire('submit_fflogs:100')
+    monkeypatch.setattr(submissions, 'SUBMISSION_THROTTLE', throttle)
+
+    body = json.dumps({
+        'fflogs_url': "https://www.fflogs.com/reports/AAA#fight=1",
+        'submitted_by': {'name': 'Admin'},
+        'submission_channel': 'ADMIN_PORTAL',
+        'is_static': False,
+        'is_fc_pf': True,
+    })
+    event = make_event('POST', '/submissions/fflogs', body=body)
+    event['headers'] = {'x-ax-daccess-token': '100'}
+    resp = api.lambda_handler(event, None)
+    assert resp['statusCode'] == 429
+    assert resp['headers']['Retry-After'] == '60'
@@ -0,0 +1,75 @@
+# 3rd-party
+import pytest
+
+# Local
+from acrossfc.core.config import FC_CONFIG
+from acrossfc.api import auth
+from acrossfc.api.auth import DiscordAuthCache, authorize_discord_access_token
+
+
+class FakeDiscord:
+    """Stands in for requests.get on /users/@me."""
+    def __init__(self):
+        self.calls = 0
+        self.status_code = 200
+
+    def get(self, url, headers):
+        self.calls += 1
+        status_code = self.status_code
+
+        class Response:
+            def __init__(self):
+                self.status_code = status_code
+                self.text = ''
+
+            def json(self):
+                return {'id': '1', 'username': 'alpha'}
+        return Response()
+
+
+@pytest.fixture
+def now(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('acrossfc.api.auth.time.time', lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def discord(monkeypatch, now):
+    discord = FakeDiscord()
+    monkeypatch.setattr(auth.requests, 'get', discord.get)
+    monkeypatch.setattr(auth, 'AUTH_CACHE', DiscordAuthCache(ttl_s=300))
+    monkeypatch.setattr(FC_CONFIG, 'allowed_discord_id_list', ['1'])
+    return discord
+
+
+def test_token_is_verified_once_per_ttl(discord, now):
+    assert authorize_discord_access_token('token') == (200, '1', 'alpha')
+    now[0] += 299
+    assert authorize_discord_access_token('token') == (200, '1', 'alpha')
+    assert discord.calls == 1
+
+    # Expired, so Discord is asked again
+    now[0] += 1
+    assert authorize_discord_access_token('token') == (200, '1', 'alpha')
+    assert discord.calls == 2
+
+
+def test_tokens_are_stored_hashed(discord):
+    authorize_discord_access_token('secret-token')
+    assert all('secret-token' not in key for key in auth.AUTH_CACHE._entries)
+
+
+def test_allow_list_change_applies_to_cached_tokens(discord, monkeypatch):
+    assert authorize_discord_access_token('token').status_code == 200
+    monkeypatch.setattr(FC_CONFIG, 'allowed_discord_id_list', ['2'])
+    assert authorize_discord_access_token('token').status_code == 403
+    assert discord.calls == 1
+
+
+def test_rejected_tokens_are_not_cached(discord):
+    discord.status_code = 401
+    assert authorize_discord_access_token('token').status_code == 401
+    discord.status_code = 200
+    assert authorize_discord_access_token('token').status_code == 200
+    assert discord.calls == 2
@@ -0,0 +1,89 @@
+# stdlib
+from collections import defaultdict
+
+# 3rd-party
+import pytest
+from playhouse.test_utils import count_queries
+
+# Local
+from acrossfc.analytics.legends import Legends
+from acrossfc.analytics.cleared_roles import ClearedRoles
+from acrossfc.core.clear_matrix import NO_CLEAR
+from acrossfc.core.constants import JOB_CATEGORIES, ULTIMATE_NAMES
+from test_database import ENCOUNTERS, NUM_MEMBERS, clear_db  # noqa: F401
+
+
+@pytest.mark.parametrize('include_echo', [False, True])
+def test_matrix_matches_sql(clear_db, include_echo):  # noqa: F811
+    matrix = clear_db.get_clear_matrix(include_echo=include_echo)
+
+    assert matrix.clear_rates() == clear_db.get_clear_rates(include_echo=include_echo)
+
+    clear_order = clear_db.get_clear_order(include_echo=include_echo)
+    cleared_jobs = clear_db.get_cleared_jobs(include_echo=include_echo)
+    for encounter in ENCOUNTERS:
+        name = encounter.name
+        assert matrix.cleared_members(name) == clear_db.get_cleared_members_by_encounter(name, include_echo)
+        assert matrix.uncleared_members(name) == clear_db.get_uncleared_members_by_encounter(name, include_echo)
+        assert matrix.clear_order(name) == clear_order.get(name, [])
+
+        jobs_by_member = defaultdict(set)
+        for member, job in cleared_jobs.get(name, set()):
+            jobs_by_member[member].add(job)
+        for member in matrix.members:
+            assert set(matrix.cleared_jobs(member, name)) == jobs_by_member[member]
+
+
+def test_reductions(clear_db):  # noqa: F811
+    matrix = clear_db.get_clear_matrix(include_echo=True)
+    names = list(dict.fromkeys(e.name for e in ENCOUNTERS))
+
+    assert matrix.first_clear_day.shape == (NUM_MEMBERS, len(matrix.encounter_names))
+    assert (matrix.cleared == (matrix.first_clear_day != NO_CLEAR)).all()
+    assert not matrix.cleared.flags.writeable
+
+    # Everyone in the fixture has cleared every one of its encounters
+    assert (matrix.legend_counts(names) == len(names)).all()
+    assert all(cleared == names for cleared in matrix.cleared_encounters(names).values())
+
+    role_counts = matrix.cleared_role_counts(names[0], JOB_CATEGORIES)
+    for category in JOB_CATEGORIES:
+        expected = {
+            member for member in matrix.members
+            if any(
+                category.name in (j.main_category_id, j.sub_category_id)
+                for j in matrix.cleared_jobs(member, names[0])
+            )
+        }
+        assert role_counts[category.name] == len(expected)
+
+
+def test_matrix_is_built_once(clear_db):  # noqa: F811
+    with count_queries() as counter:
+        for _ in range(3):
+            clear_db.get_clear_matrix()
+    # Roster, jobs, encounter names, cleared jobs
+    assert counter.count == 4
+
+
+def test_encounter_missing_from_database(clear_db):  # noqa: F811
+    # As if the ClearDB was built before the encounter was tracked
+    missing = ULTIMATE_NAMES[0]
+    present = ENCOUNTERS[0].name
+    for table in ('clear_rate', 'first_clear', 'member_job_clear'):
+        clear_db._db.execute_sql(f'DELETE FROM "{table}" WHERE encounter_name = ?', (missing,))
+    matrix = clear_db.get_clear_matrix()
+    assert missing not in matrix.encounter_names
+
+    assert matrix.cleared_members(missing) == set()
+    assert matrix.uncleared_members(missing) == set(matrix.members)
+    assert matrix.clear_order(missing) == []
+    assert matrix.cleared_jobs(matrix.members[0], missing) == []
+    assert set(matrix.cleared_role_counts(missing, JOB_CATEGORIES).values()) == {0}
+    assert (matrix.legend_counts([missing, present]) == 1).all()
+    assert all(cleared == [present] for cleared in matrix.cleared_encounters([missing, present]).values())
+    assert matrix.cleared_encounters([missing]) == {}
+
+    # Reports look up fixed lists of encounters, which can include ones the ClearDB doesn't have
+    Legends(clear_db)
+    ClearedRoles(clear_db)
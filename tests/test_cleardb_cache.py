@@ -0,0 +1,114 @@
+# stdlib
+import os
+from datetime import date
+
+# 3rd-party
+import pytest
+from peewee import OperationalError
+
+# Local
+from acrossfc.core.config import FC_CONFIG
+from acrossfc.core.database import ClearDatabase
+from acrossfc.etl.cleardb_snapshots import MANIFEST_KEY, SnapshotStore
+from acrossfc.ext.cleardb_cache import ClearDBCache
+from test_cleardb_snapshots import FakeS3, assert_same_cleardb, next_day, day_0  # noqa: F401
+
+
+@pytest.fixture
+def s3() -> FakeS3:
+    return FakeS3()
+
+
+@pytest.fixture
+def cache(s3, tmp_path) -> ClearDBCache:
+    return ClearDBCache(cache_dir=str(tmp_path / "cache"), s3=s3)
+
+
+def test_s3_object_is_cached_and_revalidated(cache, s3, day_0, tmp_path):  # noqa: F811
+    s3.upload_file(day_0, 'bucket', '2024-04-01')
+
+    db = cache.open('s3://bucket/2024-04-01')
+    assert cache.open('s3://bucket/2024-04-01') is db
+    # The second open only asked whether the object changed
+    assert s3.downloads == ['2024-04-01']
+    assert_same_cleardb(db.db_filename, day_0)
+
+    # Opened read-only
+    with pytest.raises(OperationalError):
+        db._db.execute_sql('DELETE FROM "member"')
+
+    # A new version of the object is downloaded and opened anew
+    s3.upload_file(next_day(day_0, tmp_path, 1), 'bucket', '2024-04-01')
+    new_db = cache.open('s3://bucket/2024-04-01')
+    assert new_db is not db
+    assert s3.downloads == ['2024-04-01', '2024-04-01']
+    assert_same_cleardb(new_db.db_filename, str(tmp_path / "day1"))
+
+
+def test_latest_replays_snapshot_chain(cache, s3, day_0, tmp_path, monkeypatch):  # noqa: F811
+    monkeypatch.setattr(FC_CONFIG, 'cleardb_delta_snapshots', True)
+    store = SnapshotStore(s3, FC_CONFIG.s3_cleardb_bucket_name)
+    store.upload(date(2024, 4, 1), day_0)
+    day_1 = next_day(day_0, tmp_path, 1)
+    assert store.upload(date(2024, 4, 2), day_1, base=(date(2024, 4, 1), day_0))['kind'] == 'delta'
+
+    db = cache.open('latest')
+    assert_same_cleardb(db.db_filename, day_1)
+    assert db.get_clear_rates() == ClearDatabase(day_1).get_clear_rates()
+
+    # Nothing changed, so nothing is downloaded or rebuilt
+    num_downloads = len(s3.downloads)
+    assert cache.open(f"s3://{FC_CONFIG.s3_cleardb_bucket_name}/latest") is db
+    assert len(s3.downloads) == num_downloads
+
+    # A new snapshot changes the manifest, which brings in only the new delta
+    day_2 = next_day(day_1, tmp_path, 2)
+    store.upload(date(2024, 4, 3), day_2, base=(date(2024, 4, 2), day_1))
+    num_downloads = len(s3.downloads)
+    db = cache.open('latest')
+    assert s3.downloads[num_downloads:] == [MANIFEST_KEY, 'snapshots/2024-04-03.delta.json.zst']
+    assert_same_cleardb(db.db_filename, day_2)
+
+
+def test_invalid_locations(cache):
+    with pytest.raises(ValueError):
+        cache.open('s3://bucket')
+    with pytest.raises(ValueError):
+        cache.open('s3://bucket/../../etc/passwd')
+
+
+def test_old_snapshot_gets_aggregates_before_it_is_cached(cache, s3, day_0, tmp_path, monkeypatch):  # noqa: F811
+    # A snapshot from before the aggregate tables existed
+    old = str(tmp_path / "old")
+    ClearDatabase(day_0).save(old)
+    ClearDatabase(old)._db.execute_sql('DROP TABLE clear_rate')
+    s3.upload_file(old, 'bucket', '2024-04-01')
+    local_path = cache._local_path('bucket', '2024-04-01')
+
+    def crash(cleardb_filename):
+        raise RuntimeError("crashed")
+
+    # Dying before the aggregates are in leaves neither the file nor its ETag behind
+    monkeypatch.setattr('acrossfc.ext.cleardb_cache._ensure_aggregates', crash)
+    with pytest.raises(RuntimeError):
+        cache.open('s3://bucket/2024-04-01')
+    assert not os.path.exists(local_path)
+    assert not os.path.exists(f"{local_path}.etag")
+    monkeypatch.undo()
+
+    db = cache.open('s3://bucket/2024-04-01')
+    assert db.get_clear_rates() == ClearDatabase(day_0).get_clear_rates()
+    assert s3.downloads == ['2024-04-01', '2024-04-01']
+    # Temporary download files don't linger
+    assert sorted(os.listdir(os.path.dirname(local_path))) == ['2024-04-01', '2024-04-01.etag']
+
+
+def test_replaced_file_closes_old_connection(cache, s3, day_0, tmp_path):  # noqa: F811
+    s3.upload_file(day_0, 'bucket', '2024-04-01')
+    db = cache.open('s3://bucket/2024-04-01')
+    db.get_fc_roster()
+    assert not db._db.is_closed()
+
+    s3.upload_file(next_day(day_0, tmp_path, 1), 'bucket', '2024-04-01')
+    assert cache.open('s3://bucket/2024-04-01') is not db
+    assert db._db.is_closed()
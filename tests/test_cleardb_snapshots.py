@@ -0,0 +1,155 @@
+# stdlib
+import io
+import hashlib
+import shutil
+from datetime import date, datetime, timedelta
+
+# 3rd-party
+import pytest
+
+# Local
+from acrossfc.core.config import FC_CONFIG
+from acrossfc.core.database import ClearDatabase
+from acrossfc.core.model import Member, Clear
+from acrossfc.core.constants import JOBS
+from acrossfc.etl.cleardb_snapshots import (
+    MANIFEST_KEY,
+    SnapshotStore,
+    make_delta,
+    apply_delta,
+)
+from test_database import ENCOUNTERS, make_roster
+
+TABLES = {
+    'member': 'SELECT fcid, name, rank FROM "member" ORDER BY 1',
+    'clear': 'SELECT member_id, encounter_id, start_time, historical_pct, report_code, report_fight_id, job_id, '
+             'locked_in FROM "clear" ORDER BY 1, 2, 5, 6',
+    'first_clear': 'SELECT * FROM first_clear ORDER BY 1, 2, 3',
+    'clear_rate': 'SELECT * FROM clear_rate ORDER BY 1, 2',
+    'member_job_clear': 'SELECT * FROM member_job_clear ORDER BY 1, 2, 3, 4',
+}
+
+
+def assert_same_cleardb(actual_filename: str, expected_filename: str):
+    actual, expected = ClearDatabase(actual_filename), ClearDatabase(expected_filename)
+    for table, sql in TABLES.items():
+        assert actual._db.execute_sql(sql).fetchall() == expected._db.execute_sql(sql).fetchall(), table
+
+
+class FakeS3:
+    """Just enough of the boto3 S3 client for SnapshotStore, backed by a dict."""
+    class exceptions:
+        class ClientError(Exception):
+            def __init__(self, code):
+                self.response = {'Error': {'Code': code}}
+
+    def __init__(self):
+        self.objects = {}
+        self.downloads = []
+
+    def _get(self, key):
+        if key not in self.objects:
+            raise FakeS3.exceptions.ClientError('NoSuchKey')
+        return self.objects[key]
+
+    def etag(self, key) -> str:
+        return f'"{hashlib.md5(self._get(key)).hexdigest()}"'
+
+    def get_object(self, Bucket, Key, IfNoneMatch=None):
+        if IfNoneMatch is not None and IfNoneMatch == self.etag(Key):
+            raise FakeS3.exceptions.ClientError('304')
+        self.downloads.append(Key)
+        return {'Body': io.BytesIO(self._get(Key)), 'ETag': self.etag(Key)}
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[Key] = Body
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop(Key, None)
+
+    def upload_file(self, Filename, Bucket, Key):
+        with open(Filename, 'rb') as f:
+            self.objects[Key] = f.read()
+
+    def download_file(self, Bucket, Key, Filename):
+        data = self._get(Key)
+        with open(Filename, 'wb') as f:
+            f.write(data)
+
+
+def next_day(filename: str, tmp_path, day: int) -> str:
+    """Yesterday's ClearDB copied and updated the way the ETL does it: a new kill, a rename, someone leaving."""
+    members, _ = make_roster()
+    new_filename = str(tmp_path / f"day{day}")
+    shutil.copy(filename, new_filename)
+    db = ClearDatabase.open_existing(new_filename)
+    roster = [m for m in db.get_fc_roster() if m.fcid != day]
+    roster[0] = Member(fcid=roster[0].fcid, name=f"Renamed {day}", rank=roster[0].rank)
+    db.upsert_members(roster, prune=True)
+    db.upsert_clears([Clear(
+        member=members[10], encounter=ENCOUNTERS[day % len(ENCOUNTERS)], start_time=datetime(2024, 4, day, 21, 30),
+        historical_pct=float(day), report_code=f"day{day}", report_fight_id=1, job=JOBS[day], locked_in=True
+    )])
+    return new_filename
+
+
+@pytest.fixture
+def day_0(tmp_path) -> str:
+    filename = str(tmp_path / "day0")
+    ClearDatabase.from_fflogs(*make_roster()).save(filename)
+    return filename
+
+
+def test_delta_replays_to_same_database(day_0, tmp_path):
+    day_1 = next_day(day_0, tmp_path, 1)
+    delta = make_delta(day_0, day_1)
+    assert len(delta['clear_upserts']) == 1
+    # Member 1 left, taking their two clears of each encounter along
+    assert len(delta['clear_deletes']) == 2 * len(ENCOUNTERS)
+
+    replayed = str(tmp_path / "replayed")
+    shutil.copy(day_0, replayed)
+    apply_delta(ClearDatabase.open_existing(replayed), delta)
+    assert_same_cleardb(replayed, day_1)
+
+
+def test_snapshot_chain_and_compaction(day_0, tmp_path, monkeypatch):
+    monkeypatch.setattr(FC_CONFIG, 'cleardb_delta_snapshots', True)
+    monkeypatch.setattr(FC_CONFIG, 'cleardb_compaction_days', 3)
+    s3 = FakeS3()
+    store = SnapshotStore(s3, 'bucket')
+    start = date(2024, 4, 1)
+
+    assert store.download_latest(str(tmp_path / "nothing")) is None
+    assert store.upload(start, day_0)['kind'] == 'full'
+
+    filename = day_0
+    kinds = []
+    for day in range(1, 5):
+        latest = str(tmp_path / f"latest{day}")
+        base_date = store.download_latest(latest)
+        assert base_date == start + timedelta(days=day - 1)
+        assert_same_cleardb(latest, filename)
+
+        filename = next_day(latest, tmp_path, day)
+        kinds.append(store.upload(start + timedelta(days=day), filename, base=(base_date, latest))['kind'])
+
+    # A full snapshot every 3 days, deltas in between
+    assert kinds == ['delta', 'delta', 'full', 'delta']
+    manifest = store.load_manifest()
+    assert [e['kind'] for e in manifest['snapshots']] == ['full', 'full', 'delta']
+    # Compaction deleted the deltas the new full snapshot replaced
+    assert sorted(s3.objects) == sorted([MANIFEST_KEY] + [e['key'] for e in manifest['snapshots']])
+    assert manifest['snapshots'][-1]['size'] < manifest['snapshots'][0]['size']
+
+    assert store.download_latest(str(tmp_path / "final")) == start + timedelta(days=4)
+    assert_same_cleardb(str(tmp_path / "final"), filename)
+
+
+def test_full_snapshots_without_deltas(day_0, tmp_path):
+    store = SnapshotStore(FakeS3(), 'bucket')
+    store.upload(date(2024, 4, 1), day_0)
+    day_1 = next_day(day_0, tmp_path, 1)
+    assert store.upload(date(2024, 4, 2), day_1, base=(date(2024, 4, 1), day_0))['kind'] == 'full'
+    assert store.download_latest(str(tmp_path / "latest")) == date(2024, 4, 2)
+    assert_same_cleardb(str(tmp_path / "latest"), day_1)
@@ -0,0 +1,246 @@
+# stdlib
+import re
+from datetime import datetime, timedelta
+
+# 3rd-party
+import pytest
+from playhouse.test_utils import count_queries
+
+# Local
+from acrossfc.analytics.clear_chart import ClearChart
+from acrossfc.analytics.who_cleared_recently import WhoClearedRecently
+from acrossfc.core.database import ClearDatabase, CLEAR_INDEXES, RETIRED_CLEAR_INDEXES
+from acrossfc.core.model import Member, Clear
+from acrossfc.core.constants import ALL_ENCOUNTERS, JOBS
+
+NUM_MEMBERS = 30
+ENCOUNTERS = ALL_ENCOUNTERS[:5]
+
+
+def make_roster():
+    members = [Member(fcid=i, name=f"Member {i}", rank=1) for i in range(NUM_MEMBERS)]
+    clears = []
+    start = datetime(2024, 1, 1)
+    for i, member in enumerate(members):
+        for j, encounter in enumerate(ENCOUNTERS):
+            # Every other member clears each encounter twice, on different jobs and days
+            for k in range(1 + i % 2):
+                clears.append(Clear(
+                    member=member,
+                    encounter=encounter,
+                    start_time=start + timedelta(days=i + j + k),
+                    historical_pct=50.0,
+                    report_code=f"report{i}{j}{k}",
+                    report_fight_id=k + 1,
+                    job=JOBS[(i + k) % len(JOBS)],
+                    locked_in=True
+                ))
+    return members, clears
+
+
+@pytest.fixture
+def clear_db() -> ClearDatabase:
+    return ClearDatabase.from_fflogs(*make_roster())
+
+
+def test_bulk_load_matches_bulk_create():
+    members, clears = make_roster()
+    # FFLogs reporting the same kill again, with an updated parse
+    duplicate = Clear(**(clears[0].__data__ | {'historical_pct': 75.0}))
+    clears.insert(3, duplicate)
+    bulk_loaded = ClearDatabase.from_fflogs(members, clears, bulk_load=True)
+    bulk_created = ClearDatabase.from_fflogs(members, clears, bulk_load=False)
+
+    for table in ('member', 'trackedencounter', 'jobcategory', 'job', 'clear'):
+        sql = f'SELECT * FROM "{table}" ORDER BY 1'
+        assert bulk_loaded._db.execute_sql(sql).fetchall() == bulk_created._db.execute_sql(sql).fetchall(), table
+    assert bulk_loaded.get_clear_order() == bulk_created.get_clear_order()
+    assert bulk_created._db.execute_sql('SELECT COUNT(*) FROM "clear"').fetchone()[0] == len(clears) - 1
+
+
+def test_get_clear_order_query_count(clear_db):
+    with count_queries() as counter:
+        clear_order = clear_db.get_clear_order(include_echo=True)
+        # Touch everything a report would
+        cleared = {e: set().union(*(members for _, members in dates)) for e, dates in clear_order.items()}
+        names = {m.name for members in cleared.values() for m in members}
+
+    # One query for the member map, one for the clear order itself
+    assert counter.count == 2
+    assert len(names) == NUM_MEMBERS
+    assert all(len(members) == NUM_MEMBERS for members in cleared.values())
+
+
+def test_get_cleared_jobs_query_count(clear_db):
+    with count_queries() as counter:
+        cleared_jobs = clear_db.get_cleared_jobs(include_echo=True)
+        labels = {(m.name, j.name) for pairs in cleared_jobs.values() for m, j in pairs}
+
+    # Member map, job map, cleared jobs
+    assert counter.count == 3
+    assert len(labels) == NUM_MEMBERS + NUM_MEMBERS // 2
+    assert all(len(pairs) == NUM_MEMBERS + NUM_MEMBERS // 2 for pairs in cleared_jobs.values())
+
+
+def _clear_reads(clear_db: ClearDatabase, sql: str, params) -> list:
+    """Returns the query plan steps of sql that read Clear."""
+    aliases = set(re.findall(r'"clear" AS "(\w+)"', sql)) | {'clear'}
+    plan = clear_db._db.execute_sql(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    return [
+        detail for _, _, _, detail in plan
+        if re.match(r'(SCAN|SEARCH) (\w+)', detail)
+        and re.match(r'(SCAN|SEARCH) (\w+)', detail).group(2) in aliases
+    ]
+
+
+def _is_covered(detail: str) -> bool:
+    """
+    False for full scans, lookups that go back to the table for every row, and AUTOMATIC indexes SQLite
+    builds with a full scan per query.
+    """
+    return 'COVERING INDEX' in detail and 'AUTOMATIC' not in detail
+
+
+# The reports read only the aggregate tables, so the aggregate rebuilds are the queries that read Clear
+@pytest.mark.parametrize('encounter_names', [None, {ENCOUNTERS[0].name}, {e.name for e in ENCOUNTERS[:3]}])
+def test_aggregate_refresh_uses_covering_clear_indexes(clear_db, encounter_names):
+    with count_queries() as counter:
+        clear_db.refresh_aggregates(encounter_names)
+
+    clear_reads = []
+    for record in counter.get_queries():
+        sql, params = record.msg
+        reads = _clear_reads(clear_db, sql, params)
+        assert all(_is_covered(detail) for detail in reads), (sql, reads)
+        clear_reads.extend(reads)
+    # Both aggregates, with and without echo
+    assert len(clear_reads) == 4
+
+
+def test_open_existing_replaces_retired_indexes(clear_db):
+    clear_db._db.execute_sql('DROP INDEX "clear_encounter_member_job"')
+    clear_db._db.execute_sql('CREATE INDEX "clear_member_encounter_job" ON "clear" (member_id, encounter_id, job_id)')
+
+    db = ClearDatabase.open_existing(clear_db.db_filename)
+    indexes = {index.name for index in db._db.get_indexes('clear')}
+    assert set(CLEAR_INDEXES) <= indexes
+    assert indexes.isdisjoint(RETIRED_CLEAR_INDEXES)
+
+
+def test_upsert_into_existing(clear_db):
+    members, clears = make_roster()
+    db = ClearDatabase.open_existing(clear_db.db_filename)
+
+    # Re-importing the same clears changes nothing
+    assert db.upsert_clears(clears) == 0
+
+    # A new kill is added, a member who left is pruned along with their clears
+    new_clear = Clear(
+        member=members[1], encounter=ENCOUNTERS[0], start_time=datetime(2025, 1, 1), historical_pct=99.0,
+        report_code="newreport", report_fight_id=1, job=JOBS[0], locked_in=True
+    )
+    assert db.upsert_clears([new_clear]) == 1
+    db.upsert_members(members[1:], prune=True)
+
+    rebuilt = ClearDatabase.from_fflogs(members[1:], [c for c in clears if c.member != members[0]] + [new_clear])
+    assert db.get_clear_order(include_echo=True) == rebuilt.get_clear_order(include_echo=True)
+    assert db.get_clear_rates(include_echo=True) == rebuilt.get_clear_rates(include_echo=True)
+
+
+def test_sync_clears_removes_clears_no_longer_returned(clear_db):
+    members, clears = make_roster()
+    synced_encounters = ENCOUNTERS[:3]
+    # Member 0's first report was deleted from FFLogs
+    returned = [
+        c for c in clears
+        if c.encounter in synced_encounters and not (c.member == members[0] and c.report_code == "report000")
+    ]
+
+    num_added, num_deleted = clear_db.sync_clears(
+        returned, [m.fcid for m in members], [e.id for e in synced_encounters]
+    )
+    assert (num_added, num_deleted) == (0, 1)
+
+    # Encounters that weren't fetched keep their clears
+    rebuilt = ClearDatabase.from_fflogs(
+        members, returned + [c for c in clears if c.encounter not in synced_encounters]
+    )
+    assert clear_db.get_clear_order(include_echo=True) == rebuilt.get_clear_order(include_echo=True)
+    assert clear_db.get_clear_rates(include_echo=True) == rebuilt.get_clear_rates(include_echo=True)
+
+
+def test_repeated_reports_are_memoized(clear_db):
+    encounter_names = [e.name for e in ENCOUNTERS]
+    with count_queries() as counter:
+        for _ in range(3):
+            # ClearChart rewrites the lists in the clear order it gets back
+            ClearChart(clear_db, encounter_names, include_echo=True)
+            WhoClearedRecently(clear_db, encounter_names, include_echo=True)
+
+    # Member map and the clear order query, once
+    assert counter.count == 2
+    assert clear_db.memo_hits == 5
+    assert all(
+        isinstance(members, set)
+        for dates in clear_db.get_clear_order(include_echo=True).values()
+        for _, members in dates
+    )
+
+
+def test_writes_invalidate_memoized_results(clear_db):
+    members, _ = make_roster()
+    num_cleared = len(clear_db.get_cleared_members_by_encounter(ENCOUNTERS[0].name, include_echo=True))
+    clear_db.upsert_members(members[1:], prune=True)
+    assert len(clear_db.get_cleared_members_by_encounter(ENCOUNTERS[0].name, include_echo=True)) == num_cleared - 1
+
+
+AGGREGATE_TABLES = ('first_clear', 'clear_rate', 'member_job_clear')
+
+
+def _table_rows(db: ClearDatabase, table: str) -> list:
+    return db._db.execute_sql(f'SELECT * FROM "{table}" ORDER BY 1, 2, 3').fetchall()
+
+
+@pytest.mark.parametrize('query', [
+    lambda db: db.get_clear_rates(include_echo=True),
+    lambda db: db.get_cleared_members_by_encounter(ENCOUNTERS[0].name),
+    lambda db: db.get_uncleared_members_by_encounter(ENCOUNTERS[0].name),
+    lambda db: db.get_clear_order(include_echo=True),
+    lambda db: db.get_cleared_jobs(include_echo=True),
+    lambda db: db.get_clear_matrix(include_echo=True),
+])
+def test_queries_read_aggregates_only(clear_db, query):
+    with count_queries() as counter:
+        query(clear_db)
+
+    for record in counter.get_queries():
+        sql, _ = record.msg
+        assert '"clear" AS' not in sql and 'FROM "clear"' not in sql, sql
+
+
+def test_upserts_keep_aggregates_consistent(clear_db):
+    members, clears = make_roster()
+    db = ClearDatabase.open_existing(clear_db.db_filename)
+    new_clear = Clear(
+        member=members[2], encounter=ENCOUNTERS[1], start_time=datetime(2023, 6, 1), historical_pct=99.0,
+        report_code="earlier", report_fight_id=1, job=JOBS[-1], locked_in=True
+    )
+    db.upsert_clears([new_clear])
+    db.upsert_members(members[1:], prune=True)
+
+    rebuilt = ClearDatabase.from_fflogs(members[1:], [c for c in clears if c.member != members[0]] + [new_clear])
+    for table in AGGREGATE_TABLES:
+        assert _table_rows(db, table) == _table_rows(rebuilt, table), table
+
+
+def test_aggregates_materialized_if_missing(clear_db):
+    expected = {table: _table_rows(clear_db, table) for table in AGGREGATE_TABLES}
+    for table in AGGREGATE_TABLES:
+        clear_db._db.execute_sql(f'DROP TABLE "{table}"')
+
+    # A file from before the aggregate tables existed, opened for reading
+    db = ClearDatabase(clear_db.db_filename)
+    rebuilt = ClearDatabase.from_fflogs(*make_roster())
+    assert db.get_clear_rates(include_echo=True) == rebuilt.get_clear_rates(include_echo=True)
+    for table in AGGREGATE_TABLES:
+        assert _table_rows(db, table) == expected[table], table
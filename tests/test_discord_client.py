@@ -0,0 +1,96 @@
+# 3rd-party
+import pytest
+
+# Local
+from acrossfc.ext.discord_client import DiscordClient
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, headers=None, body=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self._body = body if body is not None else {}
+        self.text = str(self._body)
+
+    def json(self):
+        return self._body
+
+
+class FakeSession:
+    """Replays canned responses and records the requests made."""
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def request(self, method, url, headers=None, **kwargs):
+        self.requests.append((method, url))
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr('acrossfc.ext.discord_client.time.sleep', sleeps.append)
+    return sleeps
+
+
+def make_client(responses) -> DiscordClient:
+    client = DiscordClient(bot_token='test', max_retries=3, backoff_base_s=0.0)
+    client.session = FakeSession(responses)
+    return client
+
+
+def test_route_key_separates_major_params():
+    assert DiscordClient._route_key('GET', 'channels/123/messages/456') == ('GET channels/:id/messages/:id', '123')
+    assert DiscordClient._route_key('GET', 'guilds/9/members?limit=1000') == ('GET guilds/:id/members', '9')
+
+
+def test_429_is_retried_after_retry_after(sleeps):
+    client = make_client([
+        FakeResponse(429, {'Retry-After': '3'}, {'retry_after': 1.5}),
+        FakeResponse(200, body={'id': '1'}),
+    ])
+
+    assert client.get('users/1').json() == {'id': '1'}
+    assert len(client.session.requests) == 2
+    # The body's retry_after is more precise than the header, and wins
+    assert len(sleeps) == 1 and 1.4 < sleeps[0] <= 1.5
+
+
+def test_global_429_pauses_every_route(sleeps):
+    client = make_client([
+        FakeResponse(429, {'X-RateLimit-Global': 'true'}, {'retry_after': 2.0}),
+        FakeResponse(200),
+        FakeResponse(200),
+    ])
+    client.get('users/1')
+    assert len(sleeps) == 1 and 1.9 < sleeps[0] <= 2.0
+
+    # Still inside the global window, so an unrelated route waits too
+    client._global_reset_at += 10
+    client.get('guilds/1/members')
+    assert len(sleeps) == 2
+
+
+def test_exhausted_bucket_waits_for_reset_per_major_param(sleeps):
+    exhausted = {'X-RateLimit-Bucket': 'abc', 'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset-After': '2.0'}
+    client = make_client([
+        FakeResponse(200, exhausted),
+        # Another channel has its own bucket, so it doesn't wait
+        FakeResponse(200, {'X-RateLimit-Bucket': 'abc', 'X-RateLimit-Remaining': '4'}),
+        FakeResponse(200, {'X-RateLimit-Bucket': 'abc', 'X-RateLimit-Remaining': '4'}),
+    ])
+
+    client.post('channels/1/messages')
+    client.post('channels/2/messages')
+    assert sleeps == []
+
+    client.post('channels/1/messages')
+    assert len(sleeps) == 1 and 1.9 < sleeps[0] <= 2.0
+
+
+def test_gives_up_after_max_retries(sleeps):
+    client = make_client([FakeResponse(429, body={'retry_after': 0.01}) for _ in range(4)])
+    with pytest.raises(Exception, match='429'):
+        client.get('users/1')
+    assert len(client.session.requests) == 4
@@ -0,0 +1,60 @@
+# 3rd-party
+import pytest
+
+# Local
+from acrossfc.core.model import Member
+from acrossfc.ext import discord_client
+from acrossfc.ext.fflogs_client import FFLOGS_CLIENT
+from acrossfc.api.fc_roster import sync_discord_members
+
+
+def guild_member(user_id: int, username: str, nick=None, global_name=None, bot=False):
+    return {'nick': nick, 'user': {'id': str(user_id), 'username': username, 'global_name': global_name, 'bot': bot}}
+
+
+class FakeFFLogsClient:
+    def get_fc_roster(self):
+        return [Member(fcid=1, name="Alpha Member", rank=1), Member(fcid=2, name="Beta Member", rank=2)]
+
+
+@pytest.fixture
+def fake_fflogs(monkeypatch):
+    monkeypatch.setitem(vars(FFLOGS_CLIENT), '_instance', FakeFFLogsClient())
+
+
+def test_iter_guild_members_follows_cursor(monkeypatch):
+    members = [guild_member(i, f"user{i}") for i in range(1, 8)]
+    requests = []
+
+    def fake_get(path, params={}):
+        requests.append(params['after'])
+        page = [m for m in members if int(m['user']['id']) > params['after']][:params['limit']]
+
+        class Response:
+            def json(self):
+                return page
+        return Response()
+
+    monkeypatch.setattr(discord_client, '_get', fake_get)
+    assert list(discord_client.iter_guild_members(page_size=3)) == members
+    # Full pages fetch the next one after their last user ID, the short last page ends it
+    assert requests == [0, 3, 6]
+
+
+def test_sync_discord_members(monkeypatch, fake_ddb, fake_fflogs):
+    monkeypatch.setattr(discord_client, 'iter_guild_members', lambda: iter([
+        guild_member(10, "alpha", nick="  alpha   MEMBER "),
+        guild_member(20, "someone", global_name="Beta Member"),
+        guild_member(30, "stranger"),
+        guild_member(40, "Alpha Member", bot=True),
+        # A second account with the same character name
+        guild_member(50, "alpha2", global_name="Alpha Member"),
+    ]))
+
+    records = sync_discord_members()
+    assert [(r['member_id'], r['discord_user_id']) for r in records] == [(1, 10), (2, 20)]
+    assert {m['member_id']: m['discord_user_id'] for m in fake_ddb.members.values()} == {1: 10, 2: 20}
+
+    fake_ddb.members.clear()
+    sync_discord_members(dry_run=True)
+    assert fake_ddb.members == {}
@@ -0,0 +1,55 @@
+# stdlib
+import os
+import sys
+import subprocess
+from pathlib import Path
+from typing import Dict
+
+# 3rd-party
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that are slow to import and should only load once something actually uses them
+HEAVY_MODULES = [
+    'boto3',
+    'botocore',
+    'gql',
+    'aiohttp',
+    'googleapiclient',
+    'peewee',
+    'acrossfc.core.constants',
+    'acrossfc.core.points_evaluator',
+]
+
+
+def import_times(import_stmt: str, fc_config_path: Path) -> Dict[str, int]:
+    """Runs import_stmt in a fresh interpreter with -X importtime, returns {module: cumulative us}."""
+    env = os.environ | {'AX_FC_CONFIG': str(fc_config_path), 'AX_ENV': 'TEST'}
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', import_stmt],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+
+    times = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize('import_stmt', [
+    'import acrossfc.api.routes',
+    'import sys; sys.path.insert(0, "lambda"); import api_acrossfc_com',
+    'import sys; sys.path.insert(0, "lambda"); import acrossfc_bot',
+])
+def test_no_heavy_imports(import_stmt, test_fc_config_path):
+    times = import_times(import_stmt, test_fc_config_path)
+    loaded = [m for m in HEAVY_MODULES if m in times]
+    slowest = sorted(times.items(), key=lambda kv: kv[1], reverse=True)[:5]
+    print(f"\n{import_stmt}: {', '.join(f'{m} {t / 1000:.1f}ms' for m, t in slowest)}")
+    assert loaded == [], f"Heavy modules imported eagerly: {loaded}"
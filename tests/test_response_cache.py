@@ -0,0 +1,81 @@
+# 3rd-party
+import pytest
+
+# Local
+from acrossfc.api.cache import ResponseCache
+
+
+@pytest.fixture
+def now(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('acrossfc.api.cache.time.time', lambda: now[0])
+    return now
+
+
+def test_cached_values_are_copies():
+    cache = ResponseCache()
+    calls = []
+
+    @cache.cached('leaderboard', ttl_s=300)
+    def get_leaderboard(tier: str):
+        calls.append(tier)
+        return [{'member_id': 1, 'total_points': 10}]
+
+    first = get_leaderboard('7_0')
+    first[0]['total_points'] = 0
+    second = get_leaderboard('7_0')
+    second.append({'member_id': 2})
+
+    assert get_leaderboard('7_0') == [{'member_id': 1, 'total_points': 10}]
+    assert calls == ['7_0']
+    assert cache.stats.hits == 2
+
+
+def test_invalidated_keys_use_local_ttl_without_shared_table(now):
+    cache = ResponseCache(local_ttl_s=15)
+
+    @cache.cached('leaderboard', ttl_s=300, invalidated_on_write=True)
+    def get_leaderboard(tier: str):
+        return now[0]
+
+    @cache.cached('table', ttl_s=300)
+    def get_table():
+        return now[0]
+
+    assert get_leaderboard('7_0') == 1000.0
+    assert get_table() == 1000.0
+
+    # Another instance's invalidation can't reach this one, so the leaderboard expires after local_ttl_s
+    now[0] += 16
+    assert get_leaderboard('7_0') == 1016.0
+    assert get_table() == 1000.0
+
+    cache.invalidate('leaderboard', '7_0')
+    assert get_leaderboard('7_0') == 1016.0
+    assert cache.stats.invalidations == 1
+
+
+def test_read_racing_a_write_is_shared_for_local_ttl_only(fake_ddb, now):
+    cache = ResponseCache(use_ddb=True, local_ttl_s=15)
+    other_instance = ResponseCache(use_ddb=True, local_ttl_s=15)
+    points = [10]
+
+    @cache.cached('leaderboard', ttl_s=300, invalidated_on_write=True)
+    def get_leaderboard(tier: str):
+        stale = points[0]
+        # A points write lands, and invalidates, while this read is in flight
+        points[0] = 20
+        other_instance.invalidate('leaderboard', tier)
+        return stale
+
+    @other_instance.cached('leaderboard', ttl_s=300, invalidated_on_write=True)
+    def get_leaderboard_elsewhere(tier: str):
+        return points[0]
+
+    assert get_leaderboard('7_0') == 10
+    # The stale value made it into the shared table after the invalidation, but only until local_ttl_s
+    assert get_leaderboard_elsewhere('7_0') == 10
+    assert fake_ddb.response_cache['leaderboard:7_0']['expires_at'] == 1015
+
+    now[0] += 16
+    assert get_leaderboard_elsewhere('7_0') == 20
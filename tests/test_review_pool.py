@@ -0,0 +1,104 @@
+# 3rd-party
+import pytest
+
+# Local
+from acrossfc.core.model import PointsEventStatus
+from acrossfc.api.routes import ROUTER, InvalidParameter
+from acrossfc.api.submissions import record_review_decision
+from acrossfc.api.review_pool import drain_submissions_queue, MAX_NUM_WORKERS
+from conftest import TIER, make_submission
+
+
+def decide(submission, approved_member_ids):
+    for pe in submission['points_events']:
+        approved = pe['member_id'] in approved_member_ids
+        pe['status'] = (PointsEventStatus.APPROVED if approved else PointsEventStatus.DENIED).value
+    return record_review_decision(submission)
+
+
+@pytest.fixture
+def queue(fake_ddb):
+    for submission in [
+        make_submission('a', [1, 2]),
+        make_submission('b', [1, 3]),
+        make_submission('undecided', [1, 2, 3]),
+    ]:
+        fake_ddb.batch_upsert_submissions([submission])
+    return fake_ddb
+
+
+def test_drain_commits_only_decided_submissions(queue):
+    decide(queue.get_submission_by_uuid('a'), approved_member_ids={1})
+    decide(queue.get_submission_by_uuid('b'), approved_member_ids={1, 3})
+
+    resp = drain_submissions_queue(num_workers=2)
+
+    assert resp['queued'] == 3
+    assert resp['ready'] == 2
+    assert resp['reviewed'] == 2
+    assert resp['partially_committed'] == []
+    assert sum(w['points_events'] for w in resp['workers']) == 3
+
+    # Approved events are committed, denied ones aren't
+    assert queue.get_member_points(TIER, 1)['total_points'] == 20
+    assert queue.get_member_points(TIER, 2) is None
+    assert queue.get_member_points(TIER, 3)['total_points'] == 10
+
+    # Nobody has looked at the undecided submission yet, so it stays queued untouched
+    assert set(queue.queue) == {'undecided'}
+    undecided = queue.get_submission_by_uuid('undecided')
+    assert all(pe['status'] == PointsEventStatus.PENDING.value for pe in undecided['points_events'])
+
+    a = queue.get_submission_by_uuid('a')
+    assert a['status_counts'] == {'APPROVED': 1, 'DENIED': 1}
+    assert a['last_update_ts'] is not None
+
+
+def test_drain_retry_after_a_partial_commit_pays_each_member_once(queue, monkeypatch):
+    decide(queue.get_submission_by_uuid('a'), approved_member_ids={1, 2})
+    update_member_points = queue.update_member_points
+
+    def fail_member_2(member_points):
+        if member_points['member_id'] == 2:
+            raise RuntimeError("throttled")
+        update_member_points(member_points)
+
+    monkeypatch.setattr(queue, 'update_member_points', fail_member_2)
+    resp = drain_submissions_queue(num_workers=2)
+    assert resp['partially_committed'] == ['a']
+    assert queue.get_member_points(TIER, 1)['total_points'] == 10
+    assert queue.get_member_points(TIER, 2) is None
+
+    monkeypatch.setattr(queue, 'update_member_points', update_member_points)
+    resp = drain_submissions_queue(num_workers=2)
+    assert resp['reviewed'] == 1
+    # Member 1's event was already committed by the first drain and isn't added again
+    assert queue.get_member_points(TIER, 1)['total_points'] == 10
+    assert len(queue.get_member_points(TIER, 1)['points_events']) == 1
+    assert queue.get_member_points(TIER, 2)['total_points'] == 10
+    assert 'a' not in queue.queue
+    a = queue.get_submission_by_uuid('a')
+    assert a['status_counts'] == {'APPROVED': 2}
+
+
+def test_drain_with_nothing_decided_commits_nothing(queue):
+    resp = drain_submissions_queue(num_workers=1)
+    assert resp['ready'] == 0
+    assert resp['reviewed'] == 0
+    assert queue.member_points == {}
+    assert len(queue.queue) == 3
+
+
+def test_decision_requires_every_points_event_decided(queue):
+    submission = queue.get_submission_by_uuid('a')
+    submission['points_events'][0]['status'] = PointsEventStatus.APPROVED.value
+    with pytest.raises(ValueError):
+        record_review_decision(submission)
+    assert 'decided_ts' not in queue.get_submission_by_uuid('a')
+
+
+@pytest.mark.parametrize('num_workers', [0, -1, MAX_NUM_WORKERS + 1])
+def test_drain_rejects_out_of_range_num_workers(queue, num_workers):
+    with pytest.raises(InvalidParameter):
+        ROUTER.dispatch('POST', '/submissions/queue/drain', {'num_workers': str(num_workers)})
+    assert len(queue.queue) == 3
@@ -0,0 +1,77 @@
+# stdlib
+from typing import Dict, Optional
+
+# 3rd-party
+import pytest
+
+# Local
+from acrossfc.api.routes import ROUTER, Router, RouteNotFound, MethodNotAllowed, InvalidParameter
+
+
+@pytest.fixture
+def router() -> Router:
+    router = Router()
+
+    @router.route('GET', '/items')
+    def list_items(limit: int = 10, active: Optional[bool] = None):
+        return {'limit': limit, 'active': active}
+
+    @router.route('GET', '/items/summary')
+    def get_summary():
+        return 'summary'
+
+    @router.route('GET', '/items/{item_id}')
+    def get_item(item_id: str):
+        return item_id
+
+    @router.route('POST', '/items/{item_id}')
+    def update_item(item_id: str, body: Dict):
+        return item_id, body
+
+    return router
+
+
+def test_static_routes_win_over_parameterized(router):
+    assert router.dispatch('GET', '/items/summary') == 'summary'
+    assert router.dispatch('GET', '/items/abc-1') == 'abc-1'
+    assert router.dispatch('GET', 'items/abc-1/') == 'abc-1'
+
+
+def test_parameters_are_coerced(router):
+    assert router.dispatch('GET', '/items') == {'limit': 10, 'active': None}
+    assert router.dispatch('get', '/items', {'limit': '5', 'active': 'yes'}) == {'limit': 5, 'active': True}
+    assert router.dispatch('POST', '/items/x', body={'a': 1}) == ('x', {'a': 1})
+    assert router.dispatch('POST', '/items/x') == ('x', {})
+
+    with pytest.raises(InvalidParameter):
+        router.dispatch('GET', '/items', {'limit': 'many'})
+    with pytest.raises(InvalidParameter):
+        router.dispatch('GET', '/items', {'active': 'maybe'})
+
+
+def test_unknown_path_is_not_found(router):
+    with pytest.raises(RouteNotFound) as e:
+        router.dispatch('GET', '/nope')
+    assert not isinstance(e.value, MethodNotAllowed)
+    # Path parameters only match a single segment
+    with pytest.raises(RouteNotFound):
+        router.dispatch('GET', '/items/a/b')
+
+
+def test_wrong_method_is_not_allowed(router):
+    with pytest.raises(MethodNotAllowed) as e:
+        router.dispatch('DELETE', '/items/x')
+    assert e.value.allowed_methods == ['GET', 'POST']
+
+    with pytest.raises(MethodNotAllowed) as e:
+        router.dispatch('POST', '/items')
+    assert e.value.allowed_methods == ['GET']
+
+
+def test_api_routes_resolve():
+    route, path_params = ROUTER.resolve('GET', '/submissions/queue')
+    assert route.pattern == '/submissions/queue'
+    route, path_params = ROUTER.resolve('GET', '/submissions/abc-123')
+    assert (route.pattern, path_params) == ('/submissions/{uuid}', {'uuid': 'abc-123'})
+    with pytest.raises(InvalidParameter):
+        ROUTER.dispatch('GET', '/ppts')
@@ -0,0 +1,170 @@
+# stdlib
+import json
+
+# 3rd-party
+import pytest
+
+# Local
+from acrossfc.core.model import PointsEventStatus
+from acrossfc.api import pagination
+from acrossfc.api.routes import ROUTER, InvalidParameter
+from acrossfc.api.submissions import (
+    SUBMISSION_KEY_FIELDS,
+    SUBMISSION_SUMMARY_FIELDS,
+    get_submissions_for_tier,
+    parse_submission_fields,
+    review_submissions_bulk,
+    submit_fflogs_bulk,
+)
+from conftest import TIER, make_submission
+
+
+def reviewed(submission_uuid, member_ids, approved_member_ids):
+    submission = make_submission(submission_uuid, member_ids)
+    for pe in submission['points_events']:
+        approved = pe['member_id'] in approved_member_ids
+        pe['status'] = (PointsEventStatus.APPROVED if approved else PointsEventStatus.DENIED).value
+    return submission
+
+
+def test_review_bulk_applies_a_repeated_submission_once(fake_ddb):
+    for submission_uuid in ('a', 'b'):
+        fake_ddb.batch_upsert_submissions([make_submission(submission_uuid, [1, 2])])
+
+    results = review_submissions_bulk([
+        reviewed('a', [1, 2], approved_member_ids={1}),
+        reviewed('b', [1, 2], approved_member_ids={1, 2}),
+        # Same submission again, with a different decision
+        reviewed('a', [1, 2], approved_member_ids={1, 2}),
+    ])
+
+    assert results == [
+        {'uuid': 'a', 'status': 'reviewed', 'points_awarded': 10},
+        {'uuid': 'b', 'status': 'reviewed', 'points_awarded': 20},
+        {'uuid': 'a', 'status': 'duplicate'},
+    ]
+    # The first decision on 'a' is the one applied
+    assert fake_ddb.get_member_points(TIER, 1)['total_points'] == 20
+    assert fake_ddb.get_member_points(TIER, 2)['total_points'] == 10
+    assert fake_ddb.get_submission_by_uuid('a')['status_counts'] == {'APPROVED': 1, 'DENIED': 1}
+    assert fake_ddb.queue == {}
+
+
+@pytest.fixture
+def submissions(fake_ddb):
+    fake_ddb.batch_upsert_submissions([
+        make_submission(f"s{i:02d}", [1, 2], ts=1700000000 + i) | {'notes': f"note {i}", 'status_counts': {}}
+        for i in range(12)
+    ])
+    return fake_ddb
+
+
+def test_parse_submission_fields():
+    assert parse_submission_fields(None) is None
+    assert parse_submission_fields('summary') == list(SUBMISSION_SUMMARY_FIELDS)
+    # Key attributes always come first, and fields aren't repeated
+    assert parse_submission_fields(' notes,ts,,notes ') == list(SUBMISSION_KEY_FIELDS) + ['notes']
+
+    for fields in ('notes,points_events[0]', 'a.b', '#p0', 'notes, 1st'):
+        with pytest.raises(ValueError):
+            parse_submission_fields(fields)
+
+
+def test_fields_are_pushed_down_as_a_projection(submissions):
+    page = get_submissions_for_tier(TIER, fields='notes')
+    assert submissions.projections == [['uuid', 'tier', 'ts', 'notes']]
+    assert all(set(item) == {'uuid', 'tier', 'ts', 'notes'} for item in page['items'])
+
+    # The route defaults to the summary, so points events are never read for listings
+    page = ROUTER.dispatch('GET', '/submissions', {'tier': TIER})
+    assert submissions.projections[-1] == list(SUBMISSION_SUMMARY_FIELDS)
+    assert all('points_events' not in item for item in page['items'])
+
+    with pytest.raises(InvalidParameter):
+        ROUTER.dispatch('GET', '/submissions', {'tier': TIER, 'fields': 'notes,#x'})
+
+
+def uuids(page):
+    return [item['uuid'] for item in page['items']]
+
+
+def test_cursors_page_both_ways(submissions):
+    first = get_submissions_for_tier(TIER, limit=5, fields='summary')
+    assert uuids(first) == ['s11', 's10', 's09', 's08', 's07']
+    assert first['prev_cursor'] is None
+
+    second = get_submissions_for_tier(TIER, cursor=first['next_cursor'], limit=5, fields='summary')
+    assert uuids(second) == ['s06', 's05', 's04', 's03', 's02']
+    last = get_submissions_for_tier(TIER, cursor=second['next_cursor'], limit=5, fields='summary')
+    assert uuids(last) == ['s01', 's00']
+    assert last['next_cursor'] is None
+
+    back = get_submissions_for_tier(TIER, cursor=last['prev_cursor'], limit=5, fields='summary')
+    assert uuids(back) == uuids(second)
+
+
+def _tampered_cursors(cursor: str):
+    payload, signature = cursor.split('.')
+    data = json.loads(pagination._b64decode(payload))
+    forged = pagination._b64encode(json.dumps(data | {'k': data['k'] | {'ts': 0}}).encode('utf-8'))
+    return [
+        # Different key, same signature
+        f"{forged}.{signature}",
+        # Signature cut short or swapped for one over other data
+        f"{payload}.{signature[:-2]}",
+        f"{payload}.{pagination._b64encode(b'0' * 16)}",
+        # Not a cursor at all
+        'garbage',
+        f"{payload}.{signature}.extra",
+        '!!!.???',
+    ]
+
+
+def test_tampered_cursors_are_rejected(submissions):
+    cursor = get_submissions_for_tier(TIER, limit=5, fields='summary')['next_cursor']
+    num_queries = len(submissions.projections)
+
+    for tampered in _tampered_cursors(cursor):
+        with pytest.raises(ValueError):
+            get_submissions_for_tier(TIER, cursor=tampered, limit=5)
+        with pytest.raises(InvalidParameter):
+            ROUTER.dispatch('GET', '/submissions', {'tier': TIER, 'cursor': tampered})
+
+    # A valid cursor from another tier's listing can't be replayed against this one
+    with pytest.raises(ValueError):
+        get_submissions_for_tier('6_0', cursor=cursor, limit=5)
+
+    # Rejected before DynamoDB is queried
+    assert len(submissions.projections) == num_queries
+
+
+BULK_URLS = [
+    "https://www.fflogs.com/reports/AAA#fight=1",
+    "https://www.fflogs.com/reports/BBB#fight=2",
+    "https://www.fflogs.com/reports/AAA#fight=3",
+    # Same fight as the first URL
+    "https://www.fflogs.com/reports/AAA?translate=true#fight=1",
+    "https://www.fflogs.com/reports/AAA#fight=9",
+    "https://www.fflogs.com/nope",
+]
+
+
+def test_submit_bulk(fake_ddb, fake_fflogs):
+    resp = submit_fflogs_bulk(BULK_URLS, {'name': 'Admin'}, 'ADMIN_PORTAL', is_static=False, is_fc_pf=True)
+
+    assert [r['status'] for r in resp['results']] == [
+        'submitted', 'submitted', 'submitted', 'duplicate', 'error', 'invalid'
+    ]
+    assert resp['results'][3]['duplicate_of'] == BULK_URLS[0]
+    assert resp['submitted'] == 3
+    # One fetch per report, for all of its fights
+    assert sorted(fake_fflogs.fetched_reports) == [('AAA', [1, 3, 9]), ('BBB', [2])]
+    assert {s['fflogs_url'] for s in fake_ddb.submissions.values()} == set(BULK_URLS[:3])
+    assert set(fake_ddb.queue) == set(fake_ddb.submissions)
+
+
+def test_submit_bulk_eval_mode_writes_nothing(fake_ddb, fake_fflogs):
+    resp = submit_fflogs_bulk(BULK_URLS[:2], {'name': 'Admin'}, 'ADMIN_PORTAL', False, True, eval_mode=True)
+    assert [r['status'] for r in resp['results']] == ['evaluated', 'evaluated']
+    assert resp['submitted'] == 0
+    assert fake_ddb.submissions == {}
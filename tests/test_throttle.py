@@ -0,0 +1,141 @@
+# 3rd-party
+import pytest
+
+# Local
+from acrossfc.api import submissions
+from acrossfc.api.routes import ROUTER
+from acrossfc.api.throttle import TokenBucketThrottle, SubmissionThrottled, MAX_DDB_ATTEMPTS
+
+FFLOGS_URL = "https://www.fflogs.com/reports/AAA#fight=1"
+
+
+@pytest.fixture
+def now(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('acrossfc.api.throttle.time.time', lambda: now[0])
+    return now
+
+
+@pytest.mark.parametrize('use_ddb', [False, True])
+def test_bucket_refills_over_time(fake_ddb, now, use_ddb):
+    throttle = TokenBucketThrottle(capacity=2, refill_s=10, use_ddb=use_ddb)
+    throttle.acquire('a')
+    throttle.acquire('a')
+    with pytest.raises(SubmissionThrottled) as e:
+        throttle.acquire('a')
+    assert e.value.retry_after_s == 10
+
+    # Other keys have their own bucket
+    throttle.acquire('b')
+
+    now[0] += 4
+    with pytest.raises(SubmissionThrottled) as e:
+        throttle.acquire('a')
+    assert e.value.retry_after_s == 6
+    now[0] += 6
+    throttle.acquire('a')
+
+    if use_ddb:
+        assert set(fake_ddb.throttle) == {'a', 'b'}
+
+
+def test_ddb_write_retries_a_lost_race(fake_ddb, now, monkeypatch):
+    throttle = TokenBucketThrottle(capacity=2, refill_s=10, use_ddb=True)
+    put = fake_ddb.put_throttle_entry
+    attempts = []
+
+    def racing_put(entry, expected_updated_at):
+        attempts.append(expected_updated_at)
+        if len(attempts) == 1:
+            # Another instance spends a token between our read and our write
+            fake_ddb.throttle['a'] = {'throttle_key': 'a', 'tokens': 1, 'updated_at': 999}
+        return put(entry, expected_updated_at)
+
+    monkeypatch.setattr(fake_ddb, 'put_throttle_entry', racing_put)
+    throttle.acquire('a')
+    # The first write expected a new bucket and lost, the retry spent a token from the other instance's write
+    assert attempts == [None, 999]
+    assert float(fake_ddb.throttle['a']['tokens']) == pytest.approx(0.1)
+
+
+def test_ddb_contention_is_treated_as_throttled(fake_ddb, now, monkeypatch):
+    throttle = TokenBucketThrottle(capacity=2, refill_s=10, use_ddb=True)
+    attempts = []
+    monkeypatch.setattr(
+        fake_ddb, 'put_throttle_entry', lambda entry, expected_updated_at: attempts.append(entry) or False
+    )
+
+    with pytest.raises(SubmissionThrottled) as e:
+        throttle.acquire('a')
+    assert e.value.retry_after_s == 10
+    assert len(attempts) == MAX_DDB_ATTEMPTS
+
+
+@pytest.fixture
+def throttle(monkeypatch) -> TokenBucketThrottle:
+    throttle = TokenBucketThrottle(capacity=1, refill_s=60)
+    monkeypatch.setattr(submissions, 'SUBMISSION_THROTTLE', throttle)
+    return throttle
+
+
+def submit(submitted_by, caller_discord_id=None):
+    return ROUTER.dispatch('POST', '/submissions/fflogs', body={
+        'fflogs_url': FFLOGS_URL,
+        'submitted_by': submitted_by,
+        'submission_channel': 'ADMIN_PORTAL',
+        'is_static': False,
+        'is_fc_pf': True,
+        'eval_mode': True,
+    }, caller_discord_id=caller_discord_id)
+
+
+def test_api_submissions_are_throttled_per_authenticated_caller(fake_ddb, fake_fflogs, throttle, now):
+    submit({'name': 'Admin'}, caller_discord_id='100')
+    # Another admin on the portal has their own bucket
+    submit({'name': 'Admin'}, caller_discord_id='200')
+
+    # The caller is charged no matter who the body says submitted it
+    with pytest.raises(SubmissionThrottled):
+        submit({'name': 'Someone else', 'discord_user_id': 3}, caller_discord_id='100')
+    # and it can't be set from the body
+    with pytest.raises(SubmissionThrottled):
+        ROUTER.dispatch('POST', '/submissions/fflogs/bulk', body={
+            'fflogs_urls': [FFLOGS_URL],
+            'submitted_by': {'name': 'Admin'},
+            'submission_channel': 'ADMIN_PORTAL',
+            'is_static': False,
+            'is_fc_pf': True,
+            'caller_discord_id': '300',
+        }, caller_discord_id='100')
+
+
+def test_submissions_without_a_caller_are_throttled_by_submitter(fake_ddb, fake_fflogs, throttle, now):
+    # Bot submissions, by the Discord user they were made for
+    submit({'name': 'Alpha', 'discord_user_id': 1})
+    with pytest.raises(SubmissionThrottled):
+        submit({'name': 'Alpha', 'discord_user_id': 1})
+    submit({'name': 'Beta', 'discord_user_id': 2})
+
+    # The CLI, by name
+    submit({'name': 'Admin'})
+    submit({'name': 'Other admin'})
+    with pytest.raises(SubmissionThrottled):
+        submit({'name': 'Admin'})
+
+
+def test_bulk_submissions_share_the_single_submission_bucket(fake_ddb, fake_fflogs, throttle, now):
+    def submit_bulk():
+        return submissions.submit_fflogs_bulk(
+            [FFLOGS_URL], {'name': 'Admin'}, 'ADMIN_PORTAL', False, True, eval_mode=True, caller_discord_id='100'
+        )
+
+    submit_bulk()
+    with pytest.raises(SubmissionThrottled):
+        submit_bulk()
+    with pytest.raises(SubmissionThrottled):
+        submit({'name': 'Admin'}, caller_discord_id='100')
+    # Throttled before FFLogs is queried
+    assert len(fake_fflogs.fetched_reports) == 1
+
+    now[0] += 60
+    assert submit_bulk()['results'][0]['status'] == 'evaluated'
@@ -0,0 +1,115 @@
+# stdlib
+from datetime import date, datetime
+
+# 3rd-party
+import pytest
+
+# Local
+from acrossfc.core.database import ClearDatabase
+from acrossfc.core.model import Member, Clear
+from acrossfc.core.timeline import TimelineDatabase
+from acrossfc.core.constants import JOBS
+from test_database import ENCOUNTERS, make_roster
+
+DAY_1 = date(2024, 3, 1)
+DAY_2 = date(2024, 3, 2)
+DAY_3 = date(2024, 3, 5)
+
+
+@pytest.fixture
+def snapshots():
+    members, clears = make_roster()
+    new_clear = Clear(
+        member=members[3], encounter=ENCOUNTERS[0], start_time=datetime(2024, 3, 1, 22), historical_pct=10.0,
+        report_code="day2", report_fight_id=4, job=JOBS[0], locked_in=True
+    )
+    renamed = Member(fcid=members[5].fcid, name="Renamed", rank=2)
+
+    day_1 = (members, clears)
+    # A kill shows up, member 0 leaves, member 5 is renamed
+    day_2 = (
+        members[1:5] + [renamed] + members[6:],
+        [c for c in clears if c.member != members[0]] + [new_clear]
+    )
+    # Member 0 comes back
+    day_3 = ([members[0]] + day_2[0], clears + [new_clear])
+    return {DAY_1: day_1, DAY_2: day_2, DAY_3: day_3}
+
+
+@pytest.fixture
+def timeline(snapshots, tmp_path) -> TimelineDatabase:
+    timeline = TimelineDatabase(str(tmp_path / "timeline"))
+    for snapshot_date, (members, clears) in snapshots.items():
+        timeline.append_snapshot(snapshot_date, ClearDatabase.from_fflogs(members, clears))
+    return timeline
+
+
+@pytest.mark.parametrize('as_of_date, snapshot_date', [
+    (DAY_1, DAY_1),
+    (DAY_2, DAY_2),
+    # Falls between snapshots, so the one before it applies
+    (date(2024, 3, 4), DAY_2),
+    (DAY_3, DAY_3),
+])
+def test_as_of_matches_snapshot(timeline, snapshots, as_of_date, snapshot_date):
+    expected = ClearDatabase.from_fflogs(*snapshots[snapshot_date])
+    actual = timeline.as_of(as_of_date)
+
+    assert actual.get_fc_roster() == expected.get_fc_roster()
+    assert [(m.fcid, m.name, m.rank) for m in actual.get_fc_roster()] == \
+        [(m.fcid, m.name, m.rank) for m in expected.get_fc_roster()]
+    assert actual.get_clear_order(include_echo=True) == expected.get_clear_order(include_echo=True)
+    assert actual.get_clear_rates(include_echo=True) == expected.get_clear_rates(include_echo=True)
+
+
+def test_rows_are_stored_per_interval(timeline, snapshots):
+    members, clears = snapshots[DAY_1]
+    member_0 = members[0].fcid
+    num_member_0_clears = len([c for c in clears if c.member == members[0]])
+
+    def query(sql, params=()):
+        return timeline._db.execute_sql(sql, params).fetchall()
+
+    # Clears are stored once per stretch of snapshots they appear in
+    assert query('SELECT COUNT(*) FROM timeline_clear')[0][0] == len(clears) + 1 + num_member_0_clears
+    assert query('SELECT COUNT(*) FROM timeline_clear WHERE last_seen = ?', (str(DAY_3),))[0][0] == len(clears) + 1
+    assert query(
+        'SELECT DISTINCT first_seen, last_seen FROM timeline_clear WHERE member_id = ? ORDER BY 1', (member_0,)
+    ) == [(str(DAY_1), str(DAY_1)), (str(DAY_3), str(DAY_3))]
+
+    # Member 0 left on day 2 and came back on day 3
+    assert query(
+        'SELECT valid_from, valid_to FROM timeline_member WHERE fcid = ? ORDER BY valid_from', (member_0,)
+    ) == [(str(DAY_1), str(DAY_2)), (str(DAY_3), None)]
+    assert timeline.snapshot_dates() == [DAY_1, DAY_2, DAY_3]
+
+
+def test_snapshots_must_be_in_order(timeline, snapshots):
+    with pytest.raises(ValueError):
+        timeline.append_snapshot(DAY_1, ClearDatabase.from_fflogs(*snapshots[DAY_1]))
+    with pytest.raises(ValueError):
+        timeline.as_of(date(2024, 1, 1))
+
+
+def test_reading_never_writes(timeline, snapshots, tmp_path):
+    path = tmp_path / "timeline"
+    before = path.read_bytes()
+    # Like the ETag-cached copy: nothing may write to it
+    path.chmod(0o444)
+
+    read_only = TimelineDatabase(str(path), read_only=True)
+    assert read_only.snapshot_dates() == [DAY_1, DAY_2, DAY_3]
+    expected = ClearDatabase.from_fflogs(*snapshots[DAY_2])
+    assert read_only.as_of(DAY_2).get_clear_rates() == expected.get_clear_rates()
+    assert path.read_bytes() == before
+
+
+def test_plain_cleardb_is_not_a_timeline(snapshots, tmp_path):
+    cleardb = ClearDatabase.from_fflogs(*snapshots[DAY_1])
+    tables = cleardb._db.get_tables()
+
+    timeline = TimelineDatabase(cleardb.db_filename)
+    assert timeline.snapshot_dates() == []
+    with pytest.raises(ValueError):
+        timeline.as_of(DAY_1)
+    assert cleardb._db.get_tables() == tables